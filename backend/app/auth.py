@@ -2,42 +2,193 @@
 JWT Authentication module for Supabase Auth
 Validates JWTs issued by Supabase Auth for protected endpoints
 Uses JWKS (JSON Web Key Set) for ES256 token verification
+
+The JWKS is fetched at startup and refreshed in the background (and on
+unknown key ids); verified tokens are cached by SHA-256 digest until
+they expire, so repeat requests skip key lookup and signature checks.
 """
 
 import os
+import time
+import asyncio
+import hmac
+import hashlib
 import logging
+from typing import Optional
 import httpx
 import jwt
-from jwt import PyJWKClient
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
-from app.errors import AuthenticationError
+from app.cache import TTLCache
+from app.errors import AuthenticationError, NotFoundError
 
 load_dotenv()
 
 # Security scheme for OpenAPI docs
 security = HTTPBearer()
+# Same, but lets require_metrics_token answer a missing header itself
+optional_security = HTTPBearer(auto_error=False)
 
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 JWT_AUDIENCE = "authenticated"
 
-# JWKS client for fetching public keys (with caching)
-_jwks_client = None
+# Verified token cache and JWKS refresh tuning
+AUTH_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+AUTH_TOKEN_CACHE_MAX_TTL_SECONDS = float(os.getenv("AUTH_TOKEN_CACHE_MAX_TTL_SECONDS", "300"))
+JWKS_REFRESH_SECONDS = float(os.getenv("JWKS_REFRESH_SECONDS", "3600"))
+# Minimum gap between refreshes triggered by unknown key ids
+JWKS_MIN_REFRESH_SECONDS = float(os.getenv("JWKS_MIN_REFRESH_SECONDS", "30"))
+
+# Seconds to wait before retrying a failed JWKS fetch
+JWKS_RETRY_SECONDS = 1
+
+# Bearer token for GET /metrics; unset = endpoint disabled
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+logger = logging.getLogger(__name__)
+
+# Singletons
+_jwks_cache: Optional["JWKSCache"] = None
+_token_cache: Optional[TTLCache] = None
+
+
+class JWKSCache:
+    """
+    Supabase signing keys by key id, kept fresh off the request path.
+
+    Keys are fetched with a non-blocking client, refreshed every
+    JWKS_REFRESH_SECONDS by a background task, and re-fetched (at most
+    once per JWKS_MIN_REFRESH_SECONDS) when a token names an unknown kid.
+    A failed fetch only holds off the next one for JWKS_RETRY_SECONDS, and
+    the background task retries at that pace until keys are loaded, so a
+    failed startup fetch doesn't lock everyone out.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._lock = asyncio.Lock()
+        self._next_refresh_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.kid_misses = 0
+
+    async def refresh(self) -> None:
+        """Fetch the JWKS and replace the key set."""
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.get(self.url)
+                response.raise_for_status()
+            jwk_set = jwt.PyJWKSet.from_dict(response.json())
+        except Exception:
+            self.refresh_failures += 1
+            self._next_refresh_at = time.monotonic() + JWKS_RETRY_SECONDS
+            raise
+        self._keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+        self._next_refresh_at = time.monotonic() + JWKS_MIN_REFRESH_SECONDS
+        self.refreshes += 1
+
+    async def get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        """
+        Key for a token's kid, refreshing once if it is unknown.
+
+        Raises:
+            jwt.InvalidTokenError: If no key matches after a refresh
+        """
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid - keys may have rotated. One refresh serves all waiters.
+        async with self._lock:
+            key = self._keys.get(kid)
+            if key is None and time.monotonic() >= self._next_refresh_at:
+                self.kid_misses += 1
+                await self.refresh()
+                key = self._keys.get(kid)
+
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unable to find a signing key that matches: {kid}")
+        return key
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(JWKS_REFRESH_SECONDS if self._keys else JWKS_RETRY_SECONDS)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"JWKS refresh failed, keeping current keys: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._keys),
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "kid_misses": self.kid_misses,
+        }
+
 
-def get_jwks_client():
-    """Get or create JWKS client for Supabase."""
-    global _jwks_client
-    if _jwks_client is None:
+def get_jwks_cache() -> JWKSCache:
+    """Get singleton JWKS cache for Supabase."""
+    global _jwks_cache
+    if _jwks_cache is None:
         if not SUPABASE_URL:
             raise AuthenticationError(
                 message="Server misconfigured: SUPABASE_URL not set",
                 detail={"hint": "Set SUPABASE_URL environment variable"}
             )
         jwks_url = f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json"
-        _jwks_client = PyJWKClient(jwks_url)
-    return _jwks_client
+        _jwks_cache = JWKSCache(jwks_url)
+    return _jwks_cache
+
+
+def get_token_cache() -> TTLCache:
+    """Get singleton cache of verified token digests -> claims."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TTLCache(AUTH_TOKEN_CACHE_MAX_ENTRIES, AUTH_TOKEN_CACHE_MAX_TTL_SECONDS)
+    return _token_cache
+
+
+async def start_jwks_refresh() -> None:
+    """Fetch the JWKS at startup and start background refreshes."""
+    jwks_cache = get_jwks_cache()
+    try:
+        await jwks_cache.refresh()
+    except Exception as e:
+        # Not fatal - the first request with a token will retry
+        logger.warning(f"Initial JWKS fetch failed: {e}")
+    jwks_cache.start()
+
+
+async def stop_jwks_refresh() -> None:
+    """Stop background JWKS refreshes on shutdown."""
+    if _jwks_cache is not None:
+        await _jwks_cache.stop()
+
+
+def get_auth_metrics() -> dict:
+    """Token cache and JWKS metrics."""
+    return {
+        "token_cache": get_token_cache().stats(),
+        "jwks": _jwks_cache.stats() if _jwks_cache is not None else None,
+    }
 
 
 async def get_current_user(
@@ -66,10 +217,17 @@ async def get_current_user(
 
     token = credentials.credentials
 
+    # Tokens verified before are served from the cache until they expire
+    token_cache = get_token_cache()
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    cached = token_cache.get(digest)
+    if cached is not None:
+        return dict(cached)
+
     try:
         # Get the signing key from JWKS
-        jwks_client = get_jwks_client()
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
+        kid = jwt.get_unverified_header(token).get("kid")
+        signing_key = await get_jwks_cache().get_signing_key(kid)
 
         # Decode and verify the token
         payload = jwt.decode(
@@ -78,7 +236,6 @@ async def get_current_user(
             algorithms=["ES256", "RS256", "HS256"],
             audience=JWT_AUDIENCE,
         )
-        return payload
 
     except jwt.ExpiredSignatureError:
         raise AuthenticationError(
@@ -99,9 +256,39 @@ async def get_current_user(
             detail={"error": str(e), "type": type(e).__name__}
         )
 
+    except AuthenticationError:
+        raise
+
     except Exception as e:
         logging.warning(f"Auth error: {type(e).__name__}: {e}")
         raise AuthenticationError(
             message="Authentication failed",
             detail={"error": str(e)}
         )
+
+    # Never cache past the token's own expiry
+    ttl = AUTH_TOKEN_CACHE_MAX_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        token_cache.set(digest, payload, ttl_seconds=ttl)
+    return dict(payload)
+
+
+async def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> None:
+    """
+    Dependency guarding operational endpoints with METRICS_TOKEN.
+
+    Raises:
+        NotFoundError: If METRICS_TOKEN is not set (endpoint disabled)
+        AuthenticationError: If the bearer token is missing or wrong
+    """
+    if not METRICS_TOKEN:
+        raise NotFoundError(message="Not found", detail={"hint": "Set METRICS_TOKEN to enable metrics"})
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        raise AuthenticationError(
+            message="Invalid metrics token",
+            detail={"hint": "Include Authorization: Bearer <METRICS_TOKEN> header"}
+        )
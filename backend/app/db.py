@@ -1,22 +1,165 @@
 """
 Database connection module for Supabase
-Provides singleton Supabase client for backend operations
+Provides a singleton async PostgREST client on a shared, tunable
+HTTP connection pool (keep-alive + HTTP/2) with pool metrics
 """
 
 import os
-from supabase import create_client, Client
+import time
+from collections import deque
+from typing import Optional
+import httpx
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Supabase client singleton
-_supabase_client: Client | None = None
+# Connection pool tuning
+POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "100"))
+POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "20"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "30"))
+POOL_HTTP2 = os.getenv("SUPABASE_HTTP2", "true").lower() == "true"
+DB_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "10"))
 
+# Number of recent requests kept for latency percentiles
+METRICS_WINDOW = 1024
 
-def get_supabase() -> Client:
+# Async client singleton
+_db_client: Optional["PooledPostgrestClient"] = None
+
+
+class PoolMetrics:
+    """Counters and recent timings for the Supabase connection pool"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.latencies: deque[float] = deque(maxlen=METRICS_WINDOW)
+        self.waits: deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    @staticmethod
+    def _summary(samples: deque) -> dict:
+        if not samples:
+            return {"avg_ms": None, "p95_ms": None, "max_ms": None}
+        ordered = sorted(samples)
+        return {
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "latency": self._summary(self.latencies),
+            "pool_wait": self._summary(self.waits),
+        }
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
     """
-    Get Supabase client instance (singleton pattern)
+    HTTP transport that records request latency and pool wait time.
+
+    Pool wait is measured up to the moment request headers are sent,
+    so it includes time spent waiting for a free connection plus any
+    connect/TLS handshake for a new one.
+    """
+
+    def __init__(self, metrics: PoolMetrics, **kwargs):
+        super().__init__(**kwargs)
+        self.metrics = metrics
+
+    def connection_counts(self) -> dict:
+        connections = self._pool.connections
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {"open": len(connections), "idle": idle, "in_use": len(connections) - idle}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = self.metrics
+        start = time.perf_counter()
+        sent_at = None
+
+        async def trace(event_name: str, info: dict) -> None:
+            nonlocal sent_at
+            if sent_at is None and event_name.endswith("send_request_headers.started"):
+                sent_at = time.perf_counter()
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        metrics.requests += 1
+        metrics.in_flight += 1
+        metrics.max_in_flight = max(metrics.max_in_flight, metrics.in_flight)
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.in_flight -= 1
+
+        now = time.perf_counter()
+        metrics.latencies.append(now - start)
+        metrics.waits.append((sent_at or now) - start)
+        return response
+
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client whose session uses the instrumented pool"""
+
+    def __init__(self, base_url: str, key: str):
+        self.metrics = PoolMetrics()
+        super().__init__(
+            base_url,
+            headers={
+                **DEFAULT_POSTGREST_CLIENT_HEADERS,
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+            },
+            timeout=DB_TIMEOUT_SECONDS,
+        )
+
+    def create_session(self, base_url, headers, timeout, verify=True) -> httpx.AsyncClient:
+        self.transport = InstrumentedTransport(
+            self.metrics,
+            http2=POOL_HTTP2,
+            verify=verify,
+            limits=httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+            ),
+        )
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            transport=self.transport,
+            follow_redirects=True,
+        )
+
+    def pool_metrics(self) -> dict:
+        return {
+            **self.metrics.snapshot(),
+            "connections": self.transport.connection_counts(),
+            "limits": {
+                "max_connections": POOL_MAX_CONNECTIONS,
+                "max_keepalive": POOL_MAX_KEEPALIVE,
+                "keepalive_expiry": POOL_KEEPALIVE_EXPIRY,
+                "http2": POOL_HTTP2,
+            },
+        }
+
+
+def get_db() -> PooledPostgrestClient:
+    """
+    Get async Supabase (PostgREST) client instance (singleton pattern)
 
     Uses SERVICE_KEY (not ANON_KEY) to bypass Row Level Security.
     Backend needs admin access to:
@@ -25,10 +168,14 @@ def get_supabase() -> Client:
     - Perform admin operations
 
     Client-side requests should use ANON_KEY with RLS enforcement.
+
+    Usage:
+        db = get_db()
+        result = await db.table("places").select("*").execute()
     """
-    global _supabase_client
+    global _db_client
 
-    if _supabase_client is None:
+    if _db_client is None:
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_SERVICE_KEY")
 
@@ -37,6 +184,21 @@ def get_supabase() -> Client:
                 "SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in environment"
             )
 
-        _supabase_client = create_client(url, key)
+        _db_client = PooledPostgrestClient(f"{url}/rest/v1", key)
+
+    return _db_client
+
+
+def get_pool_metrics() -> Optional[dict]:
+    """Current connection pool metrics, or None before first use"""
+    if _db_client is None:
+        return None
+    return _db_client.pool_metrics()
+
 
-    return _supabase_client
+async def close_db() -> None:
+    """Close the shared connection pool on shutdown"""
+    global _db_client
+    if _db_client is not None:
+        await _db_client.aclose()
+        _db_client = None
@@ -0,0 +1,25 @@
+"""
+HTTP conditional request helpers (ETag / If-None-Match)
+"""
+
+from typing import Optional
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against our ETag.
+
+    Uses weak comparison as required for If-None-Match (RFC 9110), so a
+    client echoing W/"..." still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    target = opaque(etag)
+    return any(opaque(candidate) == target for candidate in if_none_match.split(","))
@@ -5,10 +5,25 @@ FastAPI server for the Noms food discovery app
 
 import logging
 import uvicorn
-from fastapi import FastAPI, Response, Request
+from fastapi import Depends, FastAPI, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from app.db import get_supabase
+from app.db import get_db, get_pool_metrics, close_db
+from app.auth import get_auth_metrics, require_metrics_token, start_jwks_refresh, stop_jwks_refresh
+from app.services.places import close_places_service, get_places_metrics
+from app.services.place_writer import get_place_writer, close_place_writer
+from app.services.search_cache import get_search_cache
+from app.services.place_cache import get_place_cache
+from app.services.photo_cache import get_photo_cache
+from app.services.picker import get_picker_sessions
+from app.services.collection_cache import get_collection_cache
+from app.services.refresh import (
+    PLACE_REFRESH_IN_APP,
+    get_refresh_scheduler,
+    get_refresh_metrics,
+    get_view_flusher,
+    stop_refresh_scheduler,
+)
 from app.errors import (
     DatabaseError,
     AuthenticationError,
@@ -127,17 +142,35 @@ async def generic_error_handler(request: Request, exc: Exception):
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database connection on startup"""
+    """Initialize database connection pool on startup"""
     try:
-        supabase = get_supabase()
-        print("✓ Supabase client initialized successfully")
+        get_db()
+        print("✓ Supabase connection pool initialized successfully")
     except Exception as e:
         print(f"✗ Failed to initialize Supabase client: {e}")
         raise
 
+    # Fetch signing keys now so the first request doesn't wait on them
+    await start_jwks_refresh()
+
+    # Views are recorded by every API process, wherever the scheduler runs
+    get_view_flusher().start()
+    if PLACE_REFRESH_IN_APP:
+        get_refresh_scheduler().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work and release pooled connections"""
+    await stop_refresh_scheduler()
+    await stop_jwks_refresh()
+    await close_places_service()
+    await close_place_writer()
+    await close_db()
+
 
 # API Routes
-from app.routers import users, places, saves, journal
+from app.routers import users, places, saves, journal, picker, sync
 
 # Phase 4: Users router (protected endpoints)
 app.include_router(users.router, prefix="/api/users", tags=["users"])
@@ -154,6 +187,12 @@ app.include_router(saves.router, prefix="/api/saves", tags=["saves"])
 # Phase 11: Photo Journal
 app.include_router(journal.router, prefix="/api/journal", tags=["journal"])
 
+# Picker sessions (swipe flow)
+app.include_router(picker.router, prefix="/api/picker", tags=["picker"])
+
+# Delta sync of saves and journal
+app.include_router(sync.router, prefix="/api/sync", tags=["sync"])
+
 
 @app.get("/")
 async def root():
@@ -166,8 +205,8 @@ async def health_check(response: Response):
     """Health check endpoint with database connectivity verification"""
     try:
         # Test database connection with a simple query
-        supabase = get_supabase()
-        supabase.table("users").select("id").limit(1).execute()
+        db = get_db()
+        await db.table("users").select("id").limit(1).execute()
 
         return {"status": "ok", "database": "connected"}
     except Exception as e:
@@ -176,6 +215,27 @@ async def health_check(response: Response):
         return {"status": "degraded", "database": "disconnected", "error": str(e)}
 
 
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    """
+    Runtime metrics for connection pools and caches.
+
+    Requires Authorization: Bearer <METRICS_TOKEN>; 404 when unset.
+    """
+    return {
+        "db_pool": get_pool_metrics(),
+        "auth": get_auth_metrics(),
+        "search_cache": get_search_cache().stats(),
+        "place_cache": get_place_cache().stats(),
+        "photo_cache": get_photo_cache().stats(),
+        "google_places": get_places_metrics(),
+        "picker_sessions": get_picker_sessions().stats(),
+        "collection_cache": get_collection_cache().stats(),
+        "refresh_scheduler": get_refresh_metrics(),
+        "place_writer": get_place_writer().stats(),
+    }
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
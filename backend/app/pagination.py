@@ -0,0 +1,91 @@
+"""
+Keyset (cursor) pagination helpers
+Cursors are opaque to clients: URL-safe base64 of the sort key of the
+last row on the previous page (or a plain offset for ranked results)
+"""
+
+import os
+import json
+import re
+import uuid
+import base64
+from typing import Optional
+
+from app.errors import ValidationError
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "200"))
+
+# ISO timestamps as returned by PostgREST, e.g. 2026-10-18T09:30:00.12345+00:00
+_TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}[T ][\d:.]+(Z|[+-]\d{2}(:?\d{2})?)?")
+
+
+def encode_cursor(sort_value: str, row_id: str) -> str:
+    """Cursor pointing just after the row with this (sort value, id)."""
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """
+    Decode a cursor from encode_cursor (timestamp sort key, UUID id).
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        # Both values end up in a PostgREST filter - accept only a timestamp and a UUID
+        if not _TIMESTAMP_PATTERN.fullmatch(sort_value):
+            raise ValueError("cursor sort key is not a timestamp")
+        return sort_value, str(uuid.UUID(row_id))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValidationError(message="Invalid cursor", detail={"cursor": cursor, "error": str(e)})
+
+
+def keyset_filter(sort_column: str, cursor: str) -> str:
+    """
+    PostgREST or= filter for rows after the cursor in
+    ORDER BY sort_column DESC, id DESC.
+    """
+    sort_value, row_id = decode_cursor(cursor)
+    # Double quotes keep ':' and '+' in timestamps out of the filter grammar
+    return (
+        f'{sort_column}.lt."{sort_value}",'
+        f'and({sort_column}.eq."{sort_value}",id.lt.{row_id})'
+    )
+
+
+def page_rows(rows: list[dict], limit: int, sort_column: str) -> tuple[list[dict], Optional[str]]:
+    """
+    Split a limit + 1 fetch into the page and the next cursor.
+
+    Returns:
+        (rows for this page, next cursor or None if this is the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last[sort_column], last["id"])
+
+
+def decode_offset_cursor(cursor: Optional[str]) -> int:
+    """
+    Offset from an offset cursor (str of the offset; None = start).
+
+    For ranked results, which have no stable sort key to page on.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    if not cursor:
+        return 0
+    try:
+        offset = int(cursor)
+    except ValueError:
+        offset = -1
+    if offset < 0:
+        raise ValidationError(message="Invalid cursor", detail={"cursor": cursor})
+    return offset
@@ -4,14 +4,21 @@ All endpoints require JWT authentication
 """
 
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Response
 from app.auth import get_current_user
-from app.db import get_supabase
-from app.errors import NotFoundError
+from app.db import get_db
+from app.pagination import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, decode_offset_cursor, keyset_filter, page_rows
+from app.services.place_writer import get_place_writer
+from app.services.collection_cache import COLLECTION_CACHE_CONTROL, JOURNAL, get_collection_cache
+from app.errors import NotFoundError, ValidationError
 from app.schemas.journal import (
     CreateJournalEntryRequest,
     JournalEntry,
     JournalEntriesResponse,
+    JournalSearchResult,
+    JournalSearchResponse,
+    JournalStatsResponse,
     UpdateJournalEntryRequest,
 )
 
@@ -30,13 +37,14 @@ async def create_journal_entry(
     Place association is optional - can log food without linking to a restaurant.
     """
     user_id = user["sub"]
-    supabase = get_supabase()
+    db = get_db()
 
     # Resolve place_id from google_place_id if provided
     place_id = None
     place_name = None
     if request.google_place_id:
-        place_result = supabase.table("places").select("id, name").eq(
+        await get_place_writer().ensure_written(request.google_place_id)
+        place_result = await db.table("places").select("id, name").eq(
             "google_place_id", request.google_place_id
         ).execute()
         if place_result.data:
@@ -53,9 +61,10 @@ async def create_journal_entry(
         "eaten_at": (request.eaten_at or datetime.now(timezone.utc)).isoformat(),
     }
 
-    result = supabase.table("journal_entries").insert(entry_data).execute()
+    result = await db.table("journal_entries").insert(entry_data).execute()
     entry = result.data[0]
 
+    get_collection_cache().bump(user_id, JOURNAL)
     return JournalEntry(
         id=entry["id"],
         photo_url=entry["photo_url"],
@@ -71,37 +80,160 @@ async def create_journal_entry(
 
 @router.get("/", response_model=JournalEntriesResponse)
 async def get_journal_entries(
+    response: Response,
+    limit: int = Query(default=PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    if_none_match: Optional[str] = Header(default=None),
     user: dict = Depends(get_current_user)
 ):
     """
-    Get all journal entries for current user.
+    Get journal entries for current user, one page at a time.
 
     Ordered by eaten_at descending (most recent first).
-    Includes place details if linked.
+    Includes place details if linked. Keyset paginated on
+    (eaten_at, id) via idx_journal_user_date: pass next_cursor back as
+    cursor while has_more. A matching If-None-Match returns 304
+    after a version lookup, without reading the entries.
     """
     user_id = user["sub"]
-    supabase = get_supabase()
+    cache = get_collection_cache()
 
-    result = supabase.table("journal_entries").select(
+    etag = await cache.etag(user_id, JOURNAL, limit, cursor)
+    cache_headers = {"ETag": etag, "Cache-Control": COLLECTION_CACHE_CONTROL}
+    if cache.not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+
+    cached = cache.get(etag)
+    if cached is not None:
+        return cached
+
+    db = get_db()
+
+    query = db.table("journal_entries").select(
         "id, photo_url, rating, note, eaten_at, created_at, place_id, places(id, google_place_id, name)"
-    ).eq("user_id", user_id).order("eaten_at", desc=True).execute()
+    ).eq("user_id", user_id)
+    if cursor:
+        query = query.or_(keyset_filter("eaten_at", cursor))
+    result = await query.order("eaten_at", desc=True).order("id", desc=True).limit(limit + 1).execute()
+    rows, next_cursor = page_rows(result.data, limit, "eaten_at")
+
+    entries = [JournalEntry.from_row(row) for row in rows]
+
+    journal = JournalEntriesResponse(
+        entries=entries,
+        count=len(entries),
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+    )
+    cache.set(etag, journal)
+    return journal
+
+
+@router.get("/search", response_model=JournalSearchResponse)
+async def search_journal_entries(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in notes and place names"),
+    limit: int = Query(default=20, ge=1, le=50),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Search journal notes and linked place names, best match first.
 
-    entries = []
-    for row in result.data:
-        place_data = row.get("places")
-        entries.append(JournalEntry(
+    Full-text matching with websearch syntax ("quoted phrases",
+    -excluded words), falling back to trigram similarity for typos.
+    Served by the search_journal RPC over per-user GIN indexes.
+    """
+    query = " ".join(q.split())
+    if not query:
+        raise ValidationError(message="Search query is empty", detail={"q": q})
+    offset = decode_offset_cursor(cursor)
+    db = get_db()
+
+    result = await db.rpc("search_journal", {
+        "p_user_id": user["sub"],
+        "p_query": query,
+        "p_limit": limit + 1,
+        "p_offset": offset,
+    }).execute()
+
+    rows = result.data or []
+    has_more = len(rows) > limit
+    entries = [
+        JournalSearchResult(
             id=row["id"],
             photo_url=row["photo_url"],
             place_id=row["place_id"],
-            google_place_id=place_data["google_place_id"] if place_data else None,
-            place_name=place_data["name"] if place_data else None,
+            google_place_id=row["google_place_id"],
+            place_name=row["place_name"],
             rating=row["rating"],
             note=row["note"],
             eaten_at=row["eaten_at"],
             created_at=row["created_at"],
-        ))
+            score=row["score"],
+        )
+        for row in rows[:limit]
+    ]
+
+    return JournalSearchResponse(
+        entries=entries,
+        count=len(entries),
+        next_cursor=str(offset + limit) if has_more else None,
+        has_more=has_more,
+    )
 
-    return JournalEntriesResponse(entries=entries, count=len(entries))
+
+@router.get("/stats", response_model=JournalStatsResponse)
+async def get_journal_stats(
+    response: Response,
+    places_limit: int = Query(default=10, ge=1, le=100, description="How many top places to return"),
+    if_none_match: Optional[str] = Header(default=None),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Get journal statistics for current user.
+
+    Entries per month, rating histogram, and most visited places with
+    their average rating. Read from summary tables that triggers keep
+    current (journal_stats RPC), so cost doesn't grow with the number
+    of entries. Shares the journal ETag version: a matching
+    If-None-Match returns 304 without reading the stats.
+    """
+    user_id = user["sub"]
+    cache = get_collection_cache()
+
+    etag = await cache.etag(user_id, JOURNAL, "stats", places_limit)
+    cache_headers = {"ETag": etag, "Cache-Control": COLLECTION_CACHE_CONTROL}
+    if cache.not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+
+    cached = cache.get(etag)
+    if cached is not None:
+        return cached
+
+    db = get_db()
+    result = await db.rpc("journal_stats", {
+        "p_user_id": user_id,
+        "p_place_limit": places_limit,
+    }).execute()
+    summary = result.data or {}
+
+    ratings = summary.get("ratings") or []
+    rated_entries = sum(r["entries"] for r in ratings)
+    rating_total = sum(r["rating"] * r["entries"] for r in ratings)
+    months = summary.get("months") or []
+
+    stats = JournalStatsResponse(
+        total_entries=sum(m["entries"] for m in months),
+        rated_entries=rated_entries,
+        average_rating=round(rating_total / rated_entries, 2) if rated_entries else None,
+        months=months,
+        ratings=ratings,
+        places=summary.get("places") or [],
+    )
+    cache.set(etag, stats)
+    return stats
 
 
 @router.get("/{entry_id}", response_model=JournalEntry)
@@ -111,9 +243,9 @@ async def get_journal_entry(
 ):
     """Get a single journal entry by ID."""
     user_id = user["sub"]
-    supabase = get_supabase()
+    db = get_db()
 
-    result = supabase.table("journal_entries").select(
+    result = await db.table("journal_entries").select(
         "id, photo_url, rating, note, eaten_at, created_at, place_id, places(id, google_place_id, name)"
     ).eq("id", entry_id).eq("user_id", user_id).execute()
 
@@ -123,20 +255,7 @@ async def get_journal_entry(
             detail={"entry_id": entry_id}
         )
 
-    row = result.data[0]
-    place_data = row.get("places")
-
-    return JournalEntry(
-        id=row["id"],
-        photo_url=row["photo_url"],
-        place_id=row["place_id"],
-        google_place_id=place_data["google_place_id"] if place_data else None,
-        place_name=place_data["name"] if place_data else None,
-        rating=row["rating"],
-        note=row["note"],
-        eaten_at=row["eaten_at"],
-        created_at=row["created_at"],
-    )
+    return JournalEntry.from_row(result.data[0])
 
 
 @router.patch("/{entry_id}", response_model=JournalEntry)
@@ -151,7 +270,7 @@ async def update_journal_entry(
     Only the owner can update their entries.
     """
     user_id = user["sub"]
-    supabase = get_supabase()
+    db = get_db()
 
     # Build update data (only include non-None fields)
     update_data = {}
@@ -164,7 +283,7 @@ async def update_journal_entry(
         # Nothing to update, just return current entry
         return await get_journal_entry(entry_id, user)
 
-    result = supabase.table("journal_entries").update(update_data).eq(
+    result = await db.table("journal_entries").update(update_data).eq(
         "id", entry_id
     ).eq("user_id", user_id).execute()
 
@@ -174,6 +293,8 @@ async def update_journal_entry(
             detail={"entry_id": entry_id}
         )
 
+    get_collection_cache().bump(user_id, JOURNAL)
+
     # Fetch full entry with place data
     return await get_journal_entry(entry_id, user)
 
@@ -189,9 +310,9 @@ async def delete_journal_entry(
     Only the owner can delete their entries.
     """
     user_id = user["sub"]
-    supabase = get_supabase()
+    db = get_db()
 
-    result = supabase.table("journal_entries").delete().eq(
+    result = await db.table("journal_entries").delete().eq(
         "id", entry_id
     ).eq("user_id", user_id).execute()
 
@@ -201,4 +322,5 @@ async def delete_journal_entry(
             detail={"entry_id": entry_id}
         )
 
+    get_collection_cache().bump(user_id, JOURNAL)
     return None
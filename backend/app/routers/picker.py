@@ -0,0 +1,76 @@
+"""
+Picker router - server-side swipe sessions over ranked search results
+All endpoints require JWT authentication
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from app.auth import get_current_user
+from app.pagination import decode_offset_cursor
+from app.schemas.picker import CreatePickerSessionRequest, PickerPageResponse
+from app.schemas.places import PlaceResult
+from app.services.picker import PickerSession, get_picker_sessions
+
+router = APIRouter()
+
+
+async def _page_response(session: PickerSession, offset: int, limit: int) -> PickerPageResponse:
+    items, has_more = await get_picker_sessions().page(session, offset, limit)
+    next_offset = offset + len(items)
+    return PickerPageResponse(
+        session_id=session.id,
+        places=[PlaceResult.from_google(r) for r in items],
+        count=len(items),
+        next_cursor=str(next_offset) if has_more else None,
+        has_more=has_more,
+    )
+
+
+@router.post("/sessions", response_model=PickerPageResponse, status_code=201)
+async def create_session(
+    request: CreatePickerSessionRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Start a picker session and return its first page.
+
+    The session keeps the ranked candidate list server-side (shared by
+    all workers); page through it with GET /sessions/{session_id}?cursor=...
+    """
+    session = await get_picker_sessions().create(
+        user_id=user["sub"],
+        query=request.q,
+        lat=request.lat,
+        lng=request.lng,
+        radius=request.radius,
+        price_level=request.price_level,
+    )
+    return await _page_response(session, 0, request.limit)
+
+
+@router.get("/sessions/{session_id}", response_model=PickerPageResponse)
+async def get_session_page(
+    session_id: str,
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=10, ge=1, le=50),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Get the next page of candidates.
+
+    The next Google page is prefetched in the background when the
+    session nears the end of its candidates, so this rarely waits on
+    Google. Returns 404 once the session has expired.
+    """
+    session = await get_picker_sessions().get(session_id, user["sub"])
+    return await _page_response(session, decode_offset_cursor(cursor), limit)
+
+
+@router.delete("/sessions/{session_id}", status_code=204)
+async def delete_session(
+    session_id: str,
+    user: dict = Depends(get_current_user)
+):
+    """End a picker session early."""
+    await get_picker_sessions().delete(session_id, user["sub"])
+    return None
@@ -2,14 +2,25 @@
 Places router for Google Places API endpoints
 """
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import StreamingResponse
-import io
+from email.utils import formatdate
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
 from app.services.places import get_places_service
-from app.schemas.places import PlaceResult, PlaceSearchResponse, PlaceDetailResponse
+from app.services.ranking import rank_places
+from app.schemas.places import (
+    PlaceResult,
+    PlaceSearchResponse,
+    PlaceDetailResponse,
+    PlaceBatchRequest,
+    PlaceBatchResponse,
+)
 from app.auth import get_current_user
-from app.db import get_supabase
+from app.services.place_cache import get_place_cache
+from app.services.photo_cache import PHOTO_CACHE_CONTROL, photo_etag
+from app.http_cache import etag_matches
 from app.errors import NotFoundError
 
 router = APIRouter()
@@ -21,6 +32,9 @@ async def search_places(
     lat: float = Query(..., ge=-90, le=90),
     lng: float = Query(..., ge=-180, le=180),
     radius: int = Query(default=1000, ge=100, le=50000),
+    sort: Literal["relevance", "ranked"] = Query(default="relevance"),
+    limit: Optional[int] = Query(default=None, ge=1, le=60),
+    price_level: Optional[int] = Query(default=None, ge=0, le=4, description="Preferred price level for sort=ranked"),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -28,35 +42,53 @@ async def search_places(
 
     Requires authentication.
     Results are cached to reduce API costs.
+    sort=ranked orders results by rating, review count, distance,
+    open now and price fit (see app.services.ranking); limit keeps
+    only the top N.
     """
     service = get_places_service()
-    results = service.search_places(
+    results = await service.search_places(
         query=q,
         lat=lat,
         lng=lng,
         radius=radius
     )
 
+    if sort == "ranked":
+        results = rank_places(results, lat, lng, radius, price_level=price_level, limit=limit)
+    elif limit is not None:
+        results = results[:limit]
+
     # Map API results to response schema
-    places = [
-        PlaceResult(
-            id=r.get("cached_id"),
-            google_place_id=r["place_id"],
-            name=r["name"],
-            address=r.get("vicinity") or r.get("formatted_address"),
-            location={"lat": r["geometry"]["location"]["lat"], "lng": r["geometry"]["location"]["lng"]} if "geometry" in r else None,
-            photo_reference=r["photos"][0]["photo_reference"] if r.get("photos") else None,
-            types=r.get("types", []),
-            rating=r.get("rating"),
-            price_level=r.get("price_level"),
-            open_now=r.get("opening_hours", {}).get("open_now")
-        )
-        for r in results
-    ]
+    places = [PlaceResult.from_google(r) for r in results]
 
     return PlaceSearchResponse(places=places, count=len(places))
 
 
+@router.post("/batch", response_model=PlaceBatchResponse)
+async def get_places_batch(
+    request: PlaceBatchRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Get details for up to 50 places in one request.
+
+    ids may mix Google Place IDs and internal UUIDs. Results are in
+    request order, with null for ids that don't resolve to a place.
+    Cached places are read with a single query; only misses go to Google.
+
+    Requires authentication.
+    """
+    service = get_places_service()
+    details = await service.get_place_details_batch(request.ids)
+
+    places = [
+        PlaceDetailResponse.from_google(details[place_id]) if details[place_id] else None
+        for place_id in request.ids
+    ]
+    return PlaceBatchResponse(places=places, count=sum(1 for p in places if p is not None))
+
+
 @router.get("/{place_id}", response_model=PlaceDetailResponse)
 async def get_place_details(
     place_id: str,
@@ -78,38 +110,26 @@ async def get_place_details(
         google_place_id = place_id
     else:
         # Look up Google place_id from our cache by internal UUID
-        supabase = get_supabase()
-        result = supabase.table("places").select("google_place_id").eq("id", place_id).execute()
-        if not result.data:
-            raise NotFoundError(message="Place not found", detail={"place_id": place_id})
-        google_place_id = result.data[0]["google_place_id"]
+        google_place_id = get_place_cache().google_id_for(place_id)
+        if google_place_id is None:
+            row = await service.get_place_row(place_id)
+            if not row:
+                raise NotFoundError(message="Place not found", detail={"place_id": place_id})
+            google_place_id = row["google_place_id"]
 
     # Get details (uses cache if fresh)
-    details = service.get_place_details(google_place_id)
+    details = await service.get_place_details(google_place_id)
     if not details:
         raise NotFoundError(message="Place not found", detail={"google_place_id": google_place_id})
 
-    return PlaceDetailResponse(
-        id=details.get("cached_id"),
-        google_place_id=details.get("place_id") or google_place_id,
-        name=details["name"],
-        address=details.get("formatted_address"),
-        location={"lat": details["geometry"]["location"]["lat"], "lng": details["geometry"]["location"]["lng"]} if "geometry" in details else None,
-        photo_reference=details.get("photos", [{}])[0].get("photo_reference") if details.get("photos") else None,
-        types=details.get("types", []),
-        rating=details.get("rating"),
-        price_level=details.get("price_level"),
-        open_now=details.get("opening_hours", {}).get("open_now"),
-        website=details.get("website"),
-        phone_number=details.get("formatted_phone_number"),
-        hours=details.get("opening_hours", {}).get("weekday_text")
-    )
+    return PlaceDetailResponse.from_google({"place_id": google_place_id, **details})
 
 
 @router.get("/{place_id}/photo")
 async def get_place_photo(
     place_id: str,
     max_width: int = Query(default=400, ge=100, le=1600),
+    if_none_match: Optional[str] = Header(default=None),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -117,35 +137,50 @@ async def get_place_photo(
 
     Returns the image directly (not JSON).
     Mobile client can use this URL as image source.
+    Responses carry ETag/Cache-Control; a matching If-None-Match
+    returns 304 Not Modified without fetching the image.
 
     Requires authentication.
     """
     service = get_places_service()
-    supabase = get_supabase()
 
-    # Get photo_reference from cache
-    if place_id.startswith("ChIJ"):
-        # Look up by Google place_id
-        result = supabase.table("places").select("photo_reference").eq("google_place_id", place_id).execute()
-    else:
-        # Look up by internal UUID
-        result = supabase.table("places").select("photo_reference").eq("id", place_id).execute()
+    # Get photo_reference from cache (by Google place_id or internal UUID)
+    row = await service.get_place_row(place_id)
 
-    if not result.data or not result.data[0].get("photo_reference"):
+    if not row or not row.get("photo_reference"):
         raise NotFoundError(
             message="Photo not found",
             detail={"place_id": place_id, "hint": "Place may not have a photo"}
         )
 
-    photo_reference = result.data[0]["photo_reference"]
+    photo_reference = row["photo_reference"]
+
+    cache_headers = {
+        "ETag": photo_etag(photo_reference, max_width),
+        "Cache-Control": PHOTO_CACHE_CONTROL,
+    }
+    if etag_matches(if_none_match, cache_headers["ETag"]):
+        return Response(status_code=304, headers=cache_headers)
 
-    # Fetch photo from Google
-    photo_data = service.get_place_photo(photo_reference, max_width=max_width)
-    if not photo_data:
+    # Fetch photo (from disk cache, or Google on a miss)
+    photo = await service.get_place_photo(photo_reference, max_width=max_width)
+    if not photo:
         raise NotFoundError(message="Failed to fetch photo")
 
-    # Return image as streaming response
+    if isinstance(photo, str):
+        # Serve the cached file directly (zero-copy where the server supports it)
+        # FileResponse adds Last-Modified from the file's mtime
+        return FileResponse(photo, media_type="image/jpeg", headers=cache_headers)
+
+    # Cache miss: relay upstream chunks to the client as they arrive
+    stream_headers = {**cache_headers, "Last-Modified": formatdate(usegmt=True)}
+    if photo.content_length:
+        stream_headers["Content-Length"] = photo.content_length
+    # The background task runs once the response ends, however it ends,
+    # so a client that disconnects before reading still frees the download
     return StreamingResponse(
-        io.BytesIO(photo_data),
-        media_type="image/jpeg"
+        photo,
+        media_type=photo.media_type,
+        headers=stream_headers,
+        background=BackgroundTask(photo.aclose),
     )
@@ -3,14 +3,61 @@ Saves router - endpoints for saving/unsaving places
 All endpoints require JWT authentication
 """
 
-from fastapi import APIRouter, Depends
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Response
 from app.auth import get_current_user
-from app.db import get_supabase
+from app.db import get_db
+from app.pagination import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, keyset_filter, page_rows
+from app.services.collection_cache import COLLECTION_CACHE_CONTROL, SAVES, get_collection_cache
+from app.services.place_writer import get_place_writer
+from app.services.places import get_places_service
 from app.errors import NotFoundError, ConflictError
-from app.schemas.saves import SavePlaceRequest, SavedPlace, SavedPlacesResponse
+from app.schemas.saves import (
+    SavePlaceRequest,
+    SavedPlace,
+    SavedPlacesResponse,
+    BulkSaveRequest,
+    BulkSaveIdsRequest,
+    BulkMoveRequest,
+    BulkItemResult,
+    BulkResponse,
+)
 
 router = APIRouter()
 
+# Bulk item statuses that count as success
+BULK_OK_STATUSES = {"created", "exists", "deleted", "moved", "unchanged"}
+
+
+def _canonical_uuid(value: str) -> Optional[str]:
+    """Lowercase hyphenated form as returned by Postgres, or None if not a UUID."""
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        return None
+
+
+def _valid_uuids(ids: list[str]) -> list[str]:
+    """Distinct ids that parse as UUIDs (others can't match any save)."""
+    return list(dict.fromkeys(
+        canonical for canonical in map(_canonical_uuid, ids) if canonical
+    ))
+
+
+def _bulk_response(ids: list[str], outcomes: dict[str, dict]) -> BulkResponse:
+    """Results in request order; ids without an outcome are not_found."""
+    results = []
+    for item_id in ids:
+        outcome = outcomes.get(item_id) or outcomes.get(_canonical_uuid(item_id)) or {}
+        results.append(BulkItemResult(
+            id=item_id,
+            status=outcome.get("status", "not_found"),
+            save_id=outcome.get("save_id"),
+        ))
+    succeeded = sum(1 for r in results if r.status in BULK_OK_STATUSES)
+    return BulkResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+
 
 @router.post("/", response_model=SavedPlace, status_code=201)
 async def save_place(
@@ -20,52 +67,57 @@ async def save_place(
     """
     Save a place to user's list.
 
-    If place doesn't exist in places table, creates a minimal entry.
+    One save_place RPC resolves the place, inserts the save and returns
+    the joined row; the database enforces one save per list, including
+    the default list, so double taps can't create duplicates.
+    If the place isn't cached yet and fetch_if_missing is set, it is
+    fetched from Google and cached first.
     Uses default list (list_id=NULL) if no list_id provided.
 
     Returns 409 Conflict if already saved to same list.
     """
     user_id = user["sub"]
-    supabase = get_supabase()
+    db = get_db()
+    writer = get_place_writer()
 
-    # Find or create place in places table
-    place_result = supabase.table("places").select("id, google_place_id, name, address, photo_reference").eq("google_place_id", request.google_place_id).execute()
+    # Place may still be queued in the write-behind pipeline
+    await writer.ensure_written(request.google_place_id)
 
-    if not place_result.data:
-        # Place not in cache - this shouldn't happen if user saw it in picker
-        # but handle gracefully by creating minimal entry
-        raise NotFoundError(
-            message="Place not found in cache",
-            detail={"google_place_id": request.google_place_id, "hint": "Place must be fetched first via search"}
-        )
+    params = {
+        "p_user_id": user_id,
+        "p_google_place_id": request.google_place_id,
+        "p_list_id": request.list_id,
+    }
+    result = await db.rpc("save_place", params).execute()
 
-    place = place_result.data[0]
+    if not result.data and request.fetch_if_missing:
+        # Not cached yet - fetch it, write it through, and retry once
+        details = await get_places_service().get_place_details(request.google_place_id)
+        if details:
+            await writer.ensure_written(request.google_place_id)
+            result = await db.rpc("save_place", params).execute()
 
-    # Check if already saved
-    existing = supabase.table("saved_places").select("id").eq("user_id", user_id).eq("place_id", place["id"]).is_("list_id", "null" if request.list_id is None else request.list_id).execute()
+    if not result.data:
+        raise NotFoundError(
+            message="Place not found",
+            detail={"google_place_id": request.google_place_id}
+        )
 
-    if existing.data:
+    saved = result.data[0]
+    if not saved["created"]:
         raise ConflictError(
             message="Place already saved",
-            detail={"place_id": place["id"], "list_id": request.list_id}
+            detail={"place_id": saved["place_id"], "list_id": request.list_id}
         )
 
-    # Create saved_places entry
-    save_data = {
-        "user_id": user_id,
-        "place_id": place["id"],
-        "list_id": request.list_id
-    }
-    result = supabase.table("saved_places").insert(save_data).execute()
-    saved = result.data[0]
-
+    get_collection_cache().bump(user_id, SAVES)
     return SavedPlace(
         id=saved["id"],
-        place_id=place["id"],
-        google_place_id=place["google_place_id"],
-        name=place["name"],
-        address=place["address"],
-        photo_reference=place["photo_reference"],
+        place_id=saved["place_id"],
+        google_place_id=saved["google_place_id"],
+        name=saved["name"],
+        address=saved["address"],
+        photo_reference=saved["photo_reference"],
         saved_at=saved["saved_at"],
         list_id=saved["list_id"]
     )
@@ -73,37 +125,56 @@ async def save_place(
 
 @router.get("/", response_model=SavedPlacesResponse)
 async def get_saved_places(
+    response: Response,
+    limit: int = Query(default=PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    if_none_match: Optional[str] = Header(default=None),
     user: dict = Depends(get_current_user)
 ):
     """
-    Get all saved places for current user.
+    Get saved places for current user, one page at a time.
 
     Returns places from default list (list_id=NULL).
-    Ordered by most recently saved first.
+    Ordered by most recently saved first. Keyset paginated on
+    (saved_at, id): pass next_cursor back as cursor while has_more.
+    The ETag changes whenever the user's saves change; a matching
+    If-None-Match returns 304 after a version lookup, without
+    reading the saves.
     """
     user_id = user["sub"]
-    supabase = get_supabase()
+    cache = get_collection_cache()
+
+    etag = await cache.etag(user_id, SAVES, limit, cursor)
+    cache_headers = {"ETag": etag, "Cache-Control": COLLECTION_CACHE_CONTROL}
+    if cache.not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+
+    cached = cache.get(etag)
+    if cached is not None:
+        return cached
+
+    db = get_db()
 
     # Join saved_places with places table
-    result = supabase.table("saved_places").select(
+    query = db.table("saved_places").select(
         "id, saved_at, list_id, places(id, google_place_id, name, address, photo_reference)"
-    ).eq("user_id", user_id).is_("list_id", "null").order("saved_at", desc=True).execute()
-
-    places = []
-    for row in result.data:
-        place_data = row["places"]
-        places.append(SavedPlace(
-            id=row["id"],
-            place_id=place_data["id"],
-            google_place_id=place_data["google_place_id"],
-            name=place_data["name"],
-            address=place_data["address"],
-            photo_reference=place_data["photo_reference"],
-            saved_at=row["saved_at"],
-            list_id=row["list_id"]
-        ))
+    ).eq("user_id", user_id).is_("list_id", "null")
+    if cursor:
+        query = query.or_(keyset_filter("saved_at", cursor))
+    result = await query.order("saved_at", desc=True).order("id", desc=True).limit(limit + 1).execute()
+    rows, next_cursor = page_rows(result.data, limit, "saved_at")
+
+    places = [SavedPlace.from_row(row) for row in rows]
 
-    return SavedPlacesResponse(places=places, count=len(places))
+    saved_places = SavedPlacesResponse(
+        places=places,
+        count=len(places),
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+    )
+    cache.set(etag, saved_places)
+    return saved_places
 
 
 @router.delete("/{save_id}", status_code=204)
@@ -117,10 +188,10 @@ async def unsave_place(
     Returns 404 if save not found or doesn't belong to user.
     """
     user_id = user["sub"]
-    supabase = get_supabase()
+    db = get_db()
 
     # Verify ownership and delete
-    result = supabase.table("saved_places").delete().eq("id", save_id).eq("user_id", user_id).execute()
+    result = await db.table("saved_places").delete().eq("id", save_id).eq("user_id", user_id).execute()
 
     if not result.data:
         raise NotFoundError(
@@ -128,4 +199,88 @@ async def unsave_place(
             detail={"save_id": save_id}
         )
 
+    get_collection_cache().bump(user_id, SAVES)
     return None
+
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_save_places(
+    request: BulkSaveRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Save many places to one list in a single statement.
+
+    Per-item status: created, exists (already saved to that list) or
+    not_found (place not cached - open it once via search or details).
+    """
+    user_id = user["sub"]
+    db = get_db()
+    writer = get_place_writer()
+
+    # Places may still be queued in the write-behind pipeline; the first
+    # queued id flushes the whole batch
+    for google_place_id in request.google_place_ids:
+        await writer.ensure_written(google_place_id)
+
+    result = await db.rpc("save_places_bulk", {
+        "p_user_id": user_id,
+        "p_google_place_ids": list(dict.fromkeys(request.google_place_ids)),
+        "p_list_id": request.list_id,
+    }).execute()
+
+    outcomes = {row["google_place_id"]: row for row in result.data or []}
+    get_collection_cache().bump(user_id, SAVES)
+    return _bulk_response(request.google_place_ids, outcomes)
+
+
+@router.post("/bulk/delete", response_model=BulkResponse)
+async def bulk_unsave_places(
+    request: BulkSaveIdsRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Remove many saves in one DELETE ... WHERE id IN (...).
+
+    Per-item status: deleted or not_found.
+    """
+    user_id = user["sub"]
+    db = get_db()
+
+    outcomes = {}
+    save_ids = _valid_uuids(request.save_ids)
+    if save_ids:
+        result = await db.table("saved_places").delete().eq("user_id", user_id).in_("id", save_ids).execute()
+        outcomes = {row["id"]: {"status": "deleted", "save_id": row["id"]} for row in result.data or []}
+        get_collection_cache().bump(user_id, SAVES)
+
+    return _bulk_response(request.save_ids, outcomes)
+
+
+@router.post("/bulk/move", response_model=BulkResponse)
+async def bulk_move_saves(
+    request: BulkMoveRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Move many saves to one list (list_id null = default list) in a
+    single statement.
+
+    Per-item status: moved, unchanged (already in that list), conflict
+    (the place is already saved to that list) or not_found.
+    """
+    user_id = user["sub"]
+    db = get_db()
+
+    outcomes = {}
+    save_ids = _valid_uuids(request.save_ids)
+    if save_ids:
+        result = await db.rpc("move_saved_places", {
+            "p_user_id": user_id,
+            "p_save_ids": save_ids,
+            "p_list_id": request.list_id,
+        }).execute()
+        outcomes = {row["save_id"]: row for row in result.data or []}
+        get_collection_cache().bump(user_id, SAVES)
+
+    return _bulk_response(request.save_ids, outcomes)
@@ -0,0 +1,123 @@
+"""
+Sync router - delta sync of saves and journal entries
+All endpoints require JWT authentication
+"""
+
+import os
+import asyncio
+import base64
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from app.auth import get_current_user
+from app.db import get_db
+from app.errors import ValidationError
+from app.schemas.saves import SavedPlace
+from app.schemas.journal import JournalEntry
+from app.schemas.sync import SyncResponse, Tombstone
+
+router = APIRouter()
+
+# next_since is set this far before the sync started, so rows committed by
+# transactions still in flight are picked up next time (clients apply
+# changes idempotently, so re-sent rows are harmless)
+SYNC_CURSOR_OVERLAP_SECONDS = float(os.getenv("SYNC_CURSOR_OVERLAP_SECONDS", "5"))
+# Must match the interval passed to prune_sync_tombstones()
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+# More changes than this in one collection and the client is told to reload instead
+SYNC_MAX_CHANGES = int(os.getenv("SYNC_MAX_CHANGES", "500"))
+
+
+def _encode_since(moment: datetime) -> str:
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode().rstrip("=")
+
+
+def _decode_since(since: str) -> datetime:
+    """
+    Decode a cursor from _encode_since.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        padded = since + "=" * (-len(since) % 4)
+        moment = datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode())
+        if moment.tzinfo is None:
+            raise ValueError("cursor has no timezone")
+        return moment
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValidationError(message="Invalid sync cursor", detail={"since": since, "error": str(e)})
+
+
+@router.get("/", response_model=SyncResponse)
+async def sync(
+    since: Optional[str] = Query(default=None, description="next_since from the previous sync"),
+    scope: Optional[Literal["saves", "journal"]] = Query(default=None, description="Only sync one collection"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Get saves and journal entries changed since the cursor.
+
+    Returns created/updated rows and tombstones for deleted rows. Without
+    since, or when since is older than the tombstone retention window or
+    has too many changes behind it, returns reset=true and no rows: reload
+    the full lists, then sync from next_since.
+    """
+    user_id = user["sub"]
+    db = get_db()
+
+    started = datetime.now(timezone.utc)
+    next_since = _encode_since(started - timedelta(seconds=SYNC_CURSOR_OVERLAP_SECONDS))
+    reset = SyncResponse(saves=[], journal=[], tombstones=[], next_since=next_since, reset=True)
+
+    if not since:
+        return reset
+    since_at = _decode_since(since)
+    if since_at < started - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+        return reset
+    since_iso = since_at.isoformat()
+
+    async def changed_saves() -> list[dict]:
+        if scope == "journal":
+            return []
+        result = await db.table("saved_places").select(
+            "id, saved_at, list_id, places(id, google_place_id, name, address, photo_reference)"
+        ).eq("user_id", user_id).gt("updated_at", since_iso).order(
+            "updated_at"
+        ).limit(SYNC_MAX_CHANGES + 1).execute()
+        return result.data
+
+    async def changed_journal() -> list[dict]:
+        if scope == "saves":
+            return []
+        result = await db.table("journal_entries").select(
+            "id, photo_url, rating, note, eaten_at, created_at, place_id, places(id, google_place_id, name)"
+        ).eq("user_id", user_id).gt("updated_at", since_iso).order(
+            "updated_at"
+        ).limit(SYNC_MAX_CHANGES + 1).execute()
+        return result.data
+
+    async def tombstones() -> list[dict]:
+        query = db.table("sync_tombstones").select(
+            "entity, entity_id, deleted_at"
+        ).eq("user_id", user_id).gt("deleted_at", since_iso)
+        if scope:
+            query = query.eq("entity", "saved_place" if scope == "saves" else "journal_entry")
+        result = await query.order("deleted_at").limit(SYNC_MAX_CHANGES + 1).execute()
+        return result.data
+
+    save_rows, journal_rows, tombstone_rows = await asyncio.gather(
+        changed_saves(), changed_journal(), tombstones()
+    )
+    if max(len(save_rows), len(journal_rows), len(tombstone_rows)) > SYNC_MAX_CHANGES:
+        return reset
+
+    return SyncResponse(
+        saves=[SavedPlace.from_row(row) for row in save_rows],
+        journal=[JournalEntry.from_row(row) for row in journal_rows],
+        tombstones=[
+            Tombstone(entity=row["entity"], id=row["entity_id"], deleted_at=row["deleted_at"])
+            for row in tombstone_rows
+        ],
+        next_since=next_since,
+    )
@@ -3,16 +3,22 @@ Users router - endpoints for user profile and data
 All endpoints require JWT authentication via get_current_user dependency
 """
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Response
 from app.auth import get_current_user
-from app.db import get_supabase
+from app.db import get_db
 from app.errors import NotFoundError
+from app.services.collection_cache import COLLECTION_CACHE_CONTROL, PROFILE, get_collection_cache
 
 router = APIRouter()
 
 
 @router.get("/me")
-async def get_current_user_profile(user: dict = Depends(get_current_user)):
+async def get_current_user_profile(
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    user: dict = Depends(get_current_user)
+):
     """
     Get current authenticated user's profile.
 
@@ -23,11 +29,26 @@ async def get_current_user_profile(user: dict = Depends(get_current_user)):
     - email: Email from JWT
     - created_at: Profile creation timestamp
     - updated_at: Last profile update timestamp
+
+    Carries an ETag; a matching If-None-Match returns 304 without
+    reading the profile.
     """
     user_id = user["sub"]
+    cache = get_collection_cache()
+
+    # email comes from the token, so it is part of the cached view
+    etag = await cache.etag(user_id, PROFILE, user.get("email"))
+    cache_headers = {"ETag": etag, "Cache-Control": COLLECTION_CACHE_CONTROL}
+    if cache.not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+
+    cached = cache.get(etag)
+    if cached is not None:
+        return cached
 
-    supabase = get_supabase()
-    result = supabase.table("users").select("*").eq("id", user_id).execute()
+    db = get_db()
+    result = await db.table("users").select("*").eq("id", user_id).execute()
 
     # User should always exist due to trigger, but handle edge case
     if not result.data:
@@ -41,9 +62,11 @@ async def get_current_user_profile(user: dict = Depends(get_current_user)):
 
     profile = result.data[0]
 
-    return {
+    me = {
         "user_id": user_id,
         "email": user.get("email"),
         "created_at": profile["created_at"],
         "updated_at": profile["updated_at"],
     }
+    cache.set(etag, me)
+    return me
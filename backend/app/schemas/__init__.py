@@ -5,8 +5,13 @@ from app.schemas.journal import (
     CreateJournalEntryRequest,
     JournalEntry,
     JournalEntriesResponse,
+    JournalSearchResult,
+    JournalSearchResponse,
+    JournalStatsResponse,
     UpdateJournalEntryRequest,
 )
+from app.schemas.picker import CreatePickerSessionRequest, PickerPageResponse
+from app.schemas.sync import SyncResponse, Tombstone
 
 __all__ = [
     "SavePlaceRequest",
@@ -15,5 +20,12 @@ __all__ = [
     "CreateJournalEntryRequest",
     "JournalEntry",
     "JournalEntriesResponse",
+    "JournalSearchResult",
+    "JournalSearchResponse",
+    "JournalStatsResponse",
     "UpdateJournalEntryRequest",
+    "CreatePickerSessionRequest",
+    "PickerPageResponse",
+    "SyncResponse",
+    "Tombstone",
 ]
@@ -26,11 +26,74 @@ class JournalEntry(BaseModel):
     eaten_at: datetime
     created_at: datetime
 
+    @classmethod
+    def from_row(cls, row: dict) -> "JournalEntry":
+        """Build from a journal_entries row with an embedded places(...) select."""
+        place_data = row.get("places")
+        return cls(
+            id=row["id"],
+            photo_url=row["photo_url"],
+            place_id=row["place_id"],
+            google_place_id=place_data["google_place_id"] if place_data else None,
+            place_name=place_data["name"] if place_data else None,
+            rating=row["rating"],
+            note=row["note"],
+            eaten_at=row["eaten_at"],
+            created_at=row["created_at"],
+        )
+
 
 class JournalEntriesResponse(BaseModel):
     """Response for listing journal entries"""
     entries: list[JournalEntry]
-    count: int
+    count: int  # Items on this page
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
+    has_more: bool = False
+
+
+class JournalSearchResult(JournalEntry):
+    """Journal entry matching a search, with its relevance"""
+    score: float  # Higher = better match
+
+
+class JournalSearchResponse(BaseModel):
+    """Ranked search results, one page at a time"""
+    entries: list[JournalSearchResult]
+    count: int  # Items on this page
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
+    has_more: bool = False
+
+
+class JournalMonthCount(BaseModel):
+    """Entries eaten in one calendar month (UTC)"""
+    month: str  # YYYY-MM
+    entries: int
+
+
+class JournalRatingCount(BaseModel):
+    """Entries with one rating"""
+    rating: int  # 1-5
+    entries: int
+
+
+class JournalPlaceStats(BaseModel):
+    """Visits and average rating at one place"""
+    place_id: str
+    google_place_id: str
+    name: str
+    visits: int
+    rated_visits: int
+    average_rating: Optional[float] = None  # None if no visit was rated
+
+
+class JournalStatsResponse(BaseModel):
+    """Journal summary for the current user"""
+    total_entries: int
+    rated_entries: int
+    average_rating: Optional[float] = None
+    months: list[JournalMonthCount]  # Newest first
+    ratings: list[JournalRatingCount]  # Histogram, ratings 1-5
+    places: list[JournalPlaceStats]  # Most visited first
 
 
 class UpdateJournalEntryRequest(BaseModel):
@@ -0,0 +1,25 @@
+"""Pydantic schemas for picker session endpoints"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.places import PlaceResult
+
+
+class CreatePickerSessionRequest(BaseModel):
+    """Start a swipe session over a nearby search"""
+    q: str = Field(default="restaurant", min_length=1)
+    lat: float = Field(..., ge=-90, le=90)
+    lng: float = Field(..., ge=-180, le=180)
+    radius: int = Field(default=1000, ge=100, le=50000)
+    price_level: Optional[int] = Field(default=None, ge=0, le=4)  # Preferred price for ranking
+    limit: int = Field(default=10, ge=1, le=50)  # First page size
+
+
+class PickerPageResponse(BaseModel):
+    """One page of ranked candidates from a picker session"""
+    session_id: str
+    places: list[PlaceResult]
+    count: int
+    next_cursor: Optional[str] = None  # Pass back to get the next page
+    has_more: bool
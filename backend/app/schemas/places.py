@@ -30,6 +30,22 @@ class PlaceResult(BaseModel):
     price_level: Optional[int] = None
     open_now: Optional[bool] = None
 
+    @classmethod
+    def from_google(cls, r: dict) -> "PlaceResult":
+        """Map a Google search/details result (or cached equivalent)."""
+        return cls(
+            id=r.get("cached_id"),
+            google_place_id=r["place_id"],
+            name=r["name"],
+            address=r.get("vicinity") or r.get("formatted_address"),
+            location={"lat": r["geometry"]["location"]["lat"], "lng": r["geometry"]["location"]["lng"]} if "geometry" in r else None,
+            photo_reference=r["photos"][0]["photo_reference"] if r.get("photos") else None,
+            types=r.get("types", []),
+            rating=r.get("rating"),
+            price_level=r.get("price_level"),
+            open_now=(r.get("opening_hours") or {}).get("open_now")
+        )
+
 
 class PlaceSearchRequest(BaseModel):
     """Query parameters for place search"""
@@ -61,3 +77,36 @@ class PlaceDetailResponse(BaseModel):
     website: Optional[str] = None
     phone_number: Optional[str] = None
     hours: Optional[list[str]] = None  # Opening hours text
+    stale: bool = False  # Served from cache past its soft TTL; refresh in progress
+
+    @classmethod
+    def from_google(cls, details: dict) -> "PlaceDetailResponse":
+        """Map a Google Place Details result (or cached equivalent)."""
+        opening_hours = details.get("opening_hours") or {}
+        return cls(
+            id=details.get("cached_id"),
+            google_place_id=details["place_id"],
+            name=details["name"],
+            address=details.get("formatted_address"),
+            location={"lat": details["geometry"]["location"]["lat"], "lng": details["geometry"]["location"]["lng"]} if "geometry" in details else None,
+            photo_reference=details.get("photos", [{}])[0].get("photo_reference") if details.get("photos") else None,
+            types=details.get("types", []),
+            rating=details.get("rating"),
+            price_level=details.get("price_level"),
+            open_now=opening_hours.get("open_now"),
+            website=details.get("website"),
+            phone_number=details.get("formatted_phone_number"),
+            hours=opening_hours.get("weekday_text"),
+            stale=details.get("_stale", False)
+        )
+
+
+class PlaceBatchRequest(BaseModel):
+    """Mixed internal UUIDs and Google Place IDs to resolve in one call"""
+    ids: list[str] = Field(..., min_length=1, max_length=50)
+
+
+class PlaceBatchResponse(BaseModel):
+    """Batch details, aligned with the request ids (null = not found)"""
+    places: list[Optional[PlaceDetailResponse]]
+    count: int  # Number of places found
@@ -1,6 +1,6 @@
 """Pydantic schemas for saved places endpoints"""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -9,6 +9,7 @@ class SavePlaceRequest(BaseModel):
     """Request to save a place"""
     google_place_id: str
     list_id: Optional[str] = None  # NULL = default "Saved" list
+    fetch_if_missing: bool = True  # Fetch and cache the place if it isn't cached yet
 
 
 class SavedPlace(BaseModel):
@@ -22,8 +23,56 @@ class SavedPlace(BaseModel):
     saved_at: datetime
     list_id: Optional[str] = None
 
+    @classmethod
+    def from_row(cls, row: dict) -> "SavedPlace":
+        """Build from a saved_places row with an embedded places(...) select."""
+        place_data = row["places"]
+        return cls(
+            id=row["id"],
+            place_id=place_data["id"],
+            google_place_id=place_data["google_place_id"],
+            name=place_data["name"],
+            address=place_data["address"],
+            photo_reference=place_data["photo_reference"],
+            saved_at=row["saved_at"],
+            list_id=row["list_id"]
+        )
+
 
 class SavedPlacesResponse(BaseModel):
     """Response with list of saved places"""
     places: list[SavedPlace]
-    count: int
+    count: int  # Items on this page
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
+    has_more: bool = False
+
+
+class BulkSaveRequest(BaseModel):
+    """Save many places to one list"""
+    google_place_ids: list[str] = Field(..., min_length=1, max_length=200)
+    list_id: Optional[str] = None  # NULL = default "Saved" list
+
+
+class BulkSaveIdsRequest(BaseModel):
+    """Remove many saves"""
+    save_ids: list[str] = Field(..., min_length=1, max_length=200)
+
+
+class BulkMoveRequest(BaseModel):
+    """Move many saves to one list"""
+    save_ids: list[str] = Field(..., min_length=1, max_length=200)
+    list_id: Optional[str] = None  # NULL = default "Saved" list
+
+
+class BulkItemResult(BaseModel):
+    """Outcome for one item of a bulk request"""
+    id: str  # The google_place_id or save id from the request
+    status: str  # created/exists, deleted, moved/unchanged/conflict, or not_found
+    save_id: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    """Per-item results of a bulk request, in request order"""
+    results: list[BulkItemResult]
+    succeeded: int
+    failed: int
@@ -0,0 +1,24 @@
+"""Pydantic schemas for delta sync"""
+
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel
+
+from app.schemas.saves import SavedPlace
+from app.schemas.journal import JournalEntry
+
+
+class Tombstone(BaseModel):
+    """A deleted save or journal entry"""
+    entity: Literal["saved_place", "journal_entry"]
+    id: str  # saved_places.id or journal_entries.id
+    deleted_at: datetime
+
+
+class SyncResponse(BaseModel):
+    """Changes since the client's sync cursor"""
+    saves: list[SavedPlace]  # Created or updated saves, all lists
+    journal: list[JournalEntry]  # Created or updated journal entries
+    tombstones: list[Tombstone]  # Deleted since the cursor
+    next_since: str  # Pass as since on the next sync
+    reset: bool = False  # Cursor missing or too old - reload the full lists, then sync from next_since
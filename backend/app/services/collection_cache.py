@@ -0,0 +1,139 @@
+"""
+Per-user collection versions and response cache for list endpoints
+Triggers bump a user's collection version in the database on every change
+(collection_versions); reads use it as an ETag and as the key for built
+responses, so repeat polling skips the list query
+"""
+
+import os
+import hashlib
+import logging
+import secrets
+from typing import Any, Hashable, Optional
+
+from app.cache import TTLCache
+from app.db import get_db
+from app.http_cache import etag_matches
+
+COLLECTION_CACHE_ENABLED = os.getenv("COLLECTION_CACHE_ENABLED", "true").lower() == "true"
+COLLECTION_CACHE_MAX_ENTRIES = int(os.getenv("COLLECTION_CACHE_MAX_ENTRIES", "10000"))
+# How long a worker reuses a version it read. Writes through other workers
+# (or outside the API) can go unseen for this long; 0 reads it every time
+COLLECTION_VERSION_TTL_SECONDS = float(os.getenv("COLLECTION_VERSION_TTL_SECONDS", "0"))
+# Built responses are keyed by version, so this only bounds memory
+COLLECTION_RESPONSE_TTL_SECONDS = float(os.getenv("COLLECTION_RESPONSE_TTL_SECONDS", "300"))
+
+# Clients may store responses but must revalidate (a 304 is cheap)
+COLLECTION_CACHE_CONTROL = "private, no-cache"
+
+# Collections that carry a version (collection_versions.collection)
+SAVES = "saves"
+JOURNAL = "journal"
+PROFILE = "profile"
+
+logger = logging.getLogger(__name__)
+
+# Singleton cache
+_collection_cache: Optional["CollectionCache"] = None
+
+
+class CollectionCache:
+    """
+    Version per (user, collection) plus built responses per version.
+
+    Versions are counters kept in the database, so every worker derives
+    the same ETag. If the version can't be read, a random one is used:
+    it matches no ETag a client holds, so the worst case is one list read.
+    """
+
+    def __init__(self, max_entries: int, version_ttl_seconds: float, response_ttl_seconds: float):
+        self.version_ttl_seconds = version_ttl_seconds
+        self._versions = TTLCache(max_entries, version_ttl_seconds)
+        # Responses for superseded versions are never read again and age out
+        self._responses = TTLCache(max_entries, response_ttl_seconds)
+        self.bumps = 0
+        self.version_reads = 0
+        self.version_read_failures = 0
+
+    async def version(self, user_id: str, collection: str) -> str:
+        """Current version of a user's collection."""
+        key = (user_id, collection)
+        if self.version_ttl_seconds > 0:
+            version = self._versions.get(key)
+            if version is not None:
+                return version
+
+        self.version_reads += 1
+        try:
+            db = get_db()
+            result = await db.table("collection_versions").select("version").eq(
+                "user_id", user_id
+            ).eq("collection", collection).execute()
+        except Exception as e:
+            self.version_read_failures += 1
+            logger.warning(f"Collection version read failed for {collection}: {e}")
+            return secrets.token_hex(8)
+
+        # No row yet: nothing has changed since the table was created
+        version = str(result.data[0]["version"]) if result.data else "0"
+        if self.version_ttl_seconds > 0:
+            self._versions.set(key, version)
+        return version
+
+    def bump(self, user_id: str, *collections: str) -> None:
+        """
+        Forget this worker's copy of changed collections' versions.
+
+        The database trigger has already bumped them; the next read
+        fetches the new value.
+        """
+        for collection in collections:
+            self._versions.pop((user_id, collection))
+            self.bumps += 1
+
+    async def etag(self, user_id: str, collection: str, *variant: Hashable) -> str:
+        """
+        Weak ETag for one view of a collection.
+
+        variant distinguishes views of the same version (page size,
+        cursor, or anything else the response depends on).
+        """
+        version = await self.version(user_id, collection)
+        raw = repr((user_id, collection, version, variant)).encode()
+        return f'W/"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+    def not_modified(self, if_none_match: Optional[str], etag: str) -> bool:
+        """True if the client already has this version (answer 304)."""
+        return COLLECTION_CACHE_ENABLED and etag_matches(if_none_match, etag)
+
+    def get(self, etag: str) -> Any:
+        """Cached response built for this ETag, or None."""
+        if not COLLECTION_CACHE_ENABLED:
+            return None
+        return self._responses.get(etag)
+
+    def set(self, etag: str, response: Any) -> None:
+        if COLLECTION_CACHE_ENABLED:
+            self._responses.set(etag, response)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": COLLECTION_CACHE_ENABLED,
+            "bumps": self.bumps,
+            "version_reads": self.version_reads,
+            "version_read_failures": self.version_read_failures,
+            "versions": len(self._versions),
+            "responses": self._responses.stats(),
+        }
+
+
+def get_collection_cache() -> CollectionCache:
+    """Get singleton collection cache."""
+    global _collection_cache
+    if _collection_cache is None:
+        _collection_cache = CollectionCache(
+            max_entries=COLLECTION_CACHE_MAX_ENTRIES,
+            version_ttl_seconds=COLLECTION_VERSION_TTL_SECONDS,
+            response_ttl_seconds=COLLECTION_RESPONSE_TTL_SECONDS,
+        )
+    return _collection_cache
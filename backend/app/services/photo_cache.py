@@ -0,0 +1,228 @@
+"""
+On-disk cache for place photos
+Files are content-addressed by (photo_reference, max_width) and evicted
+least-recently-used first once the cache exceeds its byte budget
+"""
+
+import os
+import asyncio
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
+import httpx
+
+PHOTO_CACHE_DIR = os.getenv("PHOTO_CACHE_DIR", ".cache/photos")
+PHOTO_CACHE_MAX_BYTES = int(os.getenv("PHOTO_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Client-side caching of photo responses
+PHOTO_MAX_AGE_SECONDS = int(os.getenv("PHOTO_MAX_AGE_SECONDS", "86400"))
+PHOTO_CACHE_CONTROL = f"private, max-age={PHOTO_MAX_AGE_SECONDS}"
+
+# A streamed download nobody has started reading after this many seconds
+# is closed, and requests waiting on a shared download stop waiting after
+# this long and fetch the photo themselves
+PHOTO_STREAM_TIMEOUT_SECONDS = float(os.getenv("PHOTO_STREAM_TIMEOUT_SECONDS", "30"))
+
+# Result of a shared download whose streaming client went away mid-body
+DOWNLOAD_ABORTED = object()
+
+logger = logging.getLogger(__name__)
+
+# Singleton cache
+_photo_cache: Optional["PhotoCache"] = None
+
+
+class PhotoCache:
+    """
+    Byte-budgeted LRU cache of photo files.
+
+    Layout: <dir>/<key[:2]>/<key>.jpg where key is the SHA-256 of the
+    photo reference and width. Recency is tracked in memory and seeded
+    from file access times on startup.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """Index files left by a previous run, oldest access first."""
+        found = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".jpg"):
+                    stat = entry.stat()
+                    found.append((stat.st_atime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._files[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    @staticmethod
+    def key(photo_reference: str, max_width: int) -> str:
+        return hashlib.sha256(f"{photo_reference}:{max_width}".encode()).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.jpg")
+
+    def get(self, photo_reference: str, max_width: int) -> Optional[str]:
+        """Path of a cached photo, or None on a miss."""
+        key = self.key(photo_reference, max_width)
+        if key not in self._files:
+            self.misses += 1
+            return None
+        self._files.move_to_end(key)
+        self.hits += 1
+        return self.path_for(key)
+
+    def temp_path(self, key: str) -> str:
+        """Reserve a temp file next to the key's final location."""
+        directory = os.path.dirname(self.path_for(key))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def commit(self, key: str, tmp_path: str) -> str:
+        """Move a completed temp file into the cache and return its path."""
+        path = self.path_for(key)
+        os.replace(tmp_path, path)
+        self._add(key, os.path.getsize(path))
+        return path
+
+    def _add(self, key: str, size: int) -> None:
+        self.total_bytes += size - self._files.pop(key, 0)
+        self._files[key] = size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._files:
+            key, size = self._files.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to evict cached photo {key}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._files),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class PhotoStream:
+    """
+    Relays an upstream photo download to the client chunk by chunk
+    while writing it into the cache.
+
+    Memory use is one chunk at a time. When the body completes, the file
+    is committed to the cache and `done` resolves to its path. If the
+    client disconnects or the upstream fails, the partial file is
+    discarded and `done` resolves to DOWNLOAD_ABORTED so waiting
+    requests can retry.
+
+    Owners must call aclose() once the stream is no longer needed (the
+    photo route does so in a background task). A stream nobody starts
+    reading within PHOTO_STREAM_TIMEOUT_SECONDS is closed regardless.
+    """
+
+    def __init__(self, cache: PhotoCache, key: str, response: httpx.Response, done: asyncio.Future):
+        self.cache = cache
+        self.key = key
+        self.response = response
+        self.done = done
+        self.media_type = response.headers.get("content-type", "image/jpeg")
+        self.content_length = response.headers.get("content-length")
+        self._relay_iter: Optional[AsyncIterator[bytes]] = None
+        self._watchdog = asyncio.get_running_loop().call_later(
+            PHOTO_STREAM_TIMEOUT_SECONDS, self._expire
+        )
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        self._watchdog.cancel()
+        if self._relay_iter is None:
+            self._relay_iter = self._relay()
+        return self._relay_iter
+
+    def _finish(self, result) -> None:
+        if not self.done.done():
+            self.done.set_result(result)
+
+    def _expire(self) -> None:
+        if self._relay_iter is None and not self.done.done():
+            logger.warning(f"Closing photo stream {self.key} that was never read")
+            self._closing = asyncio.get_running_loop().create_task(self.aclose())
+
+    async def aclose(self) -> None:
+        """
+        Release the upstream response.
+
+        Safe to call at any point: after a complete relay it does nothing,
+        mid-relay or before the first read it aborts the download.
+        """
+        self._watchdog.cancel()
+        if self._relay_iter is not None:
+            # Runs the relay's cleanup if it hasn't finished
+            await self._relay_iter.aclose()
+        # The relay's own close may have been cut short by cancellation
+        self._finish(DOWNLOAD_ABORTED)
+        await self.response.aclose()
+
+    async def _relay(self) -> AsyncIterator[bytes]:
+        tmp_path = self.cache.temp_path(self.key)
+        committed = False
+        try:
+            with open(tmp_path, "wb") as f:
+                async for chunk in self.response.aiter_bytes():
+                    f.write(chunk)
+                    yield chunk
+            path = self.cache.commit(self.key, tmp_path)
+            committed = True
+            self._finish(path)
+        finally:
+            # Release waiters before awaiting: a cancelled relay (client
+            # disconnect) may not get past the first await
+            if not committed:
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+                self._finish(DOWNLOAD_ABORTED)
+            await self.response.aclose()
+
+
+def photo_etag(photo_reference: str, max_width: int) -> str:
+    """
+    Strong ETag for a photo response.
+
+    A photo reference and width always identify the same image bytes,
+    so the validator can be computed without reading the file.
+    """
+    return f'"{PhotoCache.key(photo_reference, max_width)[:32]}"'
+
+
+def get_photo_cache() -> PhotoCache:
+    """Get singleton photo cache."""
+    global _photo_cache
+    if _photo_cache is None:
+        _photo_cache = PhotoCache(PHOTO_CACHE_DIR, PHOTO_CACHE_MAX_BYTES)
+    return _photo_cache
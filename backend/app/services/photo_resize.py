@@ -0,0 +1,46 @@
+"""
+Photo derivative generation
+Resizes a cached source photo to smaller widths in a process pool so
+each photo is downloaded from Google only once
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from PIL import Image
+
+PHOTO_RESIZE_WORKERS = int(os.getenv("PHOTO_RESIZE_WORKERS", "2"))
+PHOTO_JPEG_QUALITY = int(os.getenv("PHOTO_JPEG_QUALITY", "85"))
+
+# Singleton process pool
+_resize_pool: Optional[ProcessPoolExecutor] = None
+
+
+def resize_photo(source_path: str, dest_path: str, max_width: int) -> None:
+    """
+    Write a JPEG copy of source_path no wider than max_width.
+
+    Runs in a worker process. Images already narrow enough are
+    re-encoded at their original size.
+    """
+    with Image.open(source_path) as image:
+        if image.width > max_width:
+            height = max(1, round(image.height * max_width / image.width))
+            image = image.resize((max_width, height), Image.LANCZOS)
+        image.convert("RGB").save(dest_path, "JPEG", quality=PHOTO_JPEG_QUALITY, optimize=True)
+
+
+def get_resize_pool() -> ProcessPoolExecutor:
+    """Get singleton resize process pool."""
+    global _resize_pool
+    if _resize_pool is None:
+        _resize_pool = ProcessPoolExecutor(max_workers=PHOTO_RESIZE_WORKERS)
+    return _resize_pool
+
+
+def shutdown_resize_pool() -> None:
+    """Stop resize workers on shutdown."""
+    global _resize_pool
+    if _resize_pool is not None:
+        _resize_pool.shutdown(wait=False, cancel_futures=True)
+        _resize_pool = None
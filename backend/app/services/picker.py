@@ -0,0 +1,346 @@
+"""
+Picker sessions for the swipe flow
+Keeps a ranked candidate list per session in the picker_sessions table,
+shared by all API workers, and prefetches the next Google page in the
+background before the user runs out of cards
+"""
+
+import os
+import asyncio
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from app.db import get_db
+from app.errors import DatabaseError, NotFoundError, ValidationError
+from app.services.places import get_places_service
+from app.services.ranking import rank_places
+
+PICKER_SESSION_TTL_SECONDS = float(os.getenv("PICKER_SESSION_TTL_SECONDS", "1800"))
+# Start fetching the next page when this few unseen candidates are left
+PICKER_PREFETCH_REMAINING = int(os.getenv("PICKER_PREFETCH_REMAINING", "5"))
+# Hard cap on upstream pages per session (Google serves at most 3 pages)
+PICKER_MAX_PAGES = int(os.getenv("PICKER_MAX_PAGES", "4"))
+
+# Re-reads allowed when other writes to a session keep landing first
+PICKER_WRITE_ATTEMPTS = 5
+
+logger = logging.getLogger(__name__)
+
+# Singleton store
+_picker_sessions: Optional["PickerSessionStore"] = None
+
+
+class PickerSession:
+    """
+    One user's swipe session over a search (a picker_sessions row).
+
+    Candidates before `served` have been sent to the client and keep
+    their order; everything after is re-ranked whenever a new page
+    arrives, so better places from later pages move up the queue.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        query: str,
+        lat: float,
+        lng: float,
+        radius: int,
+        price_level: Optional[int],
+        session_id: Optional[str] = None
+    ):
+        self.id = session_id or secrets.token_urlsafe(16)
+        self.user_id = user_id
+        self.query = query
+        self.lat = lat
+        self.lng = lng
+        self.radius = radius
+        self.price_level = price_level
+        self.candidates: list[dict] = []
+        self.served = 0
+        self.next_page_token: Optional[str] = None
+        self.pages = 0
+        self.version = 0
+
+    @classmethod
+    def from_row(cls, row: dict) -> "PickerSession":
+        session = cls(
+            row["user_id"], row["query"], row["lat"], row["lng"], row["radius"],
+            row["price_level"], session_id=row["id"],
+        )
+        session.candidates = row["candidates"]
+        session.served = row["served"]
+        session.next_page_token = row["next_page_token"]
+        session.pages = row["pages"]
+        session.version = row["version"]
+        return session
+
+    def state(self) -> dict:
+        """Columns that change over the session's life."""
+        return {
+            "candidates": self.candidates,
+            "served": self.served,
+            "next_page_token": self.next_page_token,
+            "pages": self.pages,
+        }
+
+    def to_row(self) -> dict:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "query": self.query,
+            "lat": self.lat,
+            "lng": self.lng,
+            "radius": self.radius,
+            "price_level": self.price_level,
+            "version": self.version,
+            **self.state(),
+        }
+
+    @property
+    def exhausted(self) -> bool:
+        """True once no more pages can be fetched."""
+        return self.next_page_token is None or self.pages >= PICKER_MAX_PAGES
+
+    def add_page(self, results: list[dict], next_page_token: Optional[str]) -> None:
+        """Merge a page of results into the unserved tail and re-rank it."""
+        self.pages += 1
+        self.next_page_token = next_page_token
+
+        seen = {place["place_id"] for place in self.candidates}
+        new = []
+        for place in results:
+            google_place_id = place.get("place_id")
+            if google_place_id and google_place_id not in seen:
+                seen.add(google_place_id)
+                new.append(place)
+
+        tail = self.candidates[self.served:] + new
+        self.candidates = self.candidates[:self.served] + rank_places(
+            tail, self.lat, self.lng, self.radius, price_level=self.price_level
+        )
+
+    def mark_served(self, end: int) -> None:
+        """Freeze the order of candidates before end (they are being sent)."""
+        self.served = max(self.served, min(end, len(self.candidates)))
+
+    def needs_next_page(self, lookahead: int = 0) -> bool:
+        """
+        True if the user is close to the end: once the next `lookahead`
+        candidates would leave at most PICKER_PREFETCH_REMAINING unseen.
+        """
+        if self.exhausted:
+            return False
+        return len(self.candidates) - self.served - lookahead <= PICKER_PREFETCH_REMAINING
+
+    def has_more_after(self, offset: int) -> bool:
+        """True if candidates beyond offset exist or can still be fetched."""
+        return offset < len(self.candidates) or not self.exhausted
+
+
+class PickerSessionStore:
+    """
+    Sessions in the picker_sessions table with a sliding TTL.
+
+    Every worker reads the same row, so a client can page through a
+    session on any worker. Writes only apply to the version that was
+    read; if another request wrote first, the session is re-read and the
+    change applied again. Prefetches run in the worker that started them.
+    A request on another worker that needs the next page fetches it
+    itself, and the write that lands second drops its copy of the page.
+    """
+
+    def __init__(self):
+        self._prefetches: dict[str, asyncio.Task] = {}
+        self.created = 0
+        self.prefetches = 0
+        self.write_conflicts = 0
+
+    def _expires_at(self) -> str:
+        return (datetime.now(timezone.utc) + timedelta(seconds=PICKER_SESSION_TTL_SECONDS)).isoformat()
+
+    async def create(
+        self,
+        user_id: str,
+        query: str,
+        lat: float,
+        lng: float,
+        radius: int,
+        price_level: Optional[int] = None
+    ) -> PickerSession:
+        """Start a session with the first page of search results."""
+        session = PickerSession(user_id, query, lat, lng, radius, price_level)
+        results, next_page_token = await get_places_service().search_places_page(
+            query, lat, lng, radius
+        )
+        session.add_page(results, next_page_token)
+
+        await self._purge_expired()
+        await get_db().table("picker_sessions").insert({
+            **session.to_row(),
+            "expires_at": self._expires_at(),
+        }).execute()
+        self.created += 1
+        return session
+
+    async def _purge_expired(self) -> None:
+        try:
+            await get_db().table("picker_sessions").delete().lt(
+                "expires_at", datetime.now(timezone.utc).isoformat()
+            ).execute()
+        except Exception as e:
+            logger.warning(f"Failed to purge expired picker sessions: {e}")
+
+    async def get(self, session_id: str, user_id: str) -> PickerSession:
+        """
+        Look up a live session owned by user_id.
+
+        Raises:
+            NotFoundError: If the session expired or belongs to someone else
+        """
+        result = await get_db().table("picker_sessions").select("*").eq(
+            "id", session_id
+        ).eq(
+            "user_id", user_id
+        ).gt(
+            "expires_at", datetime.now(timezone.utc).isoformat()
+        ).execute()
+        if not result.data:
+            raise NotFoundError(message="Picker session not found", detail={"session_id": session_id})
+        return PickerSession.from_row(result.data[0])
+
+    async def _update(
+        self,
+        session: PickerSession,
+        change: Callable[[PickerSession], None]
+    ) -> PickerSession:
+        """
+        Apply change to the session and write it, extending its expiry.
+
+        The write only matches the version that was read. If another
+        request wrote first, the session is re-read and change applied
+        to the fresh copy, so change must not assume what it saw before.
+
+        Returns:
+            The session as written
+
+        Raises:
+            NotFoundError: If the session expired or was deleted meanwhile
+            DatabaseError: If other writes kept landing first
+        """
+        db = get_db()
+        for _ in range(PICKER_WRITE_ATTEMPTS):
+            change(session)
+            result = await db.table("picker_sessions").update({
+                **session.state(),
+                "version": session.version + 1,
+                "expires_at": self._expires_at(),
+            }).eq("id", session.id).eq("version", session.version).execute()
+            if result.data:
+                return PickerSession.from_row(result.data[0])
+            self.write_conflicts += 1
+            session = await self.get(session.id, session.user_id)
+
+        raise DatabaseError(
+            message="Picker session is busy, try again",
+            detail={"session_id": session.id}
+        )
+
+    async def _fetch_next(self, session: PickerSession) -> PickerSession:
+        """Fetch the page after the session's last one and merge it in."""
+        pages = session.pages
+        try:
+            page = await get_places_service().fetch_next_page(
+                session.query, session.lat, session.lng, session.radius, session.next_page_token
+            )
+        except Exception as e:
+            # Give up on further pages; the client sees has_more=false
+            logger.warning(f"Picker page fetch failed for session {session.id}: {e}")
+            page = None
+
+        def change(current: PickerSession) -> None:
+            if current.pages != pages:
+                return  # Another request already added this page
+            if page is None:
+                current.next_page_token = None
+            else:
+                current.add_page(*page)
+
+        return await self._update(session, change)
+
+    async def _prefetch(self, session: PickerSession) -> Optional[PickerSession]:
+        try:
+            return await self._fetch_next(session)
+        except Exception as e:
+            logger.warning(f"Picker prefetch failed for session {session.id}: {e}")
+            return None
+        finally:
+            self._prefetches.pop(session.id, None)
+
+    def _maybe_prefetch(self, session: PickerSession, lookahead: int) -> None:
+        """Start fetching the next page in the background if it is due."""
+        if session.id in self._prefetches or not session.needs_next_page(lookahead):
+            return
+        self._prefetches[session.id] = asyncio.get_running_loop().create_task(self._prefetch(session))
+        self.prefetches += 1
+
+    async def page(self, session: PickerSession, offset: int, limit: int) -> tuple[list[dict], bool]:
+        """
+        Serve candidates [offset, offset + limit).
+
+        Waits for the next page if the request reaches past what is
+        loaded and the next page is due (joining this worker's prefetch
+        in progress). Afterwards starts a prefetch if another page of
+        the same size would bring the user close to the end.
+
+        Returns:
+            (candidates, whether more follow them)
+        """
+        if offset > len(session.candidates):
+            raise ValidationError(message="Invalid cursor", detail={"cursor": str(offset)})
+
+        if offset + limit > len(session.candidates):
+            prefetch = self._prefetches.get(session.id)
+            if prefetch is not None:
+                session = await asyncio.shield(prefetch) or await self.get(session.id, session.user_id)
+            elif session.needs_next_page():
+                session = await self._fetch_next(session)
+
+        session = await self._update(session, lambda current: current.mark_served(offset + limit))
+        items = session.candidates[offset:offset + limit]
+        self._maybe_prefetch(session, lookahead=limit)
+        return items, session.has_more_after(offset + len(items))
+
+    async def delete(self, session_id: str, user_id: str) -> None:
+        """
+        End a session and stop its prefetch in this worker.
+
+        Raises:
+            NotFoundError: If the session does not exist or belongs to someone else
+        """
+        result = await get_db().table("picker_sessions").delete().eq(
+            "id", session_id
+        ).eq("user_id", user_id).execute()
+        if not result.data:
+            raise NotFoundError(message="Picker session not found", detail={"session_id": session_id})
+        prefetch = self._prefetches.pop(session_id, None)
+        if prefetch is not None:
+            prefetch.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "created": self.created,
+            "prefetches": self.prefetches,
+            "prefetches_in_flight": len(self._prefetches),
+            "write_conflicts": self.write_conflicts,
+        }
+
+
+def get_picker_sessions() -> PickerSessionStore:
+    """Get singleton picker session store."""
+    global _picker_sessions
+    if _picker_sessions is None:
+        _picker_sessions = PickerSessionStore()
+    return _picker_sessions
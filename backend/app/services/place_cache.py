@@ -0,0 +1,93 @@
+"""
+In-process cache tier in front of the places table
+Rows are keyed by google_place_id, with an index from internal UUID,
+so hot places are served without a Supabase round trip
+"""
+
+import os
+from typing import Optional
+
+from app.cache import TTLCache
+
+PLACE_CACHE_MAX_ENTRIES = int(os.getenv("PLACE_CACHE_MAX_ENTRIES", "10000"))
+PLACE_CACHE_TTL_SECONDS = float(os.getenv("PLACE_CACHE_TTL_SECONDS", "300"))
+
+# UUID <-> google_place_id never changes once assigned, so the id index
+# outlives row entries (which are invalidated on every upsert)
+ID_INDEX_MAX_ENTRIES = 50000
+ID_INDEX_TTL_SECONDS = 24 * 3600
+
+# Singleton cache
+_place_cache: Optional["PlaceCache"] = None
+
+
+class PlaceCache:
+    """
+    Size-bounded LRU/TTL cache of places rows.
+
+    Expired rows are kept until evicted so they can still be served
+    (via get_stale) while Supabase is unavailable.
+    """
+
+    def __init__(self):
+        self._rows = TTLCache(PLACE_CACHE_MAX_ENTRIES, PLACE_CACHE_TTL_SECONDS)
+        self._ids = TTLCache(ID_INDEX_MAX_ENTRIES, ID_INDEX_TTL_SECONDS)
+        self._google_ids = TTLCache(ID_INDEX_MAX_ENTRIES, ID_INDEX_TTL_SECONDS)
+        self.stale_served = 0
+
+    def get(self, google_place_id: str) -> Optional[dict]:
+        """Fresh row by Google Place ID."""
+        return self._rows.get(google_place_id)
+
+    def get_by_id(self, place_id: str) -> Optional[dict]:
+        """Fresh row by internal UUID."""
+        google_place_id = self._google_ids.get_stale(place_id)
+        if google_place_id is None:
+            self._rows.misses += 1
+            return None
+        return self._rows.get(google_place_id)
+
+    def get_stale(self, google_place_id: Optional[str] = None, place_id: Optional[str] = None) -> Optional[dict]:
+        """Row regardless of TTL, for degraded reads when Supabase is down."""
+        if google_place_id is None and place_id is not None:
+            google_place_id = self._google_ids.get_stale(place_id)
+        if google_place_id is None:
+            return None
+        row = self._rows.get_stale(google_place_id)
+        if row is not None:
+            self.stale_served += 1
+        return row
+
+    def id_for(self, google_place_id: str) -> Optional[str]:
+        """Internal UUID for a Google Place ID, if known."""
+        return self._ids.get_stale(google_place_id)
+
+    def google_id_for(self, place_id: str) -> Optional[str]:
+        """Google Place ID for an internal UUID, if known."""
+        return self._google_ids.get_stale(place_id)
+
+    def put(self, row: dict) -> None:
+        """Store a places row (must include id and google_place_id)."""
+        google_place_id = row["google_place_id"]
+        self._rows.set(google_place_id, row)
+        self._ids.set(google_place_id, row["id"])
+        self._google_ids.set(row["id"], google_place_id)
+
+    def invalidate(self, google_place_id: str) -> None:
+        """Drop a cached row (its id mapping stays valid)."""
+        self._rows.pop(google_place_id)
+
+    def stats(self) -> dict:
+        return {
+            **self._rows.stats(),
+            "stale_served": self.stale_served,
+            "id_index_entries": len(self._ids),
+        }
+
+
+def get_place_cache() -> PlaceCache:
+    """Get singleton place cache."""
+    global _place_cache
+    if _place_cache is None:
+        _place_cache = PlaceCache()
+    return _place_cache
@@ -0,0 +1,316 @@
+"""
+Write-behind pipeline for caching places
+Batches place upserts off the request path into one multi-row upsert,
+with a small durable local outbox for retries while Supabase is down
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+from typing import Optional
+
+from app.db import get_db
+from app.services.place_cache import get_place_cache
+
+PLACE_WRITE_BATCH_SIZE = int(os.getenv("PLACE_WRITE_BATCH_SIZE", "100"))
+PLACE_WRITE_FLUSH_SECONDS = float(os.getenv("PLACE_WRITE_FLUSH_SECONDS", "0.5"))
+PLACE_OUTBOX_PATH = os.getenv("PLACE_OUTBOX_PATH", ".cache/place_outbox.sqlite3")
+PLACE_OUTBOX_MAX_ROWS = int(os.getenv("PLACE_OUTBOX_MAX_ROWS", "10000"))
+
+# Seconds between outbox retry attempts
+OUTBOX_RETRY_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+# Singleton instance
+_place_writer: Optional["PlaceWriteBehind"] = None
+
+
+class PlaceOutbox:
+    """
+    SQLite-backed outbox of place rows that failed to upsert.
+
+    One row per google_place_id (latest wins), bounded to max_rows by
+    dropping the oldest. Methods are blocking; call via asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, max_rows: int):
+        self.path = path
+        self.max_rows = max_rows
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "google_place_id TEXT PRIMARY KEY, row TEXT NOT NULL, queued_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def put(self, rows: list[dict]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO outbox (google_place_id, row, queued_at) VALUES (?, ?, ?)",
+                [(row["google_place_id"], json.dumps(row), now) for row in rows],
+            )
+            conn.execute(
+                "DELETE FROM outbox WHERE google_place_id IN ("
+                "SELECT google_place_id FROM outbox ORDER BY queued_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
+
+    def peek(self, limit: int) -> list[tuple[dict, float]]:
+        """Oldest rows with the queued_at to pass back to remove()."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "SELECT row, queued_at FROM outbox ORDER BY queued_at LIMIT ?", (limit,)
+            )
+            return [(json.loads(row), queued_at) for row, queued_at in cursor.fetchall()]
+
+    def remove(self, entries: list[tuple[str, float]]) -> None:
+        """
+        Delete (google_place_id, queued_at) entries returned by peek().
+
+        A row put again since the peek has a new queued_at and is kept.
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM outbox WHERE google_place_id = ? AND queued_at = ?",
+                entries,
+            )
+
+    def size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+
+class PlaceWriteBehind:
+    """
+    Queue of place rows flushed to the places table in batches.
+
+    Rows are flushed when the batch reaches PLACE_WRITE_BATCH_SIZE or
+    after PLACE_WRITE_FLUSH_SECONDS, whichever comes first. Each flush
+    is a multi-row upsert on google_place_id (one per column set, so
+    search rows and details rows go separately); the returned rows
+    (with internal UUIDs) refresh the in-process place cache.
+    """
+
+    def __init__(self):
+        self.batch_size = PLACE_WRITE_BATCH_SIZE
+        self.flush_seconds = PLACE_WRITE_FLUSH_SECONDS
+        self.outbox = PlaceOutbox(PLACE_OUTBOX_PATH, PLACE_OUTBOX_MAX_ROWS)
+        self._pending: dict[str, dict] = {}
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._next_outbox_retry = 0.0
+        self.outbox_size = 0
+        self.enqueued = 0
+        self.batches = 0
+        self.rows_written = 0
+        self.failures = 0
+        self.last_batch_ms: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the background flush loop (requires a running event loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out anything still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def enqueue(self, row: dict) -> None:
+        """
+        Queue a place row for the next batch.
+
+        Rows for a place already queued are merged, latest values win, so
+        a search row queued after a details row keeps the details columns.
+        """
+        self.start()
+        google_place_id = row["google_place_id"]
+        self._pending[google_place_id] = {**self._pending.get(google_place_id, {}), **row}
+        self.enqueued += 1
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def ensure_written(self, google_place_id: str) -> None:
+        """
+        Make sure a queued row for this place has reached the database.
+
+        Used before reads that join against places (saves, journal).
+        """
+        if google_place_id in self._pending or self._lock.locked():
+            await self.flush()
+
+    async def write(self, google_place_ids: list[str]) -> dict[str, str]:
+        """
+        Flush queued rows for these places and return their internal UUIDs.
+
+        Used when a response needs ids for places it just queued (first
+        time search and details results). Places whose write failed (rows
+        moved to the outbox) are missing from the result.
+        """
+        if self._lock.locked() or any(gid in self._pending for gid in google_place_ids):
+            await self.flush()
+        place_cache = get_place_cache()
+        ids = {}
+        for google_place_id in google_place_ids:
+            place_id = place_cache.id_for(google_place_id)
+            if place_id:
+                ids[google_place_id] = place_id
+        return ids
+
+    async def flush(self) -> dict[str, str]:
+        """
+        Upsert all pending rows in one statement.
+
+        Returns:
+            Mapping of google_place_id to internal UUID for written rows
+        """
+        async with self._lock:
+            if not self._pending:
+                return {}
+            rows = list(self._pending.values())
+            self._pending.clear()
+
+            try:
+                return await self._upsert(rows)
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Place batch upsert failed, moving {len(rows)} rows to outbox: {e}")
+                await asyncio.to_thread(self.outbox.put, rows)
+                self.outbox_size = await asyncio.to_thread(self.outbox.size)
+                return {}
+
+    async def _upsert(self, rows: list[dict]) -> dict[str, str]:
+        start = time.perf_counter()
+        db = get_db()
+
+        # One upsert per column set: a bulk upsert writes NULL for keys a
+        # row lacks, which would wipe the details of places seen in search
+        batches: dict[frozenset, list[dict]] = {}
+        for row in rows:
+            batches.setdefault(frozenset(row), []).append(row)
+
+        place_cache = get_place_cache()
+        ids = {}
+        for batch in batches.values():
+            result = await db.table("places").upsert(
+                batch,
+                on_conflict="google_place_id"
+            ).execute()
+
+            for row in result.data or []:
+                place_cache.put(row)
+                ids[row["google_place_id"]] = row["id"]
+
+        self.batches += 1
+        self.rows_written += len(rows)
+        self.last_batch_ms = round((time.perf_counter() - start) * 1000, 2)
+        return ids
+
+    async def _replay(self, rows: list[dict]) -> None:
+        """
+        Write outboxed rows with replay_place_rows.
+
+        The places may have been written again since these rows were
+        queued; the RPC skips rows older than the stored last_fetched_at,
+        so a retry never rolls a place back.
+        """
+        start = time.perf_counter()
+        result = await get_db().rpc("replay_place_rows", {"p_rows": rows}).execute()
+
+        place_cache = get_place_cache()
+        for row in result.data or []:
+            place_cache.put(row)
+
+        self.batches += 1
+        self.rows_written += len(result.data or [])
+        self.last_batch_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    async def _drain_outbox(self) -> None:
+        """Retry rows from the outbox, one batch per attempt."""
+        if time.monotonic() < self._next_outbox_retry:
+            return
+        self._next_outbox_retry = time.monotonic() + OUTBOX_RETRY_SECONDS
+
+        entries = await asyncio.to_thread(self.outbox.peek, self.batch_size)
+        if not entries:
+            self.outbox_size = 0
+            return
+
+        rows = [row for row, _ in entries]
+        async with self._lock:
+            try:
+                await self._replay(rows)
+            except Exception as e:
+                logger.warning(f"Outbox retry failed ({len(rows)} rows): {e}")
+                return
+
+        await asyncio.to_thread(
+            self.outbox.remove,
+            [(row["google_place_id"], queued_at) for row, queued_at in entries],
+        )
+        self.outbox_size = await asyncio.to_thread(self.outbox.size)
+        # More rows waiting - retry again on the next tick
+        if self.outbox_size:
+            self._next_outbox_retry = 0.0
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+                await self._drain_outbox()
+            except Exception as e:
+                # Never let the loop die - rows stay queued or in the outbox
+                logger.error(f"Place write-behind loop error: {e}", exc_info=True)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "enqueued": self.enqueued,
+            "batches": self.batches,
+            "rows_written": self.rows_written,
+            "failures": self.failures,
+            "outbox_size": self.outbox_size,
+            "last_batch_ms": self.last_batch_ms,
+        }
+
+
+def get_place_writer() -> PlaceWriteBehind:
+    """
+    Get singleton instance of PlaceWriteBehind.
+    Creates instance on first call.
+    """
+    global _place_writer
+    if _place_writer is None:
+        _place_writer = PlaceWriteBehind()
+    return _place_writer
+
+
+async def close_place_writer() -> None:
+    """Flush pending rows and stop the writer on shutdown."""
+    global _place_writer
+    if _place_writer is not None:
+        await _place_writer.stop()
+        _place_writer = None
@@ -1,32 +1,160 @@
 """
 Google Places API service module
-Wraps googlemaps library for place search, details, and photos
+Async client for place search, details, and photos on a pooled
+keep-alive HTTP connection
 Implements caching to reduce API costs
 """
 
 import os
+import re
+import uuid
+import asyncio
+import logging
+from collections import Counter
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-import googlemaps
-from googlemaps.exceptions import ApiError, HTTPError, Timeout, TransportError
+from typing import Optional, Union
+import httpx
 from dotenv import load_dotenv
 
-from app.db import get_supabase
+from app.db import get_db
 from app.errors import DatabaseError, ValidationError
+from app.singleflight import SingleFlight
+from app.services.photo_cache import (
+    DOWNLOAD_ABORTED,
+    PHOTO_STREAM_TIMEOUT_SECONDS,
+    PhotoStream,
+    get_photo_cache,
+)
+from app.services.photo_resize import get_resize_pool, resize_photo, shutdown_resize_pool
+from app.services.place_cache import get_place_cache
+from app.services.place_writer import get_place_writer
+from app.services.search_cache import get_search_cache, normalize_query, search_cache_key
+from app.services.upstream import UpstreamGuard
 
 # Cache staleness threshold
 CACHE_DAYS = 7
 
 load_dotenv()
 
+# Google Places web service endpoints
+PLACES_API_URL = "https://maps.googleapis.com/maps/api/place"
+
+# Fields requested from Place Details
+DETAIL_FIELDS = [
+    "place_id",
+    "name",
+    "formatted_address",
+    "geometry",
+    "photos",
+    "types",
+    "rating",
+    "user_ratings_total",
+    "price_level",
+    "opening_hours",
+    "utc_offset_minutes",
+    "website",
+    "formatted_phone_number"
+]
+
+# Connection pool tuning for the Google client
+GOOGLE_MAX_CONNECTIONS = int(os.getenv("GOOGLE_MAX_CONNECTIONS", "200"))
+GOOGLE_MAX_KEEPALIVE = int(os.getenv("GOOGLE_MAX_KEEPALIVE", "50"))
+GOOGLE_TIMEOUT_SECONDS = float(os.getenv("GOOGLE_TIMEOUT_SECONDS", "10"))
+
+# Stale-while-revalidate: rows past the soft TTL are served and refreshed
+# in the background; rows past the hard TTL are fetched synchronously
+PLACES_SWR_ENABLED = os.getenv("PLACES_SWR_ENABLED", "true").lower() == "true"
+PLACE_SOFT_TTL_DAYS = float(os.getenv("PLACE_SOFT_TTL_DAYS", str(CACHE_DAYS)))
+PLACE_HARD_TTL_DAYS = float(os.getenv("PLACE_HARD_TTL_DAYS", "30"))
+PLACE_REFRESH_CONCURRENCY = int(os.getenv("PLACE_REFRESH_CONCURRENCY", "4"))
+PLACE_REFRESH_MAX_PENDING = int(os.getenv("PLACE_REFRESH_MAX_PENDING", "500"))
+
+# Per-field freshness: opening hours (in the details payload) go stale much
+# sooner than name, address and location (PLACE_SOFT_TTL_DAYS)
+PLACE_HOURS_TTL_HOURS = float(os.getenv("PLACE_HOURS_TTL_HOURS", "24"))
+
+# Place Details fields kept in the places.details JSONB column
+DETAILS_PAYLOAD_FIELDS = ("opening_hours", "utc_offset_minutes", "website", "formatted_phone_number", "photos")
+
+# Cache-first search: answer from cached places near the search point
+# (nearby_places RPC) when at least PLACES_NEARBY_MIN_RESULTS match
+PLACES_NEARBY_CACHE_ENABLED = os.getenv("PLACES_NEARBY_CACHE_ENABLED", "true").lower() == "true"
+PLACES_NEARBY_MIN_RESULTS = int(os.getenv("PLACES_NEARBY_MIN_RESULTS", "10"))
+PLACES_NEARBY_MAX_RESULTS = int(os.getenv("PLACES_NEARBY_MAX_RESULTS", "20"))
+
+# Characters allowed in a Google Place ID (guards PostgREST filter syntax)
+GOOGLE_PLACE_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+# Distinct places whose views are held in memory between flushes; views
+# of further places are dropped until the next flush (see refresh.py)
+PLACE_VIEW_COUNTS_MAX = int(os.getenv("PLACE_VIEW_COUNTS_MAX", "10000"))
+
+# Concurrent Google fetches for cache misses in one batch details request
+PLACES_BATCH_CONCURRENCY = int(os.getenv("PLACES_BATCH_CONCURRENCY", "8"))
+
+# Search pagination: a new next_page_token only works after a short delay
+PAGE_TOKEN_DELAY_SECONDS = 2.0
+PAGE_TOKEN_MAX_ATTEMPTS = 3
+
+# Page token meaning "these results came from the nearby cache; ask Google next"
+NEARBY_MORE_TOKEN = "nearby"
+
+# Photos are fetched from Google at this width; smaller widths are derived locally
+PHOTO_SOURCE_WIDTH = int(os.getenv("PHOTO_SOURCE_WIDTH", "1600"))
+
+logger = logging.getLogger(__name__)
+
 # Singleton instance
 _places_service: Optional["GooglePlacesService"] = None
 
 
+def _is_open_now(periods: Optional[list], utc_offset_minutes: Optional[int]) -> Optional[bool]:
+    """
+    Work out open_now from cached opening_hours periods.
+
+    Google's open_now is only true at fetch time, so cache hits derive it
+    from the weekly periods and the place's UTC offset instead.
+
+    Returns:
+        True/False, or None if the hours or offset are unknown
+    """
+    if not periods or utc_offset_minutes is None:
+        return None
+
+    # A single period with no close time means open 24/7
+    if len(periods) == 1 and "close" not in periods[0]:
+        return True
+
+    week = 7 * 24 * 60
+    local = datetime.now(timezone.utc) + timedelta(minutes=utc_offset_minutes)
+    # Google numbers days from Sunday = 0; Python from Monday = 0
+    now = ((local.weekday() + 1) % 7) * 1440 + local.hour * 60 + local.minute
+
+    def minute_of_week(point: dict) -> int:
+        time_str = point.get("time", "0000")
+        return point.get("day", 0) * 1440 + int(time_str[:2]) * 60 + int(time_str[2:])
+
+    for period in periods:
+        if "open" not in period or "close" not in period:
+            continue
+        opens = minute_of_week(period["open"])
+        closes = minute_of_week(period["close"])
+        if closes <= opens:
+            # Wraps past Saturday midnight
+            closes += week
+        if opens <= now < closes or opens <= now + week < closes:
+            return True
+    return False
+
+
 class GooglePlacesService:
     """
-    Service for interacting with Google Places API.
+    Async service for interacting with Google Places API.
     Provides search, details, and photo retrieval functionality.
+
+    All Google calls share one pooled httpx.AsyncClient, so many
+    in-flight requests can run on a single worker without blocking
+    the event loop.
     """
 
     def __init__(self):
@@ -36,14 +164,124 @@ class GooglePlacesService:
                 message="Google Places API key not configured",
                 detail={"env_var": "GOOGLE_PLACES_API_KEY"}
             )
-        self.client = googlemaps.Client(key=api_key)
+        self.api_key = api_key
+        self.client = httpx.AsyncClient(
+            base_url=PLACES_API_URL,
+            timeout=GOOGLE_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=GOOGLE_MAX_CONNECTIONS,
+                max_keepalive_connections=GOOGLE_MAX_KEEPALIVE,
+            ),
+            follow_redirects=True,
+        )
+        # Coalesces identical in-flight Google calls
+        self.flights = SingleFlight()
+        # Adaptive rate limit and circuit breaker shared by all Google calls
+        self.guard = UpstreamGuard()
+        self.served_stale_on_error = 0
+        # Searches answered from cached nearby places vs. sent to Google
+        self.nearby_hits = 0
+        self.nearby_misses = 0
+        # In-flight photo downloads: (photo_reference, max_width) -> done future
+        self._photo_downloads: dict[tuple, asyncio.Future] = {}
+        self.photo_downloads = 0
+        self.photo_downloads_shared = 0
+        self.photo_resizes = 0
+        # Background stale-while-revalidate refreshes: google_place_id -> task
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._refresh_slots = asyncio.Semaphore(PLACE_REFRESH_CONCURRENCY)
+        self.refreshes_completed = 0
+        self.refreshes_failed = 0
+        self.refreshes_dropped = 0
+        # Detail views per google_place_id, flushed by the view flusher
+        self.view_counts: Counter[str] = Counter()
+        self.views_dropped = 0
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self.client.aclose()
+
+    async def _get_json(self, path: str, params: dict) -> dict:
+        """
+        Call a Places JSON endpoint.
 
-    def _is_cache_stale(self, last_fetched_at: Optional[str]) -> bool:
+        Passes through the upstream guard: fails fast while the circuit
+        is open, and feeds throttling and failures back to the limiter.
+
+        Raises:
+            DatabaseError: On network errors, non-2xx or malformed responses,
+                or while the upstream is rate limited or unhealthy
+        """
+        await self.guard.before_call()
+        try:
+            response = await self.client.get(
+                path, params={**params, "key": self.api_key}
+            )
+            response.raise_for_status()
+            data = response.json()
+            if not isinstance(data, dict):
+                raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            # Timeouts and connection errors (TransportError) and HTTP 429
+            # mean we are pushing too hard; other statuses only trip the breaker
+            if isinstance(e, httpx.TransportError) or e.response.status_code == 429:
+                self.guard.on_throttle()
+            else:
+                self.guard.on_failure()
+            logger.error(f"Network error contacting Google Places API: {e}")
+            raise DatabaseError(
+                message="Network error contacting Google Places API",
+                detail={"error": str(e)}
+            )
+        except ValueError as e:
+            # Undecodable body (JSONDecodeError is a ValueError)
+            self.guard.on_failure()
+            logger.error(f"Malformed response from Google Places API: {e}")
+            raise DatabaseError(
+                message="Malformed response from Google Places API",
+                detail={"error": str(e)}
+            )
+        except BaseException:
+            # Cancelled or failed on our side - free the probe slot
+            self.guard.on_abandon()
+            raise
+
+        if data.get("status") == "OVER_QUERY_LIMIT":
+            self.guard.on_throttle()
+        else:
+            self.guard.on_success()
+        return data
+
+    def _check_status(self, status: str) -> None:
+        """
+        Map a Places API status to our error types.
+
+        OK, ZERO_RESULTS and NOT_FOUND are left to the caller.
+        """
+        if status in ("OK", "ZERO_RESULTS", "NOT_FOUND"):
+            return
+        if status == "OVER_QUERY_LIMIT":
+            raise DatabaseError(
+                message="Rate limited by Google Places API",
+                detail={"status": status}
+            )
+        if status == "REQUEST_DENIED":
+            raise ValidationError(
+                message="Invalid API key or API not enabled",
+                detail={"status": status}
+            )
+        raise DatabaseError(
+            message=f"Google Places API error: {status}",
+            detail={"status": status}
+        )
+
+    def _is_cache_stale(self, last_fetched_at: Optional[str], max_age_days: float = PLACE_SOFT_TTL_DAYS) -> bool:
         """
         Check if cached data is stale.
 
         Args:
             last_fetched_at: ISO timestamp string from database
+            max_age_days: Age after which the row counts as stale
 
         Returns:
             True if cache is stale or doesn't exist
@@ -56,64 +294,180 @@ class GooglePlacesService:
             fetched_time = datetime.fromisoformat(
                 last_fetched_at.replace("Z", "+00:00")
             )
-            stale_threshold = datetime.now(timezone.utc) - timedelta(days=CACHE_DAYS)
+            stale_threshold = datetime.now(timezone.utc) - timedelta(days=max_age_days)
             return fetched_time < stale_threshold
         except (ValueError, AttributeError):
             return True
 
-    def _cache_place(self, place_data: dict) -> Optional[str]:
+    async def _cache_places(self, places: list[dict], details: bool = False) -> None:
+        """
+        Cache Google results and add their internal UUIDs as cached_id.
+
+        Rows go through the write-behind pipeline, so results from one
+        search share a single batched upsert; the batch is awaited
+        because responses (and the search cache) need the ids of places
+        seen for the first time. Places whose write failed are left
+        without cached_id.
+        """
+        google_place_ids = [
+            place["place_id"] for place in places
+            if self._cache_place(place, details=details)
+        ]
+        if not google_place_ids:
+            return
+
+        ids = await get_place_writer().write(google_place_ids)
+        for place in places:
+            cached_id = ids.get(place.get("place_id"))
+            if cached_id:
+                place["cached_id"] = cached_id
+
+    def _cache_place(self, place_data: dict, details: bool = False) -> bool:
         """
-        Cache place data to database using upsert.
+        Queue place data for a batched upsert to the database.
+
+        The write happens in the write-behind pipeline (see
+        app.services.place_writer). Search results update the structured
+        columns only; Place Details results also replace the details
+        payload and its timestamp.
 
         Args:
             place_data: Place data from Google Places API
+            details: True if place_data is a Place Details result
 
         Returns:
-            Internal UUID of cached place or None if caching failed
+            True if a row was queued (the result has a place_id)
         """
-        try:
-            supabase = get_supabase()
-
-            # Extract fields from API response
-            google_place_id = place_data.get("place_id")
-            if not google_place_id:
-                return None
-
-            # Get address from either field
-            address = place_data.get("vicinity") or place_data.get("formatted_address")
-
-            # Get first photo reference if available
-            photos = place_data.get("photos", [])
-            photo_reference = photos[0].get("photo_reference") if photos else None
-
-            # Prepare data for upsert
-            cache_data = {
-                "google_place_id": google_place_id,
-                "name": place_data.get("name"),
-                "address": address,
-                "photo_reference": photo_reference,
-                "types": place_data.get("types", []),
-                "last_fetched_at": datetime.now(timezone.utc).isoformat()
-            }
+        # Extract fields from API response
+        google_place_id = place_data.get("place_id")
+        if not google_place_id:
+            return False
+
+        # Get address from either field
+        address = place_data.get("vicinity") or place_data.get("formatted_address")
+
+        # Get first photo reference if available
+        photos = place_data.get("photos", [])
+        photo_reference = photos[0].get("photo_reference") if photos else None
+
+        location = place_data.get("geometry", {}).get("location", {})
+        now = datetime.now(timezone.utc).isoformat()
+
+        # Prepare data for upsert
+        cache_data = {
+            "google_place_id": google_place_id,
+            "name": place_data.get("name"),
+            "address": address,
+            "photo_reference": photo_reference,
+            "types": place_data.get("types", []),
+            "lat": location.get("lat"),
+            "lng": location.get("lng"),
+            "rating": place_data.get("rating"),
+            "price_level": place_data.get("price_level"),
+            "user_ratings_total": place_data.get("user_ratings_total"),
+            "last_fetched_at": now
+        }
+
+        if details:
+            payload = {field: place_data[field] for field in DETAILS_PAYLOAD_FIELDS if field in place_data}
+            if "opening_hours" in payload:
+                # open_now is only valid at fetch time - derived on read instead
+                payload["opening_hours"] = {
+                    k: v for k, v in payload["opening_hours"].items() if k != "open_now"
+                }
+            cache_data["details"] = payload
+            cache_data["details_fetched_at"] = now
+
+        # Row is about to change - drop the in-process copy
+        get_place_cache().invalidate(google_place_id)
+
+        get_place_writer().enqueue(cache_data)
+        return True
 
-            # Upsert with conflict on google_place_id
-            result = supabase.table("places").upsert(
-                cache_data,
-                on_conflict="google_place_id"
+    async def ensure_cached(self, google_place_id: str) -> None:
+        """Flush a queued place row so it can be read from the database."""
+        await get_place_writer().ensure_written(google_place_id)
+
+    async def get_place_row(self, place_id: str) -> Optional[dict]:
+        """
+        Get a places row by Google Place ID or internal UUID.
+
+        Served from the in-process place cache when possible. If
+        Supabase is unavailable, falls back to an expired in-process
+        row (degraded mode) before giving up.
+
+        Args:
+            place_id: Google Place ID ("ChIJ...") or internal UUID
+
+        Returns:
+            places row dict, or None if the place is not cached
+        """
+        place_cache = get_place_cache()
+        is_google_id = place_id.startswith("ChIJ")
+
+        row = place_cache.get(place_id) if is_google_id else place_cache.get_by_id(place_id)
+        if row is not None:
+            return row
+
+        try:
+            if is_google_id:
+                # Row may still be queued in the write-behind pipeline
+                await get_place_writer().ensure_written(place_id)
+            db = get_db()
+            result = await db.table("places").select("*").eq(
+                "google_place_id" if is_google_id else "id", place_id
             ).execute()
+        except Exception as e:
+            stale = (
+                place_cache.get_stale(google_place_id=place_id)
+                if is_google_id
+                else place_cache.get_stale(place_id=place_id)
+            )
+            if stale is None:
+                raise
+            logger.warning(f"Serving place {place_id} from in-process cache: {e}")
+            return stale
 
-            if result.data:
-                return result.data[0].get("id")
+        if not result.data:
             return None
 
-        except Exception:
-            # Caching failure shouldn't break the API response
-            return None
+        row = result.data[0]
+        place_cache.put(row)
+        return row
 
-    def _get_cached_place(self, google_place_id: str) -> Optional[dict]:
+    def _place_freshness(self, place: dict) -> str:
+        """
+        Apply the per-field freshness policy to a cached row.
+
+        - name, address, location: last_fetched_at within PLACE_SOFT_TTL_DAYS
+        - opening hours and the rest of the details payload:
+          details_fetched_at within PLACE_HOURS_TTL_HOURS
+
+        Returns:
+            "fresh", "stale" (servable while revalidating) or "expired"
+            (rows never fetched via Place Details, or past the hard TTL)
+        """
+        last_fetched_at = place.get("last_fetched_at")
+        details_fetched_at = place.get("details_fetched_at")
+        if not details_fetched_at:
+            return "expired"
+        if (self._is_cache_stale(last_fetched_at, PLACE_HARD_TTL_DAYS)
+                or self._is_cache_stale(details_fetched_at, PLACE_HARD_TTL_DAYS)):
+            return "expired"
+        if (self._is_cache_stale(last_fetched_at)
+                or self._is_cache_stale(details_fetched_at, PLACE_HOURS_TTL_HOURS / 24)):
+            return "stale"
+        return "fresh"
+
+    async def _get_cached_place(self, google_place_id: str) -> Optional[dict]:
         """
         Get place from cache if fresh.
 
+        With stale-while-revalidate enabled, a row that is stale under
+        the per-field policy (see _place_freshness) but within the hard
+        TTL is still returned (marked "_stale") and a background refresh
+        is scheduled.
+
         Args:
             google_place_id: Google Place ID
 
@@ -121,26 +475,52 @@ class GooglePlacesService:
             Cached place dict with internal id, or None if not cached/stale
         """
         try:
-            supabase = get_supabase()
-            result = supabase.table("places").select("*").eq(
-                "google_place_id", google_place_id
-            ).execute()
+            place = await self.get_place_row(google_place_id)
+        except Exception:
+            return None
+
+        if not place:
+            return None
 
-            if not result.data:
-                return None
+        # Check if cache is stale
+        freshness = self._place_freshness(place)
+        if freshness == "fresh":
+            return place
 
-            place = result.data[0]
+        if PLACES_SWR_ENABLED and freshness == "stale":
+            self._schedule_refresh(google_place_id)
+            return {**place, "_stale": True}
 
-            # Check if cache is stale
-            if self._is_cache_stale(place.get("last_fetched_at")):
-                return None
+        return None
 
-            return place
+    def _schedule_refresh(self, google_place_id: str) -> None:
+        """
+        Refresh a place from Google in the background.
 
-        except Exception:
-            return None
+        De-duplicated per place; at most PLACE_REFRESH_CONCURRENCY
+        refreshes run at once and at most PLACE_REFRESH_MAX_PENDING wait.
+        """
+        if google_place_id in self._refreshing:
+            return
+        if len(self._refreshing) >= PLACE_REFRESH_MAX_PENDING:
+            self.refreshes_dropped += 1
+            return
+        self._refreshing[google_place_id] = asyncio.get_running_loop().create_task(
+            self._refresh(google_place_id)
+        )
 
-    def search_places(
+    async def _refresh(self, google_place_id: str) -> None:
+        try:
+            async with self._refresh_slots:
+                await self.refresh_place(google_place_id)
+            self.refreshes_completed += 1
+        except Exception as e:
+            self.refreshes_failed += 1
+            logger.warning(f"Background refresh failed for {google_place_id}: {e}")
+        finally:
+            self._refreshing.pop(google_place_id, None)
+
+    async def search_places(
         self,
         query: str,
         lat: float,
@@ -149,6 +529,9 @@ class GooglePlacesService:
     ) -> list[dict]:
         """
         Search for places near a location.
+        Answers from the geo-tiled search cache when a matching search
+        (same normalized query, cell and radius bucket) is still fresh.
+        Concurrent identical searches share one Google call.
 
         Args:
             query: Search query (e.g., "pizza", "sushi restaurant")
@@ -159,66 +542,211 @@ class GooglePlacesService:
         Returns:
             List of place results from Google Places API
         """
-        try:
-            import logging
-            logging.info(f"Searching places: query={query}, lat={lat}, lng={lng}, radius={radius}")
-            response = self.client.places(
-                query=query,
-                location=(lat, lng),
-                radius=radius,
-                type="restaurant"
-            )
-            logging.info(f"Response status: {response.get('status')}")
+        results, _ = await self.search_places_page(query, lat, lng, radius)
+        return results
 
-            status = response.get("status", "UNKNOWN")
+    async def search_places_page(
+        self,
+        query: str,
+        lat: float,
+        lng: float,
+        radius: int = 1000
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Same as search_places, but also returns a token for more results.
 
-            if status == "ZERO_RESULTS":
-                return []
-            elif status == "OVER_QUERY_LIMIT":
-                raise DatabaseError(
-                    message="Rate limited by Google Places API",
-                    detail={"status": status}
-                )
-            elif status == "REQUEST_DENIED":
-                raise ValidationError(
-                    message="Invalid API key or API not enabled",
-                    detail={"status": status}
-                )
-            elif status not in ("OK", "ZERO_RESULTS"):
-                raise DatabaseError(
-                    message=f"Google Places API error: {status}",
-                    detail={"status": status}
+        Returns:
+            (results, next_page_token). The token is Google's
+            next_page_token, NEARBY_MORE_TOKEN if the results came from
+            cached nearby places (Google has not been asked yet), or None
+            if there are no more results. Pass it to fetch_next_page.
+        """
+        search_cache = get_search_cache()
+        cache_key = search_cache_key(query, lat, lng, radius)
+        cached = search_cache.get(cache_key)
+        if cached is None:
+            try:
+                cached = await self.flights.do(
+                    ("search",) + cache_key,
+                    lambda: self._fetch_search(query, lat, lng, radius, cache_key),
                 )
+            except DatabaseError as e:
+                # Upstream unhealthy - an expired result beats an error
+                cached = search_cache.get_stale(cache_key)
+                if cached is None:
+                    raise
+                self.served_stale_on_error += 1
+                logger.warning(f"Serving expired search results for {cache_key}: {e.message}")
 
-            results = response.get("results", [])
+        cached_results, next_page_token = cached
+        # Callers get their own copies of the shared result dicts
+        return [dict(place) for place in cached_results], next_page_token
 
-            # Cache each result and add internal UUID
-            for place in results:
-                cached_id = self._cache_place(place)
-                if cached_id:
-                    place["cached_id"] = cached_id
+    async def _fetch_search(
+        self,
+        query: str,
+        lat: float,
+        lng: float,
+        radius: int,
+        cache_key: tuple
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Answer a search from cached nearby places, or run a text search
+        against Google when local coverage is thin. Either way the
+        (results, next_page_token) pair is stored in the search cache,
+        unless some Google results could not be written (no ids yet).
+        """
+        if PLACES_NEARBY_CACHE_ENABLED:
+            local_results = await self._search_nearby_cache(query, lat, lng, radius)
+            if local_results is not None:
+                page = (local_results, NEARBY_MORE_TOKEN)
+                get_search_cache().set(cache_key, page)
+                return page
 
-            return results
+        page = await self._search_google(query, lat, lng, radius)
+        results, _ = page
+        if all("cached_id" in place for place in results):
+            get_search_cache().set(cache_key, page)
+        else:
+            # Some places failed to write (Supabase down) - don't pin
+            # id-less results for the cache TTL, let the next search retry
+            logger.warning(f"Not caching search {cache_key}: results without internal ids")
+        return page
 
-        except ApiError as e:
-            import logging
-            logging.error(f"Google Places API error in search: {e}")
-            raise DatabaseError(
-                message="Google Places API error",
-                detail={"error": str(e)}
-            )
-        except (HTTPError, Timeout, TransportError) as e:
-            import logging
-            logging.error(f"Network error in search: {e}")
-            raise DatabaseError(
-                message="Network error contacting Google Places API",
-                detail={"error": str(e)}
-            )
+    async def _search_google(
+        self,
+        query: str,
+        lat: float,
+        lng: float,
+        radius: int,
+        page_token: Optional[str] = None
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Run one Google text search request and cache the results.
 
-    def get_place_details(self, google_place_id: str) -> Optional[dict]:
+        Args:
+            page_token: next_page_token from a previous page; when given,
+                Google ignores the other search parameters
+
+        Returns:
+            (results, next_page_token or None)
+        """
+        if page_token:
+            params = {"pagetoken": page_token}
+        else:
+            params = {
+                "query": query,
+                "location": f"{lat},{lng}",
+                "radius": radius,
+                "type": "restaurant",
+            }
+
+        logger.info(f"Searching places: query={query}, lat={lat}, lng={lng}, radius={radius}, page={bool(page_token)}")
+        response = await self._get_json("/textsearch/json", params)
+        status = response.get("status", "UNKNOWN")
+
+        # A fresh next_page_token is rejected until Google has prepared the
+        # page (a couple of seconds) - wait and retry
+        attempts = 1
+        while page_token and status == "INVALID_REQUEST" and attempts < PAGE_TOKEN_MAX_ATTEMPTS:
+            await asyncio.sleep(PAGE_TOKEN_DELAY_SECONDS)
+            response = await self._get_json("/textsearch/json", params)
+            status = response.get("status", "UNKNOWN")
+            attempts += 1
+
+        logger.info(f"Response status: {status}")
+        if page_token and status == "INVALID_REQUEST":
+            # Token expired - treat as the end of the results
+            return [], None
+        self._check_status(status)
+
+        results = response.get("results", []) if status != "ZERO_RESULTS" else []
+
+        # Cache the results and add their internal UUIDs
+        await self._cache_places(results)
+
+        return results, response.get("next_page_token")
+
+    async def fetch_next_page(
+        self,
+        query: str,
+        lat: float,
+        lng: float,
+        radius: int,
+        page_token: str
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Fetch the page after a search_places_page result.
+
+        For NEARBY_MORE_TOKEN this runs the Google search that the nearby
+        cache answered for; callers should skip places they already have.
+        Concurrent requests for the same page share one Google call.
+
+        Returns:
+            (results, next_page_token or None)
+        """
+        if page_token == NEARBY_MORE_TOKEN:
+            key = ("search-google",) + search_cache_key(query, lat, lng, radius)
+            fetch = lambda: self._search_google(query, lat, lng, radius)
+        else:
+            key = ("search-page", page_token)
+            fetch = lambda: self._search_google(query, lat, lng, radius, page_token)
+
+        results, next_page_token = await self.flights.do(key, fetch)
+        return [dict(place) for place in results], next_page_token
+
+    async def _search_nearby_cache(
+        self,
+        query: str,
+        lat: float,
+        lng: float,
+        radius: int
+    ) -> Optional[list[dict]]:
+        """
+        Search cached places within radius via the nearby_places RPC.
+
+        Rows past the hard TTL don't count towards coverage.
+
+        Returns:
+            Results in Google search format, nearest first, or None if
+            fewer than PLACES_NEARBY_MIN_RESULTS cached places match
+        """
+        try:
+            db = get_db()
+            result = await db.rpc("nearby_places", {
+                "p_lat": lat,
+                "p_lng": lng,
+                "p_radius_m": radius,
+                "p_types": ["restaurant"],
+                "p_query": normalize_query(query),
+                "p_limit": PLACES_NEARBY_MAX_RESULTS,
+            }).execute()
+        except Exception as e:
+            logger.warning(f"Nearby cache lookup failed, falling back to Google: {e}")
+            return None
+
+        rows = [
+            row for row in result.data or []
+            if not self._is_cache_stale(row.get("last_fetched_at"), PLACE_HARD_TTL_DAYS)
+        ]
+        if len(rows) < PLACES_NEARBY_MIN_RESULTS:
+            self.nearby_misses += 1
+            return None
+
+        self.nearby_hits += 1
+        place_cache = get_place_cache()
+        results = []
+        for row in rows:
+            row.pop("distance_m", None)
+            place_cache.put(row)
+            results.append(self._cached_details(row, stale=False))
+        return results
+
+    async def get_place_details(self, google_place_id: str) -> Optional[dict]:
         """
         Get detailed information about a place.
         Checks cache first, fetches from API if stale or not cached.
+        Concurrent fetches for the same place share one Google call.
 
         Args:
             google_place_id: Google Place ID (e.g., "ChIJ...")
@@ -226,118 +754,399 @@ class GooglePlacesService:
         Returns:
             Place details dict or None if not found
         """
+        # Malformed ids can't name a place - don't spend a Google call on them
+        if not GOOGLE_PLACE_ID_PATTERN.fullmatch(google_place_id):
+            return None
+
+        # Views feed the popularity ranking of the refresh scheduler
+        self.record_views({google_place_id: 1})
+
         # Check cache first
-        cached = self._get_cached_place(google_place_id)
+        cached = await self._get_cached_place(google_place_id)
         if cached:
-            # Return cached data in API-compatible format
-            return {
-                "place_id": cached["google_place_id"],
-                "cached_id": cached["id"],
-                "name": cached["name"],
-                "formatted_address": cached["address"],
-                "photos": [{"photo_reference": cached["photo_reference"]}] if cached.get("photo_reference") else [],
-                "types": cached.get("types", []),
-                "_from_cache": True
-            }
+            return self._cached_details(cached, stale=cached.get("_stale", False))
 
-        # Fetch from API
         try:
-            response = self.client.place(
-                place_id=google_place_id,
-                fields=[
-                    "place_id",
-                    "name",
-                    "formatted_address",
-                    "geometry",
-                    "photos",
-                    "types",
-                    "rating",
-                    "price_level",
-                    "opening_hours",
-                    "website",
-                    "formatted_phone_number"
-                ]
+            return await self.flights.do(
+                ("details", google_place_id),
+                lambda: self._fetch_place_details(google_place_id),
             )
+        except DatabaseError as e:
+            # Upstream unhealthy - serve the cached row however old it is
+            try:
+                fallback = await self.get_place_row(google_place_id)
+            except Exception:
+                fallback = None
+            if fallback is None:
+                raise
+            self.served_stale_on_error += 1
+            logger.warning(f"Serving expired place {google_place_id}: {e.message}")
+            return self._cached_details(fallback, stale=True)
 
-            status = response.get("status", "UNKNOWN")
+    def _cached_details(self, cached: dict, stale: bool) -> dict:
+        """Format a places row like a Place Details result."""
+        payload = cached.get("details") or {}
+        result = {
+            "place_id": cached["google_place_id"],
+            "cached_id": cached["id"],
+            "name": cached["name"],
+            "formatted_address": cached["address"],
+            "photos": payload.get("photos") or (
+                [{"photo_reference": cached["photo_reference"]}] if cached.get("photo_reference") else []
+            ),
+            "types": cached.get("types", []),
+            "rating": cached.get("rating"),
+            "price_level": cached.get("price_level"),
+            "user_ratings_total": cached.get("user_ratings_total"),
+            "website": payload.get("website"),
+            "formatted_phone_number": payload.get("formatted_phone_number"),
+            "_from_cache": True,
+            "_stale": stale
+        }
+        if cached.get("lat") is not None and cached.get("lng") is not None:
+            result["geometry"] = {"location": {"lat": cached["lat"], "lng": cached["lng"]}}
+        opening_hours = payload.get("opening_hours")
+        if opening_hours:
+            result["opening_hours"] = {
+                **opening_hours,
+                "open_now": _is_open_now(opening_hours.get("periods"), payload.get("utc_offset_minutes")),
+            }
+        return result
 
-            if status == "NOT_FOUND" or status == "ZERO_RESULTS":
-                return None
-            elif status == "OVER_QUERY_LIMIT":
-                raise DatabaseError(
-                    message="Rate limited by Google Places API",
-                    detail={"status": status}
-                )
-            elif status == "REQUEST_DENIED":
-                raise ValidationError(
-                    message="Invalid API key or API not enabled",
-                    detail={"status": status}
-                )
-            elif status not in ("OK",):
-                raise DatabaseError(
-                    message=f"Google Places API error: {status}",
-                    detail={"status": status}
-                )
+    async def get_place_details_batch(self, place_ids: list[str]) -> dict[str, Optional[dict]]:
+        """
+        Get details for many places at once.
+
+        All ids missing from the in-process cache are resolved with one
+        places query; only places not cached (or past the freshness
+        policy) are fetched from Google, at most PLACES_BATCH_CONCURRENCY
+        at a time.
 
-            result = response.get("result")
+        Args:
+            place_ids: Mix of Google Place IDs ("ChIJ...") and internal UUIDs
 
-            # Cache the result
-            if result:
-                cached_id = self._cache_place(result)
-                if cached_id:
-                    result["cached_id"] = cached_id
+        Returns:
+            Mapping of each requested id to its details dict, or None if
+            not found
+        """
+        place_cache = get_place_cache()
+        requested = list(dict.fromkeys(place_ids))
 
-            return result
+        # Lookup key per requested id: Google IDs as given, UUIDs in the
+        # canonical (lowercase) form the database returns them in
+        keys: dict[str, Optional[str]] = {}
+        for place_id in requested:
+            if place_id.startswith("ChIJ"):
+                keys[place_id] = place_id
+            else:
+                try:
+                    keys[place_id] = str(uuid.UUID(place_id))
+                except ValueError:
+                    keys[place_id] = None  # Neither kind of id - reported as not found
 
-        except ApiError as e:
-            raise DatabaseError(
-                message="Google Places API error",
-                detail={"error": str(e)}
-            )
-        except (HTTPError, Timeout, TransportError) as e:
-            raise DatabaseError(
-                message="Network error contacting Google Places API",
-                detail={"error": str(e)}
-            )
+        rows: dict[str, dict] = {}
+        missing_google_ids = []
+        missing_ids = []
 
-    def get_place_photo(
+        for key in dict.fromkeys(k for k in keys.values() if k is not None):
+            is_google_id = key.startswith("ChIJ")
+            row = place_cache.get(key) if is_google_id else place_cache.get_by_id(key)
+            if row is not None:
+                rows[key] = row
+            elif not is_google_id:
+                missing_ids.append(key)
+            elif GOOGLE_PLACE_ID_PATTERN.fullmatch(key):
+                missing_google_ids.append(key)
+
+        if missing_google_ids or missing_ids:
+            writer = get_place_writer()
+            for google_place_id in missing_google_ids:
+                # First queued id flushes the whole batch; the rest are no-ops
+                await writer.ensure_written(google_place_id)
+
+            filters = []
+            if missing_google_ids:
+                filters.append(f"google_place_id.in.({','.join(missing_google_ids)})")
+            if missing_ids:
+                filters.append(f"id.in.({','.join(missing_ids)})")
+
+            try:
+                db = get_db()
+                result = await db.table("places").select("*").or_(",".join(filters)).execute()
+                found = result.data or []
+            except Exception as e:
+                logger.warning(f"Batch place lookup failed, using in-process cache only: {e}")
+                found = [
+                    row for row in (
+                        [place_cache.get_stale(google_place_id=g) for g in missing_google_ids]
+                        + [place_cache.get_stale(place_id=i) for i in missing_ids]
+                    )
+                    if row is not None
+                ]
+
+            for row in found:
+                place_cache.put(row)
+                for key in (row["google_place_id"], row["id"]):
+                    if key in missing_google_ids or key in missing_ids:
+                        rows[key] = row
+
+        results: dict[str, Optional[dict]] = {}
+        to_fetch: list[tuple[str, str, Optional[dict]]] = []
+        for place_id in requested:
+            key = keys[place_id]
+            row = rows.get(key) if key is not None else None
+            if row is None:
+                if key in missing_google_ids:
+                    to_fetch.append((place_id, key, None))
+                else:
+                    results[place_id] = None
+                continue
+
+            google_place_id = row["google_place_id"]
+            self.record_views({google_place_id: 1})
+            freshness = self._place_freshness(row)
+            if freshness == "fresh":
+                results[place_id] = self._cached_details(row, stale=False)
+            elif freshness == "stale" and PLACES_SWR_ENABLED:
+                self._schedule_refresh(google_place_id)
+                results[place_id] = self._cached_details(row, stale=True)
+            else:
+                to_fetch.append((place_id, google_place_id, row))
+
+        slots = asyncio.Semaphore(PLACES_BATCH_CONCURRENCY)
+
+        async def fetch(place_id: str, google_place_id: str, row: Optional[dict]) -> None:
+            async with slots:
+                try:
+                    results[place_id] = await self.flights.do(
+                        ("details", google_place_id),
+                        lambda: self._fetch_place_details(google_place_id),
+                    )
+                except DatabaseError as e:
+                    # One failed place shouldn't fail the batch
+                    logger.warning(f"Batch details fetch failed for {google_place_id}: {e.message}")
+                    if row is not None:
+                        self.served_stale_on_error += 1
+                    results[place_id] = self._cached_details(row, stale=True) if row is not None else None
+
+        await asyncio.gather(*(fetch(*item) for item in to_fetch))
+        return {place_id: results.get(place_id) for place_id in place_ids}
+
+    async def refresh_place(self, google_place_id: str) -> Optional[dict]:
+        """Fetch a place from Google regardless of cache freshness."""
+        return await self.flights.do(
+            ("details", google_place_id),
+            lambda: self._fetch_place_details(google_place_id),
+        )
+
+    def record_views(self, views: dict[str, int]) -> None:
+        """
+        Add detail views to the in-memory counts.
+
+        Places not already counted are dropped once PLACE_VIEW_COUNTS_MAX
+        places are, so memory stays bounded if flushes stop working.
+        """
+        for google_place_id, count in views.items():
+            if google_place_id in self.view_counts or len(self.view_counts) < PLACE_VIEW_COUNTS_MAX:
+                self.view_counts[google_place_id] += count
+            else:
+                self.views_dropped += count
+
+    def drain_view_counts(self) -> dict[str, int]:
+        """Return and reset view counts recorded since the last drain."""
+        views = dict(self.view_counts)
+        self.view_counts.clear()
+        return views
+
+    async def _fetch_place_details(self, google_place_id: str) -> Optional[dict]:
+        """Fetch Place Details from Google and queue the result for caching."""
+        response = await self._get_json("/details/json", {
+            "place_id": google_place_id,
+            "fields": ",".join(DETAIL_FIELDS),
+        })
+
+        status = response.get("status", "UNKNOWN")
+        # Google answers INVALID_REQUEST for place ids it can't parse
+        if status in ("NOT_FOUND", "ZERO_RESULTS", "INVALID_REQUEST"):
+            return None
+        self._check_status(status)
+
+        result = response.get("result")
+
+        # Cache the result
+        if result:
+            await self._cache_places([result], details=True)
+
+        return result
+
+    async def get_place_photo(
         self,
         photo_reference: str,
         max_width: int = 400
-    ) -> Optional[bytes]:
+    ) -> Union[str, PhotoStream, None]:
         """
         Get a photo for a place.
 
+        Each photo is downloaded from Google once, at PHOTO_SOURCE_WIDTH.
+        Smaller widths are resized locally from that source and stored
+        alongside it in the on-disk photo cache.
+
         Args:
             photo_reference: Photo reference from place result
             max_width: Maximum width of returned image (default 400)
 
         Returns:
-            Photo bytes or None if not found
+            Path to the cached photo file, a PhotoStream relaying a live
+            download, or None if not found
         """
+        if max_width < PHOTO_SOURCE_WIDTH:
+            path = get_photo_cache().get(photo_reference, max_width)
+            if path:
+                return path
+            return await self.flights.do(
+                ("resize", photo_reference, max_width),
+                lambda: self._make_photo_derivative(photo_reference, max_width),
+            )
+        return await self._get_upstream_photo(photo_reference, max_width)
+
+    async def _make_photo_derivative(self, photo_reference: str, max_width: int) -> Optional[str]:
+        """Resize the source photo to max_width in the process pool and cache it."""
+        source = await self._get_upstream_photo(photo_reference, PHOTO_SOURCE_WIDTH)
+        if isinstance(source, PhotoStream):
+            # This request started the source download - drain it into the cache
+            try:
+                async for _ in source:
+                    pass
+            except httpx.TransportError as e:
+                raise DatabaseError(
+                    message="Network error fetching photo",
+                    detail={"error": str(e)}
+                )
+            finally:
+                await source.aclose()
+            source = source.done.result()
+        if not source:
+            return None
+
+        photo_cache = get_photo_cache()
+        key = photo_cache.key(photo_reference, max_width)
+        tmp_path = photo_cache.temp_path(key)
         try:
-            # places_photo returns a generator of image chunks
-            photo_data = self.client.places_photo(
-                photo_reference=photo_reference,
-                max_width=max_width
+            await asyncio.get_running_loop().run_in_executor(
+                get_resize_pool(), resize_photo, source, tmp_path, max_width
             )
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
-            # Collect all chunks into bytes
-            return b"".join(photo_data)
+        self.photo_resizes += 1
+        return photo_cache.commit(key, tmp_path)
 
-        except ApiError as e:
-            if "INVALID_REQUEST" in str(e):
-                return None
+    async def _get_upstream_photo(
+        self,
+        photo_reference: str,
+        max_width: int
+    ) -> Union[str, PhotoStream, None]:
+        """
+        Get a photo as fetched from Google at max_width.
+
+        Served from the on-disk photo cache. On a miss, the first
+        request streams the Google download straight through to its
+        client (while writing it to the cache), and concurrent requests
+        for the same photo and width wait for that download to finish,
+        for at most PHOTO_STREAM_TIMEOUT_SECONDS before downloading it
+        themselves.
+        """
+        photo_cache = get_photo_cache()
+        key = (photo_reference, max_width)
+
+        while True:
+            path = photo_cache.get(photo_reference, max_width)
+            if path:
+                return path
+
+            pending = self._photo_downloads.get(key)
+            if pending is None:
+                break
+            self.photo_downloads_shared += 1
+            try:
+                result = await asyncio.wait_for(asyncio.shield(pending), PHOTO_STREAM_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f"Shared photo download {photo_reference} ({max_width}px) timed out, fetching directly")
+                break
+            if result is not DOWNLOAD_ABORTED:
+                return result
+            # The streaming client went away mid-download - try again
+
+        done = asyncio.get_running_loop().create_future()
+        self._photo_downloads[key] = done
+
+        def release(_) -> None:
+            # A waiter that timed out may have replaced this download
+            if self._photo_downloads.get(key) is done:
+                del self._photo_downloads[key]
+
+        done.add_done_callback(release)
+        self.photo_downloads += 1
+
+        try:
+            response = await self._open_photo(photo_reference, max_width)
+        except BaseException:
+            done.set_result(DOWNLOAD_ABORTED)
+            raise
+
+        if response is None:
+            done.set_result(None)
+            return None
+
+        return PhotoStream(photo_cache, photo_cache.key(photo_reference, max_width), response, done)
+
+    async def _open_photo(self, photo_reference: str, max_width: int) -> Optional[httpx.Response]:
+        """
+        Start a streaming photo download from Google.
+
+        Returns:
+            Open streaming response (caller must read or close it), or
+            None if the photo reference is invalid
+        """
+        request = self.client.build_request("GET", "/photo", params={
+            "photoreference": photo_reference,
+            "maxwidth": max_width,
+            "key": self.api_key,
+        })
+        await self.guard.before_call()
+        try:
+            # The photo endpoint redirects to the image itself
+            response = await self.client.send(request, stream=True)
+        except httpx.TransportError as e:
+            self.guard.on_throttle()
             raise DatabaseError(
-                message="Google Places API error fetching photo",
+                message="Network error fetching photo",
                 detail={"error": str(e)}
             )
-        except (HTTPError, Timeout, TransportError) as e:
+        except BaseException:
+            self.guard.on_abandon()
+            raise
+
+        if response.status_code in (400, 404):
+            # Invalid or expired photo reference
+            self.guard.on_success()
+            await response.aclose()
+            return None
+        if response.is_error:
+            if response.status_code == 429:
+                self.guard.on_throttle()
+            else:
+                self.guard.on_failure()
+            await response.aclose()
             raise DatabaseError(
-                message="Network error fetching photo",
-                detail={"error": str(e)}
+                message="Google Places API error fetching photo",
+                detail={"status_code": response.status_code}
             )
 
+        self.guard.on_success()
+        return response
+
 
 def get_places_service() -> GooglePlacesService:
     """
@@ -348,3 +1157,43 @@ def get_places_service() -> GooglePlacesService:
     if _places_service is None:
         _places_service = GooglePlacesService()
     return _places_service
+
+
+def get_places_metrics() -> Optional[dict]:
+    """Upstream call metrics, or None before the service is created."""
+    if _places_service is None:
+        return None
+    return {
+        "singleflight": _places_service.flights.stats(),
+        "photo_downloads": {
+            "started": _places_service.photo_downloads,
+            "shared": _places_service.photo_downloads_shared,
+            "in_flight": len(_places_service._photo_downloads),
+            "resized": _places_service.photo_resizes,
+        },
+        "background_refresh": {
+            "pending": len(_places_service._refreshing),
+            "completed": _places_service.refreshes_completed,
+            "failed": _places_service.refreshes_failed,
+            "dropped": _places_service.refreshes_dropped,
+        },
+        "view_counts": {
+            "places": len(_places_service.view_counts),
+            "dropped": _places_service.views_dropped,
+        },
+        "nearby_cache": {
+            "hits": _places_service.nearby_hits,
+            "misses": _places_service.nearby_misses,
+        },
+        **_places_service.guard.stats(),
+        "served_stale_on_error": _places_service.served_stale_on_error,
+    }
+
+
+async def close_places_service() -> None:
+    """Close the shared Google client on shutdown."""
+    global _places_service
+    if _places_service is not None:
+        await _places_service.aclose()
+        _places_service = None
+    shutdown_resize_pool()
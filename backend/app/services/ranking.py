@@ -0,0 +1,116 @@
+"""
+Place ranking for the "decide now" picker
+Scores a whole batch of search results at once with NumPy array operations
+"""
+
+import os
+from typing import Optional
+import numpy as np
+
+# Score weights (each feature is scaled to 0..1 before weighting)
+RANK_WEIGHT_RATING = float(os.getenv("RANK_WEIGHT_RATING", "3.0"))
+RANK_WEIGHT_REVIEWS = float(os.getenv("RANK_WEIGHT_REVIEWS", "1.0"))
+RANK_WEIGHT_DISTANCE = float(os.getenv("RANK_WEIGHT_DISTANCE", "2.0"))
+RANK_WEIGHT_OPEN_NOW = float(os.getenv("RANK_WEIGHT_OPEN_NOW", "2.0"))
+RANK_WEIGHT_PRICE = float(os.getenv("RANK_WEIGHT_PRICE", "1.0"))
+
+# Review count at which the review feature saturates at 1.0
+RANK_REVIEWS_SATURATION = int(os.getenv("RANK_REVIEWS_SATURATION", "1000"))
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def haversine_m(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance in meters from (lat, lng) to each point."""
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def _column(places: list[dict], get) -> np.ndarray:
+    """Float array of one field across places, NaN where missing."""
+    values = (get(place) for place in places)
+    return np.fromiter(
+        (np.nan if value is None else float(value) for value in values),
+        dtype=np.float64,
+        count=len(places),
+    )
+
+
+def score_places(
+    places: list[dict],
+    lat: float,
+    lng: float,
+    radius: int,
+    price_level: Optional[int] = None
+) -> np.ndarray:
+    """
+    Score places (Google search result format) for the picker.
+
+    Features, each in 0..1:
+    - rating: rating / 5 (unrated = 0)
+    - reviews: log-scaled user_ratings_total, saturating at RANK_REVIEWS_SATURATION
+    - distance: 1 at the search point, 0 at the radius edge or beyond
+    - open_now: 1 open, 0 closed, 0.5 unknown
+    - price fit: closeness to the requested price_level (only if one is given;
+      unknown price = 0.5)
+
+    Returns:
+        Array of scores aligned with places (higher = better)
+    """
+    def location(key: str):
+        return lambda p: p.get("geometry", {}).get("location", {}).get(key)
+
+    rating = _column(places, lambda p: p.get("rating"))
+    reviews = _column(places, lambda p: p.get("user_ratings_total"))
+    lats = _column(places, location("lat"))
+    lngs = _column(places, location("lng"))
+    open_now = _column(places, lambda p: (p.get("opening_hours") or {}).get("open_now"))
+
+    rating_score = np.nan_to_num(rating / 5.0, nan=0.0)
+    reviews_score = np.clip(
+        np.log1p(np.nan_to_num(reviews, nan=0.0)) / np.log1p(RANK_REVIEWS_SATURATION), 0.0, 1.0
+    )
+    distance = haversine_m(lat, lng, lats, lngs)
+    distance_score = np.nan_to_num(np.clip(1.0 - distance / max(radius, 1), 0.0, 1.0), nan=0.0)
+    open_score = np.nan_to_num(open_now, nan=0.5)
+
+    scores = (
+        RANK_WEIGHT_RATING * rating_score
+        + RANK_WEIGHT_REVIEWS * reviews_score
+        + RANK_WEIGHT_DISTANCE * distance_score
+        + RANK_WEIGHT_OPEN_NOW * open_score
+    )
+
+    if price_level is not None:
+        price = _column(places, lambda p: p.get("price_level"))
+        price_score = np.nan_to_num(1.0 - np.abs(price - price_level) / 4.0, nan=0.5)
+        scores += RANK_WEIGHT_PRICE * price_score
+
+    return scores
+
+
+def rank_places(
+    places: list[dict],
+    lat: float,
+    lng: float,
+    radius: int,
+    price_level: Optional[int] = None,
+    limit: Optional[int] = None
+) -> list[dict]:
+    """
+    Return places best first, cut to the top `limit`.
+
+    Ties keep their original (Google relevance) order.
+    """
+    if not places:
+        return []
+    scores = score_places(places, lat, lng, radius, price_level)
+    order = np.argsort(-scores, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    return [places[i] for i in order]
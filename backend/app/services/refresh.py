@@ -0,0 +1,325 @@
+"""
+Proactive place refresh scheduler
+Refreshes popular cached places before they go stale, within a daily
+Google quota budget shared by every process running the scheduler
+
+Runs as an asyncio task inside the API (PLACE_REFRESH_IN_APP=true) or
+as a separate worker:
+    python -m app.services.refresh
+
+Detail views feed its popularity ranking. Each API process records
+views in memory and writes them to the database on its own timer
+(PlaceViewFlusher), wherever the scheduler runs.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.db import get_db, close_db
+from app.services.places import (
+    PLACE_HOURS_TTL_HOURS,
+    PLACE_REFRESH_CONCURRENCY,
+    PLACE_SOFT_TTL_DAYS,
+    get_places_service,
+    close_places_service,
+)
+from app.services.place_writer import get_place_writer, close_place_writer
+
+PLACE_REFRESH_IN_APP = os.getenv("PLACE_REFRESH_IN_APP", "true").lower() == "true"
+PLACE_REFRESH_INTERVAL_SECONDS = float(os.getenv("PLACE_REFRESH_INTERVAL_SECONDS", "300"))
+PLACE_REFRESH_DAILY_QUOTA = int(os.getenv("PLACE_REFRESH_DAILY_QUOTA", "1000"))
+PLACE_REFRESH_LEAD_HOURS = float(os.getenv("PLACE_REFRESH_LEAD_HOURS", "24"))
+# Lead time for opening hours, which expire after PLACE_HOURS_TTL_HOURS
+PLACE_REFRESH_HOURS_LEAD_HOURS = float(os.getenv("PLACE_REFRESH_HOURS_LEAD_HOURS", "2"))
+PLACE_REFRESH_BATCH_SIZE = int(os.getenv("PLACE_REFRESH_BATCH_SIZE", "50"))
+PLACE_VIEWS_FLUSH_SECONDS = float(os.getenv("PLACE_VIEWS_FLUSH_SECONDS", "60"))
+
+logger = logging.getLogger(__name__)
+
+# Singleton scheduler and view flusher
+_scheduler: Optional["PlaceRefreshScheduler"] = None
+_view_flusher: Optional["PlaceViewFlusher"] = None
+
+
+class PlaceViewFlusher:
+    """
+    Periodically writes view counts recorded by this process to the
+    database (record_place_views RPC).
+
+    Views from a failed write are put back (within the in-memory cap)
+    and retried on the next flush.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.views_flushed = 0
+        self.failures = 0
+
+    async def flush(self) -> None:
+        service = get_places_service()
+        views = service.drain_view_counts()
+        if not views:
+            return
+        try:
+            db = get_db()
+            await db.rpc("record_place_views", {"p_views": views}).execute()
+        except Exception as e:
+            self.failures += 1
+            service.record_views(views)
+            logger.warning(f"Failed to record {len(views)} place views: {e}")
+            return
+        self.flushes += 1
+        self.views_flushed += sum(views.values())
+
+    async def run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(PLACE_VIEWS_FLUSH_SECONDS)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Place view flush failed: {e}", exc_info=True)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        """Stop the timer and write out views recorded since the last flush."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Final place view flush failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "flushes": self.flushes,
+            "views_flushed": self.views_flushed,
+            "failures": self.failures,
+        }
+
+
+class PlaceRefreshScheduler:
+    """
+    Periodically refreshes the hottest places that are about to go stale.
+
+    Each run flushes this process's view counts, asks the database for places
+    last fetched more than (soft TTL - lead time) ago, or whose opening
+    hours were fetched more than (hours TTL - hours lead time) ago,
+    ranked by popularity, and refreshes as many as today's quota allows.
+
+    The quota is claimed from a per-day counter in the database
+    (claim_place_refresh_quota), so all workers and restarts share one
+    budget. Places Google no longer knows get not_found_at set and are
+    skipped by later passes.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.quota_day = datetime.now(timezone.utc).date()
+        self.used_today = 0
+        self.runs = 0
+        self.refreshed = 0
+        self.not_found = 0
+        self.failed = 0
+        self.last_run_at: Optional[str] = None
+        self.last_run_ms: Optional[float] = None
+        self.last_candidates = 0
+
+    def remaining_quota(self) -> int:
+        """Quota left today, as of this process's last claim."""
+        today = datetime.now(timezone.utc).date()
+        if today != self.quota_day:
+            self.quota_day = today
+            self.used_today = 0
+        return max(0, PLACE_REFRESH_DAILY_QUOTA - self.used_today)
+
+    async def run_once(self) -> int:
+        """
+        Run one refresh pass.
+
+        Returns:
+            Number of places refreshed
+        """
+        start = time.perf_counter()
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc).isoformat()
+
+        # Rank with the latest views from this process
+        await get_view_flusher().flush()
+
+        if self.remaining_quota() == 0:
+            self.last_candidates = 0
+            return 0
+
+        now = datetime.now(timezone.utc)
+        stale_before = now - (
+            timedelta(days=PLACE_SOFT_TTL_DAYS) - timedelta(hours=PLACE_REFRESH_LEAD_HOURS)
+        )
+        details_stale_before = now - timedelta(
+            hours=max(0.0, PLACE_HOURS_TTL_HOURS - PLACE_REFRESH_HOURS_LEAD_HOURS)
+        )
+        db = get_db()
+        result = await db.rpc("places_due_for_refresh", {
+            "p_stale_before": stale_before.isoformat(),
+            "p_limit": PLACE_REFRESH_BATCH_SIZE,
+            "p_details_stale_before": details_stale_before.isoformat(),
+        }).execute()
+        candidates = result.data or []
+        self.last_candidates = len(candidates)
+        if not candidates:
+            return 0
+
+        granted = await self._claim_quota(len(candidates))
+        candidates = candidates[:granted]
+
+        service = get_places_service()
+        slots = asyncio.Semaphore(PLACE_REFRESH_CONCURRENCY)
+        refreshed = 0
+        missing: list[str] = []
+
+        async def refresh(google_place_id: str) -> None:
+            nonlocal refreshed
+            async with slots:
+                try:
+                    result = await service.refresh_place(google_place_id)
+                except Exception as e:
+                    self.failed += 1
+                    logger.warning(f"Scheduled refresh failed for {google_place_id}: {e}")
+                    return
+                if result is None:
+                    missing.append(google_place_id)
+                else:
+                    refreshed += 1
+
+        await asyncio.gather(*(refresh(row["google_place_id"]) for row in candidates))
+
+        # Write refreshed rows now so the next pass doesn't pick them again
+        await get_place_writer().flush()
+        if missing:
+            await self._mark_not_found(missing)
+
+        self.refreshed += refreshed
+        self.last_run_ms = round((time.perf_counter() - start) * 1000, 2)
+        return refreshed
+
+    async def _claim_quota(self, requested: int) -> int:
+        """Claim Google calls from today's shared quota; returns the calls granted."""
+        result = await get_db().rpc("claim_place_refresh_quota", {
+            "p_requested": requested,
+            "p_daily_quota": PLACE_REFRESH_DAILY_QUOTA,
+        }).execute()
+        [claim] = result.data
+        self.quota_day = datetime.now(timezone.utc).date()
+        self.used_today = claim["used"]
+        return claim["granted"]
+
+    async def _mark_not_found(self, google_place_ids: list[str]) -> None:
+        """Record places Google no longer knows so later passes skip them."""
+        self.not_found += len(google_place_ids)
+        try:
+            await get_db().table("places").update({
+                "not_found_at": datetime.now(timezone.utc).isoformat(),
+            }).in_("google_place_id", google_place_ids).execute()
+        except Exception as e:
+            logger.warning(f"Failed to mark {len(google_place_ids)} places not found: {e}")
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                refreshed = await self.run_once()
+                if refreshed:
+                    logger.info(f"Refreshed {refreshed} places ({self.remaining_quota()} quota left today)")
+            except Exception as e:
+                logger.error(f"Place refresh run failed: {e}", exc_info=True)
+            await asyncio.sleep(PLACE_REFRESH_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "refreshed": self.refreshed,
+            "not_found": self.not_found,
+            "failed": self.failed,
+            "quota_used_today": self.used_today,
+            "quota_remaining": self.remaining_quota(),
+            "daily_quota": PLACE_REFRESH_DAILY_QUOTA,
+            "last_candidates": self.last_candidates,
+            "last_run_at": self.last_run_at,
+            "last_run_ms": self.last_run_ms,
+        }
+
+
+def get_refresh_scheduler() -> PlaceRefreshScheduler:
+    """Get singleton refresh scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = PlaceRefreshScheduler()
+    return _scheduler
+
+
+def get_view_flusher() -> PlaceViewFlusher:
+    """Get singleton view flusher."""
+    global _view_flusher
+    if _view_flusher is None:
+        _view_flusher = PlaceViewFlusher()
+    return _view_flusher
+
+
+def get_refresh_metrics() -> Optional[dict]:
+    """Scheduler and view flusher metrics, or None if neither has been created."""
+    if _scheduler is None and _view_flusher is None:
+        return None
+    return {
+        **(_scheduler.stats() if _scheduler is not None else {}),
+        "views": _view_flusher.stats() if _view_flusher is not None else None,
+    }
+
+
+async def stop_refresh_scheduler() -> None:
+    """Stop the in-app scheduler and flush remaining views on shutdown."""
+    global _scheduler, _view_flusher
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
+    if _view_flusher is not None:
+        await _view_flusher.stop()
+        _view_flusher = None
+
+
+async def _run_worker() -> None:
+    scheduler = get_refresh_scheduler()
+    try:
+        await scheduler.run_forever()
+    finally:
+        await close_places_service()
+        await close_place_writer()
+        await close_db()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_worker())
@@ -0,0 +1,60 @@
+"""
+Geo-tiled cache for place search results
+Nearby searches for the same query share one cached Google response
+"""
+
+import os
+from bisect import bisect_left
+from typing import Optional
+
+from app.cache import TTLCache
+from app.services.geo import geohash_encode
+
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "900"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+
+# Requested radii are rounded up to one of these (meters)
+RADIUS_BUCKETS = [250, 500, 1000, 2000, 5000, 10000, 20000, 50000]
+
+# Singleton cache
+_search_cache: Optional[TTLCache] = None
+
+
+def radius_bucket(radius: int) -> int:
+    """Round a radius up to the nearest bucket."""
+    index = bisect_left(RADIUS_BUCKETS, radius)
+    return RADIUS_BUCKETS[min(index, len(RADIUS_BUCKETS) - 1)]
+
+
+def geohash_precision(bucket: int) -> int:
+    """Pick a geohash cell size that is small relative to the search radius."""
+    if bucket <= 500:
+        return 7  # ~150m cells
+    if bucket <= 2000:
+        return 6  # ~1.2km x 0.6km cells
+    if bucket <= 10000:
+        return 5  # ~4.9km cells
+    return 4  # ~39km x 20km cells
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so equivalent queries share a key."""
+    return " ".join(query.casefold().split())
+
+
+def search_cache_key(query: str, lat: float, lng: float, radius: int) -> tuple:
+    """Cache key: (normalized query, geohash cell, radius bucket)."""
+    bucket = radius_bucket(radius)
+    cell = geohash_encode(lat, lng, geohash_precision(bucket))
+    return (normalize_query(query), cell, bucket)
+
+
+def get_search_cache() -> TTLCache:
+    """Get singleton search result cache ((results, next_page_token) per key)."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = TTLCache(
+            max_entries=SEARCH_CACHE_MAX_ENTRIES,
+            ttl_seconds=SEARCH_CACHE_TTL_SECONDS,
+        )
+    return _search_cache
@@ -0,0 +1,226 @@
+"""
+Upstream protection for Google Places calls
+Process-wide adaptive token-bucket rate limiter and circuit breaker
+"""
+
+import os
+import time
+import asyncio
+
+from app.errors import DatabaseError
+
+GOOGLE_RATE_LIMIT_QPS = float(os.getenv("GOOGLE_RATE_LIMIT_QPS", "50"))
+GOOGLE_RATE_LIMIT_MIN_QPS = float(os.getenv("GOOGLE_RATE_LIMIT_MIN_QPS", "1"))
+GOOGLE_RATE_LIMIT_BURST = float(os.getenv("GOOGLE_RATE_LIMIT_BURST", "20"))
+GOOGLE_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("GOOGLE_RATE_LIMIT_MAX_WAIT_SECONDS", "2"))
+GOOGLE_BREAKER_FAILURE_THRESHOLD = int(os.getenv("GOOGLE_BREAKER_FAILURE_THRESHOLD", "5"))
+GOOGLE_BREAKER_RESET_SECONDS = float(os.getenv("GOOGLE_BREAKER_RESET_SECONDS", "30"))
+
+# Additive increase per successful call (QPS), multiplicative decrease on throttle
+RATE_INCREASE_STEP = 0.5
+RATE_DECREASE_FACTOR = 0.5
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate adapts to upstream feedback (AIMD).
+
+    Throttling signals (OVER_QUERY_LIMIT, timeouts, transport errors)
+    halve the rate; each success adds RATE_INCREASE_STEP back, up to
+    the configured maximum. Callers that would wait longer than
+    max_wait are rejected instead of piling up.
+    """
+
+    def __init__(self, max_rate: float, min_rate: float, burst: float, max_wait: float):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.tokens = burst
+        self._updated = time.monotonic()
+        self.acquired = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.throttled = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """
+        Take one token, waiting for it if needed.
+
+        Raises:
+            DatabaseError: If the wait would exceed max_wait
+        """
+        self._refill()
+        # Reserve a token; a negative balance queues callers in order
+        self.tokens -= 1
+        if self.tokens >= 0:
+            self.acquired += 1
+            return
+
+        wait = -self.tokens / self.rate
+        if wait > self.max_wait:
+            self.tokens += 1
+            self.rejected += 1
+            raise DatabaseError(
+                message="Google Places API rate limit reached",
+                detail={"retry_after": round(wait, 1)}
+            )
+
+        self.delayed += 1
+        await asyncio.sleep(wait)
+        self.acquired += 1
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + RATE_INCREASE_STEP)
+
+    def on_throttle(self) -> None:
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * RATE_DECREASE_FACTOR)
+        self.throttled += 1
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            "rate_qps": round(self.rate, 2),
+            "max_rate_qps": self.max_rate,
+            "tokens": round(self.tokens, 2),
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+        }
+
+
+class CircuitBreaker:
+    """
+    Fails fast while the upstream is unhealthy.
+
+    closed: calls pass; consecutive failures are counted.
+    open: calls are rejected until reset_seconds have passed.
+    half_open: one probe call is let through; success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened = 0
+        self.rejected = 0
+
+    def check(self) -> None:
+        """
+        Raise if the circuit does not allow a call right now.
+
+        Raises:
+            DatabaseError: While the circuit is open
+        """
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise DatabaseError(
+                    message="Google Places API temporarily unavailable",
+                    detail={"circuit": "open", "retry_after": round(remaining, 1)}
+                )
+            self.state = "half_open"
+
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise DatabaseError(
+                    message="Google Places API temporarily unavailable",
+                    detail={"circuit": "half_open"}
+                )
+            self._probe_in_flight = True
+
+    def release_probe(self) -> None:
+        """Free a half-open probe slot without a verdict on the upstream."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class UpstreamGuard:
+    """Rate limiter and circuit breaker applied together to each Google call"""
+
+    def __init__(self):
+        self.limiter = AdaptiveRateLimiter(
+            max_rate=GOOGLE_RATE_LIMIT_QPS,
+            min_rate=GOOGLE_RATE_LIMIT_MIN_QPS,
+            burst=GOOGLE_RATE_LIMIT_BURST,
+            max_wait=GOOGLE_RATE_LIMIT_MAX_WAIT_SECONDS,
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=GOOGLE_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=GOOGLE_BREAKER_RESET_SECONDS,
+        )
+
+    async def before_call(self) -> None:
+        """Fail fast if the circuit is open, then take a rate limit token."""
+        self.breaker.check()
+        try:
+            await self.limiter.acquire()
+        except BaseException:
+            # Rejected or cancelled while waiting - not an upstream failure
+            self.on_abandon()
+            raise
+
+    def on_success(self) -> None:
+        self.limiter.on_success()
+        self.breaker.record_success()
+
+    def on_throttle(self) -> None:
+        """OVER_QUERY_LIMIT, timeout or transport error."""
+        self.limiter.on_throttle()
+        self.breaker.record_failure()
+
+    def on_failure(self) -> None:
+        """Upstream error that says nothing about our request rate (e.g. 5xx)."""
+        self.breaker.record_failure()
+
+    def on_abandon(self) -> None:
+        """
+        Call ended without an answer from the upstream (cancelled, or an
+        error on our side).
+
+        Must be called for every exit not covered by the other callbacks,
+        or a half-open probe slot is never freed and the circuit rejects
+        every call from then on.
+        """
+        self.breaker.release_probe()
+
+    def stats(self) -> dict:
+        return {
+            "rate_limiter": self.limiter.stats(),
+            "circuit_breaker": self.breaker.stats(),
+        }
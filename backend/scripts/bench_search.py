@@ -0,0 +1,53 @@
+"""
+Measure /api/places/search throughput under concurrent load
+Usage: python scripts/bench_search.py --token <jwt> [--requests 200] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run(args):
+    params = {"q": args.query, "lat": args.lat, "lng": args.lng, "radius": args.radius}
+    headers = {"Authorization": f"Bearer {args.token}"}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    errors = 0
+
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, timeout=60) as client:
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/api/places/search", params=params)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"requests:    {args.requests} (concurrency {args.concurrency})")
+    print(f"errors:      {errors}")
+    print(f"throughput:  {args.requests / elapsed:.1f} req/s")
+    print(f"latency p50: {statistics.median(latencies) * 1000:.0f} ms")
+    print(f"latency p95: {p95 * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--query", default="restaurant")
+    parser.add_argument("--lat", type=float, default=1.3521)
+    parser.add_argument("--lng", type=float, default=103.8198)
+    parser.add_argument("--radius", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,65 @@
+-- Migration: Popularity-ranked proactive refresh of cached places
+-- Purpose: Let the refresh scheduler find hot places that are about to go
+-- stale, using idx_places_last_fetched, before a user request hits them.
+
+-- ============================================
+-- VIEW TRACKING
+-- ============================================
+
+ALTER TABLE places
+  ADD COLUMN view_count INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN last_viewed_at TIMESTAMPTZ;
+
+-- Apply a batch of view counts recorded in memory by the API
+-- p_views: {"<google_place_id>": <views>, ...}
+CREATE OR REPLACE FUNCTION record_place_views(p_views JSONB)
+RETURNS VOID AS $$
+  UPDATE places p
+  SET view_count = p.view_count + v.value::INTEGER,
+      last_viewed_at = NOW()
+  FROM jsonb_each_text(p_views) AS v
+  WHERE p.google_place_id = v.key;
+$$ LANGUAGE sql;
+
+-- ============================================
+-- REFRESH CANDIDATES
+-- ============================================
+
+-- Places last fetched before p_stale_before, ranked by popularity:
+-- saves weigh most, then journal entries, then views in the last 30 days.
+-- Places nobody has saved, logged or viewed are left to lazy refresh.
+CREATE OR REPLACE FUNCTION places_due_for_refresh(
+  p_stale_before TIMESTAMPTZ,
+  p_limit INTEGER
+)
+RETURNS TABLE (
+  id UUID,
+  google_place_id TEXT,
+  last_fetched_at TIMESTAMPTZ,
+  popularity BIGINT
+) AS $$
+  SELECT *
+  FROM (
+    SELECT
+      p.id,
+      p.google_place_id,
+      p.last_fetched_at,
+      (SELECT COUNT(*) FROM saved_places s WHERE s.place_id = p.id) * 3
+        + (SELECT COUNT(*) FROM journal_entries j WHERE j.place_id = p.id) * 2
+        + CASE WHEN p.last_viewed_at > NOW() - INTERVAL '30 days' THEN p.view_count ELSE 0 END
+        AS popularity
+    FROM places p
+    WHERE p.last_fetched_at IS NOT NULL
+      AND p.last_fetched_at < p_stale_before
+  ) ranked
+  WHERE ranked.popularity > 0
+  ORDER BY ranked.popularity DESC, ranked.last_fetched_at
+  LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON FUNCTION record_place_views IS 'Batch-apply in-memory place view counts';
+COMMENT ON FUNCTION places_due_for_refresh IS 'Popular places nearing staleness, hottest first';
@@ -0,0 +1,34 @@
+-- Migration: Persist the full Place Details payload
+-- Purpose: A cached place can answer GET /api/places/{id} completely
+-- (location, rating, price, hours, website, phone) without calling Google.
+
+-- ============================================
+-- STRUCTURED COLUMNS (also filled from search results)
+-- ============================================
+
+ALTER TABLE places
+  ADD COLUMN lat DOUBLE PRECISION,
+  ADD COLUMN lng DOUBLE PRECISION,
+  ADD COLUMN rating NUMERIC(2, 1),
+  ADD COLUMN price_level SMALLINT CHECK (price_level BETWEEN 0 AND 4),
+  ADD COLUMN user_ratings_total INTEGER;
+
+-- ============================================
+-- DETAIL PAYLOAD (only from Place Details)
+-- ============================================
+
+-- details: {"opening_hours": {"periods": [...], "weekday_text": [...]},
+--           "utc_offset_minutes": 480, "website": "...",
+--           "formatted_phone_number": "...", "photos": [...]}
+-- details_fetched_at drives the short opening-hours TTL; last_fetched_at
+-- keeps tracking name/address/location freshness.
+ALTER TABLE places
+  ADD COLUMN details JSONB,
+  ADD COLUMN details_fetched_at TIMESTAMPTZ;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON COLUMN places.details IS 'Place Details fields without a structured column (hours, website, phone, photos)';
+COMMENT ON COLUMN places.details_fetched_at IS 'When details was last fetched from Place Details; hours expire sooner than other fields';
@@ -0,0 +1,90 @@
+-- Migration: Spatial index and cache-first nearby search over places
+-- Purpose: Answer "what's near me" from cached places, so search only
+-- calls Google where local coverage is thin.
+
+-- ============================================
+-- POSTGIS LOCATION COLUMN
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS postgis WITH SCHEMA extensions;
+
+-- Derived from lat/lng (migration 20261018000002) so writers never set it
+ALTER TABLE places
+  ADD COLUMN location GEOGRAPHY(POINT, 4326)
+  GENERATED ALWAYS AS (
+    CASE
+      WHEN lat IS NOT NULL AND lng IS NOT NULL
+      THEN ST_SetSRID(ST_MakePoint(lng, lat), 4326)::GEOGRAPHY
+    END
+  ) STORED;
+
+CREATE INDEX idx_places_location ON places USING GIST (location);
+
+-- ============================================
+-- NEARBY SEARCH
+-- ============================================
+
+-- Cached places within p_radius_m meters of (p_lat, p_lng), nearest first.
+-- p_types: keep places having any of these types (NULL = any type)
+-- p_query: keep places whose name contains it, or that have it as a type
+--          ("thai food" also matches the type thai_food); NULL = no filter
+CREATE OR REPLACE FUNCTION nearby_places(
+  p_lat DOUBLE PRECISION,
+  p_lng DOUBLE PRECISION,
+  p_radius_m DOUBLE PRECISION,
+  p_types TEXT[] DEFAULT NULL,
+  p_query TEXT DEFAULT NULL,
+  p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+  id UUID,
+  google_place_id TEXT,
+  name TEXT,
+  address TEXT,
+  photo_reference TEXT,
+  types TEXT[],
+  lat DOUBLE PRECISION,
+  lng DOUBLE PRECISION,
+  rating NUMERIC,
+  price_level SMALLINT,
+  user_ratings_total INTEGER,
+  details JSONB,
+  last_fetched_at TIMESTAMPTZ,
+  details_fetched_at TIMESTAMPTZ,
+  distance_m DOUBLE PRECISION
+) AS $$
+  SELECT
+    p.id,
+    p.google_place_id,
+    p.name,
+    p.address,
+    p.photo_reference,
+    p.types,
+    p.lat,
+    p.lng,
+    p.rating,
+    p.price_level,
+    p.user_ratings_total,
+    p.details,
+    p.last_fetched_at,
+    p.details_fetched_at,
+    ST_Distance(p.location, ST_SetSRID(ST_MakePoint(p_lng, p_lat), 4326)::GEOGRAPHY) AS distance_m
+  FROM places p
+  WHERE ST_DWithin(p.location, ST_SetSRID(ST_MakePoint(p_lng, p_lat), 4326)::GEOGRAPHY, p_radius_m)
+    AND (p_types IS NULL OR p.types && p_types)
+    AND (
+      p_query IS NULL
+      OR p.name ILIKE '%' || p_query || '%'
+      OR replace(p_query, ' ', '_') = ANY(p.types)
+    )
+  ORDER BY distance_m
+  LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON COLUMN places.location IS 'Generated PostGIS point from lat/lng for radius queries';
+COMMENT ON INDEX idx_places_location IS 'Spatial index for nearby_places';
+COMMENT ON FUNCTION nearby_places IS 'Cached places within a radius, nearest first, with type and name filters';
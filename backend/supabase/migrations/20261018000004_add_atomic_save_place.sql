@@ -0,0 +1,98 @@
+-- Migration: Atomic save of a place in one round trip
+-- Purpose: UNIQUE(user_id, place_id, list_id) treats NULLs as distinct, so
+-- double-tapping save on the default list could create duplicates. Add a
+-- partial unique index for list_id IS NULL and a save_place RPC that
+-- resolves the place, inserts and returns the joined row in one statement.
+
+-- ============================================
+-- DEFAULT LIST UNIQUENESS
+-- ============================================
+
+-- Remove existing duplicates on the default list, keeping the earliest save
+DELETE FROM saved_places a
+USING saved_places b
+WHERE a.list_id IS NULL
+  AND b.list_id IS NULL
+  AND a.user_id = b.user_id
+  AND a.place_id = b.place_id
+  AND (a.saved_at, a.id) > (b.saved_at, b.id);
+
+CREATE UNIQUE INDEX idx_saved_places_default_list_unique
+  ON saved_places(user_id, place_id)
+  WHERE list_id IS NULL;
+
+-- ============================================
+-- SAVE RPC
+-- ============================================
+
+-- Saves p_google_place_id for p_user_id (p_list_id NULL = default list).
+-- Returns the save joined with its place; created = false if it was
+-- already saved to that list. Returns no row if the place isn't cached.
+CREATE OR REPLACE FUNCTION save_place(
+  p_user_id UUID,
+  p_google_place_id TEXT,
+  p_list_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  place_id UUID,
+  google_place_id TEXT,
+  name TEXT,
+  address TEXT,
+  photo_reference TEXT,
+  saved_at TIMESTAMPTZ,
+  list_id UUID,
+  created BOOLEAN
+) AS $$
+#variable_conflict use_column
+DECLARE
+  v_place places%ROWTYPE;
+  v_save saved_places%ROWTYPE;
+BEGIN
+  SELECT * INTO v_place FROM places WHERE places.google_place_id = p_google_place_id;
+  IF NOT FOUND THEN
+    RETURN;
+  END IF;
+
+  -- ON CONFLICT must name the index that can fire for this list
+  IF p_list_id IS NULL THEN
+    INSERT INTO saved_places (user_id, place_id, list_id)
+    VALUES (p_user_id, v_place.id, NULL)
+    ON CONFLICT (user_id, place_id) WHERE list_id IS NULL DO NOTHING
+    RETURNING * INTO v_save;
+  ELSE
+    INSERT INTO saved_places (user_id, place_id, list_id)
+    VALUES (p_user_id, v_place.id, p_list_id)
+    ON CONFLICT (user_id, place_id, list_id) DO NOTHING
+    RETURNING * INTO v_save;
+  END IF;
+
+  IF v_save.id IS NOT NULL THEN
+    created := TRUE;
+  ELSE
+    created := FALSE;
+    SELECT * INTO v_save
+    FROM saved_places s
+    WHERE s.user_id = p_user_id
+      AND s.place_id = v_place.id
+      AND s.list_id IS NOT DISTINCT FROM p_list_id;
+  END IF;
+
+  id := v_save.id;
+  place_id := v_place.id;
+  google_place_id := v_place.google_place_id;
+  name := v_place.name;
+  address := v_place.address;
+  photo_reference := v_place.photo_reference;
+  saved_at := v_save.saved_at;
+  list_id := v_save.list_id;
+  RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON INDEX idx_saved_places_default_list_unique IS 'One save per place on the default (NULL) list';
+COMMENT ON FUNCTION save_place IS 'Resolve place by Google ID and save it atomically; created=false if already saved';
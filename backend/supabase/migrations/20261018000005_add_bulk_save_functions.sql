@@ -0,0 +1,125 @@
+-- Migration: Set-based bulk save and move for saved places
+-- Purpose: Import or reorganise many saves in one statement instead of one
+-- request (and several round trips) per place. Relies on the unique
+-- indexes from 20261018000004_add_atomic_save_place.sql.
+
+-- ============================================
+-- BULK SAVE
+-- ============================================
+
+-- Saves every place in p_google_place_ids to p_list_id (NULL = default list).
+-- One row per distinct input id with status:
+--   created   - newly saved
+--   exists    - already saved to that list
+--   not_found - place not in the places cache
+CREATE OR REPLACE FUNCTION save_places_bulk(
+  p_user_id UUID,
+  p_google_place_ids TEXT[],
+  p_list_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+  google_place_id TEXT,
+  save_id UUID,
+  status TEXT
+) AS $$
+  WITH input AS (
+    SELECT DISTINCT unnest(p_google_place_ids) AS google_place_id
+  ),
+  resolved AS (
+    SELECT i.google_place_id, p.id AS place_id
+    FROM input i
+    LEFT JOIN places p ON p.google_place_id = i.google_place_id
+  ),
+  inserted AS (
+    INSERT INTO saved_places (user_id, place_id, list_id)
+    SELECT p_user_id, r.place_id, p_list_id
+    FROM resolved r
+    WHERE r.place_id IS NOT NULL
+    ON CONFLICT DO NOTHING
+    RETURNING saved_places.id, saved_places.place_id
+  )
+  SELECT
+    r.google_place_id,
+    COALESCE(ins.id, s.id) AS save_id,
+    CASE
+      WHEN r.place_id IS NULL THEN 'not_found'
+      WHEN ins.id IS NOT NULL THEN 'created'
+      ELSE 'exists'
+    END AS status
+  FROM resolved r
+  LEFT JOIN inserted ins ON ins.place_id = r.place_id
+  -- Rows inserted above are not visible here, only pre-existing saves
+  LEFT JOIN saved_places s
+    ON ins.id IS NULL
+    AND s.user_id = p_user_id
+    AND s.place_id = r.place_id
+    AND s.list_id IS NOT DISTINCT FROM p_list_id;
+$$ LANGUAGE sql;
+
+-- ============================================
+-- BULK MOVE
+-- ============================================
+
+-- Moves the user's saves in p_save_ids to p_list_id (NULL = default list).
+-- One row per distinct input id with status:
+--   moved     - list changed
+--   unchanged - already in that list
+--   conflict  - the place is already saved to that list
+--   not_found - no such save for this user
+CREATE OR REPLACE FUNCTION move_saved_places(
+  p_user_id UUID,
+  p_save_ids UUID[],
+  p_list_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+  save_id UUID,
+  status TEXT
+) AS $$
+  WITH input AS (
+    SELECT DISTINCT unnest(p_save_ids) AS id
+  ),
+  targets AS (
+    SELECT s.id, s.place_id, s.list_id
+    FROM saved_places s
+    JOIN input i ON i.id = s.id
+    WHERE s.user_id = p_user_id
+  ),
+  movable AS (
+    -- At most one save per place may land in the target list
+    SELECT DISTINCT ON (t.place_id) t.id
+    FROM targets t
+    WHERE t.list_id IS DISTINCT FROM p_list_id
+      AND NOT EXISTS (
+        SELECT 1 FROM saved_places o
+        WHERE o.user_id = p_user_id
+          AND o.place_id = t.place_id
+          AND o.list_id IS NOT DISTINCT FROM p_list_id
+      )
+    ORDER BY t.place_id, t.id
+  ),
+  moved AS (
+    UPDATE saved_places s
+    SET list_id = p_list_id
+    FROM movable m
+    WHERE s.id = m.id
+    RETURNING s.id
+  )
+  SELECT
+    i.id AS save_id,
+    CASE
+      WHEN mv.id IS NOT NULL THEN 'moved'
+      WHEN t.id IS NULL THEN 'not_found'
+      WHEN t.list_id IS NOT DISTINCT FROM p_list_id THEN 'unchanged'
+      ELSE 'conflict'
+    END AS status
+  FROM input i
+  LEFT JOIN targets t ON t.id = i.id
+  LEFT JOIN moved mv ON mv.id = i.id;
+$$ LANGUAGE sql;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON FUNCTION save_places_bulk IS 'Save many places in one statement with per-item status';
+COMMENT ON FUNCTION move_saved_places IS 'Move many saves to a list in one statement with per-item status';
@@ -0,0 +1,29 @@
+-- Migration: Indexes for keyset pagination of saves and journal listings
+-- Purpose: GET /api/saves/ and GET /api/journal/ page with
+-- ORDER BY <timestamp> DESC, id DESC and a (timestamp, id) < cursor filter.
+-- Including id in the index lets each page be a single index range scan,
+-- so response time stays flat however many rows a user has.
+
+-- ============================================
+-- JOURNAL
+-- ============================================
+
+-- Same name and leading columns as before, plus the id tie-breaker
+DROP INDEX IF EXISTS idx_journal_user_date;
+CREATE INDEX idx_journal_user_date ON journal_entries(user_id, eaten_at DESC, id DESC);
+
+-- ============================================
+-- SAVED PLACES
+-- ============================================
+
+-- The listing only shows the default list
+CREATE INDEX idx_saved_places_user_saved_at
+  ON saved_places(user_id, saved_at DESC, id DESC)
+  WHERE list_id IS NULL;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON INDEX idx_journal_user_date IS 'Journal listing in eaten_at order (keyset pagination)';
+COMMENT ON INDEX idx_saved_places_user_saved_at IS 'Default-list saves in saved_at order (keyset pagination)';
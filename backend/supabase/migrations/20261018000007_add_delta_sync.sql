@@ -0,0 +1,105 @@
+-- Migration: Change tracking for delta sync of saves and journal
+-- Purpose: GET /api/sync?since=<cursor> returns only the saves and journal
+-- entries changed since the client's last sync. updated_at (maintained by
+-- trigger) marks inserts and updates; deletes are recorded as tombstones in
+-- sync_tombstones so clients can remove rows they still hold.
+
+-- ============================================
+-- UPDATED_AT COLUMNS
+-- ============================================
+
+ALTER TABLE saved_places ADD COLUMN updated_at TIMESTAMPTZ;
+ALTER TABLE journal_entries ADD COLUMN updated_at TIMESTAMPTZ;
+
+-- Existing rows last changed when they were created
+UPDATE saved_places SET updated_at = COALESCE(saved_at, NOW());
+UPDATE journal_entries SET updated_at = COALESCE(created_at, NOW());
+
+ALTER TABLE saved_places
+  ALTER COLUMN updated_at SET DEFAULT NOW(),
+  ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE journal_entries
+  ALTER COLUMN updated_at SET DEFAULT NOW(),
+  ALTER COLUMN updated_at SET NOT NULL;
+
+-- Reuses update_updated_at() from 20260113000002_add_indexes_and_triggers.sql
+CREATE TRIGGER update_saved_places_updated_at
+  BEFORE UPDATE ON saved_places
+  FOR EACH ROW
+  EXECUTE FUNCTION update_updated_at();
+
+CREATE TRIGGER update_journal_entries_updated_at
+  BEFORE UPDATE ON journal_entries
+  FOR EACH ROW
+  EXECUTE FUNCTION update_updated_at();
+
+CREATE INDEX idx_saved_places_user_updated ON saved_places(user_id, updated_at);
+CREATE INDEX idx_journal_user_updated ON journal_entries(user_id, updated_at);
+
+-- ============================================
+-- TOMBSTONES
+-- ============================================
+
+-- No foreign key on user_id: rows deleted by ON DELETE CASCADE from users
+-- still log tombstones, and those are pruned with everything else
+CREATE TABLE sync_tombstones (
+  id BIGSERIAL PRIMARY KEY,
+  user_id UUID NOT NULL,
+  entity TEXT NOT NULL CHECK (entity IN ('saved_place', 'journal_entry')),
+  entity_id UUID NOT NULL,
+  deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_sync_tombstones_user_deleted ON sync_tombstones(user_id, deleted_at);
+CREATE INDEX idx_sync_tombstones_deleted ON sync_tombstones(deleted_at);
+
+-- Logs OLD.id under the entity name passed as the trigger argument.
+-- SECURITY DEFINER so user-scoped deletes can write despite RLS.
+CREATE OR REPLACE FUNCTION record_sync_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO sync_tombstones (user_id, entity, entity_id)
+  VALUES (OLD.user_id, TG_ARGV[0], OLD.id);
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER saved_places_sync_tombstone
+  AFTER DELETE ON saved_places
+  FOR EACH ROW
+  EXECUTE FUNCTION record_sync_tombstone('saved_place');
+
+CREATE TRIGGER journal_entries_sync_tombstone
+  AFTER DELETE ON journal_entries
+  FOR EACH ROW
+  EXECUTE FUNCTION record_sync_tombstone('journal_entry');
+
+ALTER TABLE sync_tombstones ENABLE ROW LEVEL SECURITY;
+
+-- Users can read their own tombstones
+CREATE POLICY "Users can read own tombstones"
+  ON sync_tombstones FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Drops tombstones older than p_older_than; clients whose cursor predates
+-- the retention window get a full resync instead (see SYNC_TOMBSTONE_RETENTION_DAYS).
+-- Run periodically, e.g. daily with pg_cron.
+CREATE OR REPLACE FUNCTION prune_sync_tombstones(p_older_than INTERVAL DEFAULT INTERVAL '30 days')
+RETURNS INTEGER AS $$
+  WITH deleted AS (
+    DELETE FROM sync_tombstones
+    WHERE deleted_at < NOW() - p_older_than
+    RETURNING 1
+  )
+  SELECT COUNT(*)::INTEGER FROM deleted;
+$$ LANGUAGE sql;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON TABLE sync_tombstones IS 'Deleted saves and journal entries for delta sync';
+COMMENT ON INDEX idx_saved_places_user_updated IS 'Saves changed since a sync cursor';
+COMMENT ON INDEX idx_journal_user_updated IS 'Journal entries changed since a sync cursor';
+COMMENT ON FUNCTION record_sync_tombstone IS 'Log a tombstone for a deleted synced row';
+COMMENT ON FUNCTION prune_sync_tombstones IS 'Delete tombstones past the sync retention window';
@@ -0,0 +1,134 @@
+-- Migration: Full-text search over journal notes and place names
+-- Purpose: GET /api/journal/search?q= ranks a user's entries by how well
+-- the note and the linked place's name match, with trigram matching so
+-- typos ("raman") still find results. Everything is indexed, so search
+-- stays in the milliseconds however many entries a user has.
+
+-- ============================================
+-- SEARCH DOCUMENT
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA extensions;
+
+-- Place names live in places, so a generated column can't see them;
+-- triggers below keep these in sync instead
+ALTER TABLE journal_entries
+  ADD COLUMN search_text TEXT,
+  ADD COLUMN search_vector TSVECTOR;
+
+-- Place name weighted above the note
+CREATE OR REPLACE FUNCTION journal_search_vector(p_place_name TEXT, p_note TEXT)
+RETURNS TSVECTOR AS $$
+  SELECT setweight(to_tsvector('english', coalesce(p_place_name, '')), 'A')
+      || setweight(to_tsvector('english', coalesce(p_note, '')), 'B');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION update_journal_search()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_place_name TEXT;
+BEGIN
+  SELECT name INTO v_place_name FROM places WHERE id = NEW.place_id;
+  NEW.search_text := concat_ws(' ', v_place_name, NEW.note);
+  NEW.search_vector := journal_search_vector(v_place_name, NEW.note);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_journal_entries_search
+  BEFORE INSERT OR UPDATE OF note, place_id ON journal_entries
+  FOR EACH ROW
+  EXECUTE FUNCTION update_journal_search();
+
+-- Renaming a place updates the entries that mention it
+CREATE OR REPLACE FUNCTION update_journal_search_for_place()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE journal_entries
+  SET search_text = concat_ws(' ', NEW.name, note),
+      search_vector = journal_search_vector(NEW.name, note)
+  WHERE place_id = NEW.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_journal_search_on_place_rename
+  AFTER UPDATE OF name ON places
+  FOR EACH ROW
+  WHEN (OLD.name IS DISTINCT FROM NEW.name)
+  EXECUTE FUNCTION update_journal_search_for_place();
+
+-- Backfill without touching updated_at, so delta sync doesn't resend every entry
+ALTER TABLE journal_entries DISABLE TRIGGER update_journal_entries_updated_at;
+UPDATE journal_entries j
+SET search_text = concat_ws(' ', names.place_name, j.note),
+    search_vector = journal_search_vector(names.place_name, j.note)
+FROM (
+  SELECT e.id, p.name AS place_name
+  FROM journal_entries e
+  LEFT JOIN places p ON p.id = e.place_id
+) names
+WHERE names.id = j.id;
+ALTER TABLE journal_entries ENABLE TRIGGER update_journal_entries_updated_at;
+
+CREATE INDEX idx_journal_search_vector ON journal_entries USING GIN (search_vector);
+CREATE INDEX idx_journal_search_trgm ON journal_entries USING GIN (search_text gin_trgm_ops);
+
+-- ============================================
+-- SEARCH RPC
+-- ============================================
+
+-- p_user_id's entries matching p_query, best first. Matches are full-text
+-- (websearch syntax: words, "phrases", -exclusions) or, for typos, trigram
+-- word similarity above pg_trgm.word_similarity_threshold (default 0.6).
+CREATE OR REPLACE FUNCTION search_journal(
+  p_user_id UUID,
+  p_query TEXT,
+  p_limit INTEGER DEFAULT 20,
+  p_offset INTEGER DEFAULT 0
+)
+RETURNS TABLE (
+  id UUID,
+  photo_url TEXT,
+  rating SMALLINT,
+  note TEXT,
+  eaten_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ,
+  place_id UUID,
+  google_place_id TEXT,
+  place_name TEXT,
+  score REAL
+) AS $$
+  WITH q AS (
+    SELECT websearch_to_tsquery('english', p_query) AS tsq
+  )
+  SELECT
+    j.id,
+    j.photo_url,
+    j.rating,
+    j.note,
+    j.eaten_at,
+    j.created_at,
+    j.place_id,
+    p.google_place_id,
+    p.name AS place_name,
+    (ts_rank_cd(j.search_vector, q.tsq) + word_similarity(p_query, j.search_text))::REAL AS score
+  FROM journal_entries j
+  CROSS JOIN q
+  LEFT JOIN places p ON p.id = j.place_id
+  WHERE j.user_id = p_user_id
+    AND (j.search_vector @@ q.tsq OR p_query <% j.search_text)
+  ORDER BY score DESC, j.eaten_at DESC, j.id DESC
+  LIMIT p_limit
+  OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON COLUMN journal_entries.search_text IS 'Place name and note, for trigram matching (trigger-maintained)';
+COMMENT ON COLUMN journal_entries.search_vector IS 'Weighted place name (A) and note (B) tsvector (trigger-maintained)';
+COMMENT ON INDEX idx_journal_search_vector IS 'Full-text journal search';
+COMMENT ON INDEX idx_journal_search_trgm IS 'Typo-tolerant journal search';
+COMMENT ON FUNCTION search_journal IS 'Ranked full-text and trigram search over a user''s journal';
@@ -0,0 +1,240 @@
+-- Migration: Incrementally maintained journal statistics
+-- Purpose: GET /api/journal/stats reads per-user summary rows that
+-- triggers on journal_entries keep current, instead of aggregating every
+-- entry on each request. Cost depends on the number of months, places and
+-- ratings, not on the number of entries.
+
+-- ============================================
+-- SUMMARY TABLES
+-- ============================================
+
+-- No foreign keys: rows are adjusted by triggers fired from ON DELETE
+-- CASCADE / SET NULL on users and places, while the parent row is going
+-- away. Counts drop to zero instead; rebuild_journal_stats() tidies up.
+
+-- Entries per calendar month (UTC) of eaten_at
+CREATE TABLE journal_stats_monthly (
+  user_id UUID NOT NULL,
+  month DATE NOT NULL,
+  entries INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (user_id, month)
+);
+
+-- Entries per rating (unrated entries are not counted)
+CREATE TABLE journal_stats_ratings (
+  user_id UUID NOT NULL,
+  rating SMALLINT NOT NULL CHECK (rating BETWEEN 1 AND 5),
+  entries INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (user_id, rating)
+);
+
+-- Visits and rating totals per place (entries without a place are not counted)
+CREATE TABLE journal_stats_places (
+  user_id UUID NOT NULL,
+  place_id UUID NOT NULL,
+  visits INTEGER NOT NULL DEFAULT 0,
+  rating_sum INTEGER NOT NULL DEFAULT 0,
+  rating_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (user_id, place_id)
+);
+
+-- Most visited places first
+CREATE INDEX idx_journal_stats_places_visits ON journal_stats_places(user_id, visits DESC);
+
+ALTER TABLE journal_stats_monthly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE journal_stats_ratings ENABLE ROW LEVEL SECURITY;
+ALTER TABLE journal_stats_places ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can read own monthly stats"
+  ON journal_stats_monthly FOR SELECT
+  USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can read own rating stats"
+  ON journal_stats_ratings FOR SELECT
+  USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can read own place stats"
+  ON journal_stats_places FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- ============================================
+-- MAINTENANCE TRIGGERS
+-- ============================================
+
+-- Add p_delta (+1 / -1) entries with these attributes to the summaries
+CREATE OR REPLACE FUNCTION apply_journal_stats(
+  p_user_id UUID,
+  p_place_id UUID,
+  p_rating SMALLINT,
+  p_eaten_at TIMESTAMPTZ,
+  p_delta INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+  INSERT INTO journal_stats_monthly (user_id, month, entries)
+  VALUES (p_user_id, date_trunc('month', p_eaten_at AT TIME ZONE 'UTC')::DATE, p_delta)
+  ON CONFLICT (user_id, month)
+  DO UPDATE SET entries = journal_stats_monthly.entries + EXCLUDED.entries;
+
+  IF p_rating IS NOT NULL THEN
+    INSERT INTO journal_stats_ratings (user_id, rating, entries)
+    VALUES (p_user_id, p_rating, p_delta)
+    ON CONFLICT (user_id, rating)
+    DO UPDATE SET entries = journal_stats_ratings.entries + EXCLUDED.entries;
+  END IF;
+
+  IF p_place_id IS NOT NULL THEN
+    INSERT INTO journal_stats_places (user_id, place_id, visits, rating_sum, rating_count)
+    VALUES (
+      p_user_id,
+      p_place_id,
+      p_delta,
+      COALESCE(p_rating, 0) * p_delta,
+      CASE WHEN p_rating IS NULL THEN 0 ELSE p_delta END
+    )
+    ON CONFLICT (user_id, place_id)
+    DO UPDATE SET
+      visits = journal_stats_places.visits + EXCLUDED.visits,
+      rating_sum = journal_stats_places.rating_sum + EXCLUDED.rating_sum,
+      rating_count = journal_stats_places.rating_count + EXCLUDED.rating_count;
+  END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- An update is the old row's removal plus the new row's addition.
+-- eaten_at falls back to created_at so a row always lands in some month.
+-- SECURITY DEFINER so user-scoped writes can update the summaries despite RLS.
+CREATE OR REPLACE FUNCTION update_journal_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_journal_stats(
+      OLD.user_id, OLD.place_id, OLD.rating, COALESCE(OLD.eaten_at, OLD.created_at), -1
+    );
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM apply_journal_stats(
+      NEW.user_id, NEW.place_id, NEW.rating, COALESCE(NEW.eaten_at, NEW.created_at), 1
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER journal_entries_stats_insert_delete
+  AFTER INSERT OR DELETE ON journal_entries
+  FOR EACH ROW
+  EXECUTE FUNCTION update_journal_stats();
+
+-- Notes and search columns change far more often than what's counted
+CREATE TRIGGER journal_entries_stats_update
+  AFTER UPDATE OF place_id, rating, eaten_at ON journal_entries
+  FOR EACH ROW
+  WHEN (
+    OLD.place_id IS DISTINCT FROM NEW.place_id
+    OR OLD.rating IS DISTINCT FROM NEW.rating
+    OR OLD.eaten_at IS DISTINCT FROM NEW.eaten_at
+  )
+  EXECUTE FUNCTION update_journal_stats();
+
+-- ============================================
+-- REBUILD / BACKFILL
+-- ============================================
+
+-- Recompute summaries from journal_entries for one user (NULL = everyone).
+-- Blocks journal writes until the calling transaction ends, so the
+-- result is exact. Also drops rows left at zero by cascaded deletes.
+CREATE OR REPLACE FUNCTION rebuild_journal_stats(p_user_id UUID DEFAULT NULL)
+RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE journal_entries IN SHARE MODE;
+
+  DELETE FROM journal_stats_monthly WHERE p_user_id IS NULL OR user_id = p_user_id;
+  DELETE FROM journal_stats_ratings WHERE p_user_id IS NULL OR user_id = p_user_id;
+  DELETE FROM journal_stats_places WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+  INSERT INTO journal_stats_monthly (user_id, month, entries)
+  SELECT user_id, date_trunc('month', COALESCE(eaten_at, created_at) AT TIME ZONE 'UTC')::DATE, COUNT(*)
+  FROM journal_entries
+  WHERE p_user_id IS NULL OR user_id = p_user_id
+  GROUP BY 1, 2;
+
+  INSERT INTO journal_stats_ratings (user_id, rating, entries)
+  SELECT user_id, rating, COUNT(*)
+  FROM journal_entries
+  WHERE rating IS NOT NULL
+    AND (p_user_id IS NULL OR user_id = p_user_id)
+  GROUP BY 1, 2;
+
+  INSERT INTO journal_stats_places (user_id, place_id, visits, rating_sum, rating_count)
+  SELECT user_id, place_id, COUNT(*), COALESCE(SUM(rating), 0), COUNT(rating)
+  FROM journal_entries
+  WHERE place_id IS NOT NULL
+    AND (p_user_id IS NULL OR user_id = p_user_id)
+  GROUP BY 1, 2;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Backfill existing entries
+SELECT rebuild_journal_stats();
+
+-- ============================================
+-- STATS RPC
+-- ============================================
+
+-- One user's stats as JSON in one round trip:
+--   months  - [{month: 'YYYY-MM', entries}], newest first
+--   ratings - [{rating, entries}] for ratings 1-5, including zeros
+--   places  - top p_place_limit places by visits, with average rating
+CREATE OR REPLACE FUNCTION journal_stats(
+  p_user_id UUID,
+  p_place_limit INTEGER DEFAULT 10
+)
+RETURNS JSONB AS $$
+  SELECT jsonb_build_object(
+    'months', COALESCE((
+      SELECT jsonb_agg(
+        jsonb_build_object('month', to_char(m.month, 'YYYY-MM'), 'entries', m.entries)
+        ORDER BY m.month DESC
+      )
+      FROM journal_stats_monthly m
+      WHERE m.user_id = p_user_id AND m.entries > 0
+    ), '[]'::JSONB),
+    'ratings', (
+      SELECT jsonb_agg(
+        jsonb_build_object('rating', r.rating, 'entries', COALESCE(s.entries, 0))
+        ORDER BY r.rating
+      )
+      FROM generate_series(1, 5) AS r(rating)
+      LEFT JOIN journal_stats_ratings s ON s.user_id = p_user_id AND s.rating = r.rating
+    ),
+    'places', COALESCE((
+      SELECT jsonb_agg(to_jsonb(t) ORDER BY t.visits DESC, t.name)
+      FROM (
+        SELECT
+          sp.place_id,
+          p.google_place_id,
+          p.name,
+          sp.visits,
+          sp.rating_count AS rated_visits,
+          ROUND(sp.rating_sum::NUMERIC / NULLIF(sp.rating_count, 0), 2) AS average_rating
+        FROM journal_stats_places sp
+        JOIN places p ON p.id = sp.place_id
+        WHERE sp.user_id = p_user_id AND sp.visits > 0
+        ORDER BY sp.visits DESC, p.name
+        LIMIT p_place_limit
+      ) t
+    ), '[]'::JSONB)
+  );
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON TABLE journal_stats_monthly IS 'Journal entries per user per month (trigger-maintained)';
+COMMENT ON TABLE journal_stats_ratings IS 'Journal rating histogram per user (trigger-maintained)';
+COMMENT ON TABLE journal_stats_places IS 'Journal visits and ratings per user per place (trigger-maintained)';
+COMMENT ON FUNCTION update_journal_stats IS 'Keep journal summary tables in step with journal_entries';
+COMMENT ON FUNCTION rebuild_journal_stats IS 'Recompute journal summaries from scratch (backfill / repair)';
+COMMENT ON FUNCTION journal_stats IS 'A user''s journal stats as JSON from the summary tables';
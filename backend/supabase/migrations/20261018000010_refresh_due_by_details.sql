@@ -0,0 +1,72 @@
+-- Migration: Count opening-hours staleness in proactive refresh
+-- Purpose: Opening hours (details_fetched_at) go stale after
+-- PLACE_HOURS_TTL_HOURS, long before name and address
+-- (last_fetched_at). places_due_for_refresh only looked at
+-- last_fetched_at, so popular places were served with expired hours
+-- until a user request refreshed them synchronously.
+
+-- ============================================
+-- INDEXES
+-- ============================================
+
+CREATE INDEX idx_places_details_fetched ON places(details_fetched_at);
+
+-- ============================================
+-- REFRESH CANDIDATES
+-- ============================================
+
+-- Return type changes, so drop instead of replace
+DROP FUNCTION IF EXISTS places_due_for_refresh(TIMESTAMPTZ, INTEGER);
+
+-- Places last fetched before p_stale_before, or whose details were fetched
+-- before p_details_stale_before (or never), ranked by popularity: saves
+-- weigh most, then journal entries, then views in the last 30 days. Among
+-- equally popular places the one whose oldest field is oldest goes first.
+-- A NULL p_details_stale_before ignores details, as before.
+-- Places nobody has saved, logged or viewed are left to lazy refresh.
+CREATE OR REPLACE FUNCTION places_due_for_refresh(
+  p_stale_before TIMESTAMPTZ,
+  p_limit INTEGER,
+  p_details_stale_before TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  google_place_id TEXT,
+  last_fetched_at TIMESTAMPTZ,
+  details_fetched_at TIMESTAMPTZ,
+  popularity BIGINT
+) AS $$
+  SELECT *
+  FROM (
+    SELECT
+      p.id,
+      p.google_place_id,
+      p.last_fetched_at,
+      p.details_fetched_at,
+      (SELECT COUNT(*) FROM saved_places s WHERE s.place_id = p.id) * 3
+        + (SELECT COUNT(*) FROM journal_entries j WHERE j.place_id = p.id) * 2
+        + CASE WHEN p.last_viewed_at > NOW() - INTERVAL '30 days' THEN p.view_count ELSE 0 END
+        AS popularity
+    FROM places p
+    WHERE p.last_fetched_at IS NOT NULL
+      AND (
+        p.last_fetched_at < p_stale_before
+        OR (
+          p_details_stale_before IS NOT NULL
+          AND (p.details_fetched_at IS NULL OR p.details_fetched_at < p_details_stale_before)
+        )
+      )
+  ) ranked
+  WHERE ranked.popularity > 0
+  ORDER BY
+    ranked.popularity DESC,
+    LEAST(ranked.last_fetched_at, COALESCE(ranked.details_fetched_at, '-infinity'::TIMESTAMPTZ))
+  LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON INDEX idx_places_details_fetched IS 'Find places whose opening hours are due for refresh';
+COMMENT ON FUNCTION places_due_for_refresh IS 'Popular places nearing staleness (fields or opening hours), hottest first';
@@ -0,0 +1,81 @@
+-- Migration: Match nearby_places queries literally
+-- Purpose: p_query was spliced into an ILIKE pattern as is, so a search
+-- for "100%" or "a_b" used % and _ as wildcards (and "%" alone matched
+-- every cached place, answering the search without Google).
+
+-- ============================================
+-- LIKE ESCAPING
+-- ============================================
+
+-- p_text with LIKE wildcards (and the escape character) escaped, for
+-- building patterns from user input: ILIKE '%' || like_escape(q) || '%'
+CREATE OR REPLACE FUNCTION like_escape(p_text TEXT)
+RETURNS TEXT AS $$
+  SELECT replace(replace(replace(p_text, '\', '\\'), '%', '\%'), '_', '\_');
+$$ LANGUAGE sql IMMUTABLE STRICT;
+
+-- ============================================
+-- NEARBY SEARCH
+-- ============================================
+
+-- Same as migration 20261018000003, except that p_query matches the
+-- name as a literal substring
+CREATE OR REPLACE FUNCTION nearby_places(
+  p_lat DOUBLE PRECISION,
+  p_lng DOUBLE PRECISION,
+  p_radius_m DOUBLE PRECISION,
+  p_types TEXT[] DEFAULT NULL,
+  p_query TEXT DEFAULT NULL,
+  p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+  id UUID,
+  google_place_id TEXT,
+  name TEXT,
+  address TEXT,
+  photo_reference TEXT,
+  types TEXT[],
+  lat DOUBLE PRECISION,
+  lng DOUBLE PRECISION,
+  rating NUMERIC,
+  price_level SMALLINT,
+  user_ratings_total INTEGER,
+  details JSONB,
+  last_fetched_at TIMESTAMPTZ,
+  details_fetched_at TIMESTAMPTZ,
+  distance_m DOUBLE PRECISION
+) AS $$
+  SELECT
+    p.id,
+    p.google_place_id,
+    p.name,
+    p.address,
+    p.photo_reference,
+    p.types,
+    p.lat,
+    p.lng,
+    p.rating,
+    p.price_level,
+    p.user_ratings_total,
+    p.details,
+    p.last_fetched_at,
+    p.details_fetched_at,
+    ST_Distance(p.location, ST_SetSRID(ST_MakePoint(p_lng, p_lat), 4326)::GEOGRAPHY) AS distance_m
+  FROM places p
+  WHERE ST_DWithin(p.location, ST_SetSRID(ST_MakePoint(p_lng, p_lat), 4326)::GEOGRAPHY, p_radius_m)
+    AND (p_types IS NULL OR p.types && p_types)
+    AND (
+      p_query IS NULL
+      OR p.name ILIKE '%' || like_escape(p_query) || '%' ESCAPE '\'
+      OR replace(p_query, ' ', '_') = ANY(p.types)
+    )
+  ORDER BY distance_m
+  LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON FUNCTION like_escape IS 'Escape LIKE wildcards in user input';
+COMMENT ON FUNCTION nearby_places IS 'Cached places within a radius, nearest first, with type and literal name filters';
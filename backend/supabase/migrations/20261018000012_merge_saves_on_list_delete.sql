@@ -0,0 +1,43 @@
+-- Migration: Move a deleted list's saves to the default list without conflicts
+-- Purpose: saved_places.list_id is ON DELETE SET NULL, so deleting a list
+-- moves its saves to the default list. Since 20261018000004 the default
+-- list allows one save per place, so deleting a list that shares a place
+-- with the default list (or another list deleted in the same statement)
+-- failed with a unique violation on idx_saved_places_default_list_unique.
+
+-- ============================================
+-- LIST DELETE TRIGGER
+-- ============================================
+
+-- Does the SET NULL itself, one list at a time, first dropping saves of
+-- places already on the default list. The foreign key action then finds
+-- nothing left to update. Dropped saves log sync tombstones and moved
+-- ones bump updated_at, so delta sync clients see both.
+-- SECURITY DEFINER so user-scoped deletes can move saves despite RLS.
+CREATE OR REPLACE FUNCTION merge_saves_into_default_list()
+RETURNS TRIGGER AS $$
+BEGIN
+  DELETE FROM saved_places s
+  WHERE s.list_id = OLD.id
+    AND EXISTS (
+      SELECT 1 FROM saved_places d
+      WHERE d.user_id = s.user_id
+        AND d.place_id = s.place_id
+        AND d.list_id IS NULL
+    );
+
+  UPDATE saved_places SET list_id = NULL WHERE list_id = OLD.id;
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER lists_merge_saves_into_default
+  BEFORE DELETE ON lists
+  FOR EACH ROW
+  EXECUTE FUNCTION merge_saves_into_default_list();
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON FUNCTION merge_saves_into_default_list IS 'Move a deleted list''s saves to the default list, dropping duplicates';
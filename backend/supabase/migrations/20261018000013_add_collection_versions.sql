@@ -0,0 +1,97 @@
+-- Migration: Shared collection versions for ETags
+-- Purpose: GET /api/saves/, /api/journal/ and /api/users/me derive their
+-- ETags from a per-user version. Versions used to live in each API
+-- process, so with several workers a write handled by one worker left the
+-- others answering 304 (or serving cached lists) until their copy expired.
+-- Triggers now bump a version row on every change, and every worker reads
+-- the same value with a primary key lookup.
+
+-- ============================================
+-- VERSIONS
+-- ============================================
+
+-- No foreign key: rows are bumped by triggers fired from ON DELETE CASCADE
+-- on users, while the user row is going away
+CREATE TABLE collection_versions (
+  user_id UUID NOT NULL,
+  collection TEXT NOT NULL CHECK (collection IN ('saves', 'journal', 'profile')),
+  version BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (user_id, collection)
+);
+
+ALTER TABLE collection_versions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can read own collection versions"
+  ON collection_versions FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- ============================================
+-- BUMP TRIGGERS
+-- ============================================
+
+-- Bumps collection TG_ARGV[0] for the user in column TG_ARGV[1] of the row.
+-- SECURITY DEFINER so user-scoped writes can bump despite RLS.
+CREATE OR REPLACE FUNCTION bump_collection_version()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_row JSONB;
+BEGIN
+  v_row := CASE WHEN TG_OP = 'DELETE' THEN to_jsonb(OLD) ELSE to_jsonb(NEW) END;
+
+  INSERT INTO collection_versions (user_id, collection, version)
+  VALUES ((v_row ->> TG_ARGV[1])::UUID, TG_ARGV[0], 1)
+  ON CONFLICT (user_id, collection)
+  DO UPDATE SET version = collection_versions.version + 1;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER saved_places_bump_collection_version
+  AFTER INSERT OR UPDATE OR DELETE ON saved_places
+  FOR EACH ROW
+  EXECUTE FUNCTION bump_collection_version('saves', 'user_id');
+
+-- Also fires when a place rename rewrites search_text (20261018000008),
+-- so journal ETags change with the place names they show
+CREATE TRIGGER journal_entries_bump_collection_version
+  AFTER INSERT OR UPDATE OR DELETE ON journal_entries
+  FOR EACH ROW
+  EXECUTE FUNCTION bump_collection_version('journal', 'user_id');
+
+CREATE TRIGGER users_bump_collection_version
+  AFTER UPDATE ON users
+  FOR EACH ROW
+  EXECUTE FUNCTION bump_collection_version('profile', 'id');
+
+-- Saves show the place's name, address and photo; a refresh that changes
+-- them bumps the saves version of everyone who saved the place
+CREATE OR REPLACE FUNCTION bump_saves_for_place()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO collection_versions (user_id, collection, version)
+  SELECT DISTINCT s.user_id, 'saves', 1
+  FROM saved_places s
+  WHERE s.place_id = NEW.id
+  ON CONFLICT (user_id, collection)
+  DO UPDATE SET version = collection_versions.version + 1;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER places_bump_saves_version
+  AFTER UPDATE OF name, address, photo_reference ON places
+  FOR EACH ROW
+  WHEN (
+    OLD.name IS DISTINCT FROM NEW.name
+    OR OLD.address IS DISTINCT FROM NEW.address
+    OR OLD.photo_reference IS DISTINCT FROM NEW.photo_reference
+  )
+  EXECUTE FUNCTION bump_saves_for_place();
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON TABLE collection_versions IS 'Per-user change counters behind collection ETags (trigger-maintained)';
+COMMENT ON FUNCTION bump_collection_version IS 'Bump a user''s collection version when one of its rows changes';
+COMMENT ON FUNCTION bump_saves_for_place IS 'Bump the saves version of every user who saved a changed place';
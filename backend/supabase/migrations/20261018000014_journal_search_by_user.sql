@@ -0,0 +1,29 @@
+-- Migration: Scope journal search indexes to the user
+-- Purpose: search_journal filters on user_id, but the GIN indexes from
+-- 20261018000008 index every user's entries. A common word ("noodles")
+-- matched entries across all users, and each match was fetched only to
+-- be discarded by the user_id filter. With user_id as the leading GIN
+-- column (btree_gin), index scans return only the caller's entries.
+
+-- ============================================
+-- COMPOSITE SEARCH INDEXES
+-- ============================================
+
+-- GIN operator classes for scalar types such as UUID
+CREATE EXTENSION IF NOT EXISTS btree_gin WITH SCHEMA extensions;
+
+CREATE INDEX idx_journal_search_user_vector
+  ON journal_entries USING GIN (user_id, search_vector);
+CREATE INDEX idx_journal_search_user_trgm
+  ON journal_entries USING GIN (user_id, search_text gin_trgm_ops);
+
+-- Superseded: the composite indexes serve the same queries
+DROP INDEX IF EXISTS idx_journal_search_vector;
+DROP INDEX IF EXISTS idx_journal_search_trgm;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON INDEX idx_journal_search_user_vector IS 'Full-text journal search within one user''s entries';
+COMMENT ON INDEX idx_journal_search_user_trgm IS 'Typo-tolerant journal search within one user''s entries';
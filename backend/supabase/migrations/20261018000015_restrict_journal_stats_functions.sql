@@ -0,0 +1,21 @@
+-- Migration: Keep journal stats maintenance away from API clients
+-- Purpose: Functions are executable by PUBLIC, and Supabase also grants
+-- anon and authenticated execute on functions in public, so any client
+-- could call these through /rest/v1/rpc:
+--   rebuild_journal_stats() - SECURITY DEFINER; with no argument it locks
+--     journal_entries and recomputes every user's stats
+--   apply_journal_stats()   - adds arbitrary counts to a user's summaries
+-- Only the triggers (which run as the function owner) and the service
+-- role need them.
+
+-- ============================================
+-- PRIVILEGES
+-- ============================================
+
+REVOKE EXECUTE ON FUNCTION rebuild_journal_stats(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rebuild_journal_stats(UUID) TO service_role;
+
+REVOKE EXECUTE ON FUNCTION apply_journal_stats(UUID, UUID, SMALLINT, TIMESTAMPTZ, INTEGER)
+  FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION apply_journal_stats(UUID, UUID, SMALLINT, TIMESTAMPTZ, INTEGER)
+  TO service_role;
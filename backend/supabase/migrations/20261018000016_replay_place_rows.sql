@@ -0,0 +1,54 @@
+-- Migration: Replay outboxed place rows without overwriting newer data
+-- Purpose: Rows that failed to upsert wait in the API's local outbox and
+-- are retried later. By then a search or refresh may have written a
+-- newer copy of the place, and a plain upsert would overwrite it with the
+-- old values and move last_fetched_at back. replay_place_rows applies a
+-- row only when it is newer than what the table holds.
+
+-- ============================================
+-- CONDITIONAL UPSERT
+-- ============================================
+
+-- p_rows: [{"google_place_id": "...", "name": "...", ..., "last_fetched_at": "..."}, ...]
+-- in the shape the write-behind queue builds. Search rows carry no
+-- details_fetched_at and leave an existing details payload in place.
+-- Returns the rows that were inserted or updated; stale rows are skipped.
+CREATE OR REPLACE FUNCTION replay_place_rows(p_rows JSONB)
+RETURNS SETOF places AS $$
+  INSERT INTO places AS p (
+    google_place_id, name, address, photo_reference, types,
+    lat, lng, rating, price_level, user_ratings_total,
+    last_fetched_at, details, details_fetched_at
+  )
+  SELECT
+    r.google_place_id, r.name, r.address, r.photo_reference, r.types,
+    r.lat, r.lng, r.rating, r.price_level, r.user_ratings_total,
+    r.last_fetched_at, r.details, r.details_fetched_at
+  FROM jsonb_array_elements(p_rows) AS e(row)
+  CROSS JOIN LATERAL jsonb_populate_record(NULL::places, e.row) AS r
+  ON CONFLICT (google_place_id) DO UPDATE SET
+    name = EXCLUDED.name,
+    address = EXCLUDED.address,
+    photo_reference = EXCLUDED.photo_reference,
+    types = EXCLUDED.types,
+    lat = EXCLUDED.lat,
+    lng = EXCLUDED.lng,
+    rating = EXCLUDED.rating,
+    price_level = EXCLUDED.price_level,
+    user_ratings_total = EXCLUDED.user_ratings_total,
+    last_fetched_at = EXCLUDED.last_fetched_at,
+    details = CASE
+      WHEN EXCLUDED.details_fetched_at IS NULL THEN p.details
+      ELSE EXCLUDED.details
+    END,
+    details_fetched_at = COALESCE(EXCLUDED.details_fetched_at, p.details_fetched_at)
+  WHERE p.last_fetched_at IS NULL
+    OR p.last_fetched_at < EXCLUDED.last_fetched_at
+  RETURNING p.*;
+$$ LANGUAGE sql;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON FUNCTION replay_place_rows IS 'Upsert outboxed place rows, skipping places with a newer last_fetched_at';
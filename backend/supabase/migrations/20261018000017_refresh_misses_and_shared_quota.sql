@@ -0,0 +1,122 @@
+-- Migration: Skip dead places and share the refresh quota
+-- Purpose: Two problems with the proactive refresh scheduler:
+--   * Places Google no longer knows (NOT_FOUND) were never written back,
+--     so their timestamps stayed stale and places_due_for_refresh picked
+--     them again on every pass, spending quota each time.
+--   * The daily Google quota was counted in each process, so every API
+--     worker running the scheduler (and every restart) got a full budget.
+-- Misses are now recorded in places.not_found_at, and the quota is
+-- claimed from a per-day counter shared by all workers.
+
+-- ============================================
+-- REFRESH MISSES
+-- ============================================
+
+-- Set by the scheduler when Google answers NOT_FOUND for a due place.
+-- A later successful fetch (newer last_fetched_at) supersedes it.
+ALTER TABLE places
+  ADD COLUMN not_found_at TIMESTAMPTZ;
+
+-- Same signature, so replace in place
+-- A place missed since p_stale_before is skipped until its miss is older
+-- than that (then it is tried again, in case Google's answer changed)
+CREATE OR REPLACE FUNCTION places_due_for_refresh(
+  p_stale_before TIMESTAMPTZ,
+  p_limit INTEGER,
+  p_details_stale_before TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  google_place_id TEXT,
+  last_fetched_at TIMESTAMPTZ,
+  details_fetched_at TIMESTAMPTZ,
+  popularity BIGINT
+) AS $$
+  SELECT *
+  FROM (
+    SELECT
+      p.id,
+      p.google_place_id,
+      p.last_fetched_at,
+      p.details_fetched_at,
+      (SELECT COUNT(*) FROM saved_places s WHERE s.place_id = p.id) * 3
+        + (SELECT COUNT(*) FROM journal_entries j WHERE j.place_id = p.id) * 2
+        + CASE WHEN p.last_viewed_at > NOW() - INTERVAL '30 days' THEN p.view_count ELSE 0 END
+        AS popularity
+    FROM places p
+    WHERE p.last_fetched_at IS NOT NULL
+      AND (
+        p.last_fetched_at < p_stale_before
+        OR (
+          p_details_stale_before IS NOT NULL
+          AND (p.details_fetched_at IS NULL OR p.details_fetched_at < p_details_stale_before)
+        )
+      )
+      AND (
+        p.not_found_at IS NULL
+        OR p.not_found_at < p_stale_before
+        OR p.not_found_at < p.last_fetched_at
+      )
+  ) ranked
+  WHERE ranked.popularity > 0
+  ORDER BY
+    ranked.popularity DESC,
+    LEAST(ranked.last_fetched_at, COALESCE(ranked.details_fetched_at, '-infinity'::TIMESTAMPTZ))
+  LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- SHARED DAILY QUOTA
+-- ============================================
+
+CREATE TABLE place_refresh_quota (
+  day DATE PRIMARY KEY,
+  used INTEGER NOT NULL DEFAULT 0
+);
+
+-- No policies: only the service role touches it
+ALTER TABLE place_refresh_quota ENABLE ROW LEVEL SECURITY;
+
+-- Claim up to p_requested Google calls from today's (UTC) quota of
+-- p_daily_quota. The row lock makes concurrent claims from several
+-- workers add up to at most p_daily_quota.
+-- Returns the calls granted and today's total use after the claim.
+CREATE OR REPLACE FUNCTION claim_place_refresh_quota(p_requested INTEGER, p_daily_quota INTEGER)
+RETURNS TABLE (granted INTEGER, used INTEGER) AS $$
+DECLARE
+  v_day DATE := (NOW() AT TIME ZONE 'UTC')::DATE;
+  v_used INTEGER;
+  v_granted INTEGER;
+BEGIN
+  INSERT INTO place_refresh_quota (day) VALUES (v_day)
+  ON CONFLICT (day) DO NOTHING;
+
+  SELECT q.used INTO v_used
+  FROM place_refresh_quota q
+  WHERE q.day = v_day
+  FOR UPDATE;
+
+  v_granted := LEAST(GREATEST(p_requested, 0), GREATEST(p_daily_quota - v_used, 0));
+
+  UPDATE place_refresh_quota q
+  SET used = q.used + v_granted
+  WHERE q.day = v_day;
+
+  RETURN QUERY SELECT v_granted, v_used + v_granted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- PRIVILEGES
+-- ============================================
+
+REVOKE EXECUTE ON FUNCTION claim_place_refresh_quota(INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION claim_place_refresh_quota(INTEGER, INTEGER) TO service_role;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON COLUMN places.not_found_at IS 'When a scheduled refresh last got NOT_FOUND from Google; skipped by places_due_for_refresh';
+COMMENT ON TABLE place_refresh_quota IS 'Google calls spent by the refresh scheduler per UTC day, across all workers';
+COMMENT ON FUNCTION claim_place_refresh_quota IS 'Atomically claim refresh calls from today''s shared quota';
@@ -0,0 +1,43 @@
+-- Migration: Shared picker sessions
+-- Purpose: Picker sessions (POST /api/picker/sessions) were held in the
+-- memory of the API process that created them. With several workers, a
+-- follow-up page request routed to another worker got 404. Sessions now
+-- live in this table so every worker sees the same candidates and cursor.
+
+-- ============================================
+-- SESSIONS
+-- ============================================
+
+-- candidates: ranked Google results; the first `served` have been sent
+-- to the client and keep their order.
+-- version: bumped on every write; writers update only the version they
+-- read and re-read on a mismatch, so concurrent page requests and
+-- prefetches from different workers don't overwrite each other.
+CREATE TABLE picker_sessions (
+  id TEXT PRIMARY KEY,
+  user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  query TEXT NOT NULL,
+  lat DOUBLE PRECISION NOT NULL,
+  lng DOUBLE PRECISION NOT NULL,
+  radius INTEGER NOT NULL,
+  price_level SMALLINT,
+  candidates JSONB NOT NULL DEFAULT '[]'::JSONB,
+  served INTEGER NOT NULL DEFAULT 0,
+  next_page_token TEXT,
+  pages INTEGER NOT NULL DEFAULT 0,
+  version INTEGER NOT NULL DEFAULT 0,
+  expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- Purging expired sessions
+CREATE INDEX idx_picker_sessions_expires ON picker_sessions(expires_at);
+
+-- No policies: only the API (service role) reads and writes sessions
+ALTER TABLE picker_sessions ENABLE ROW LEVEL SECURITY;
+
+-- ============================================
+-- COMMENTS FOR DOCUMENTATION
+-- ============================================
+
+COMMENT ON TABLE picker_sessions IS 'Swipe sessions over ranked search results, shared by all API workers';
+COMMENT ON COLUMN picker_sessions.version IS 'Optimistic concurrency counter, bumped on every write';
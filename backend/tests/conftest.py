@@ -0,0 +1,95 @@
+"""
+Shared test setup
+Configures a throwaway environment before any app module is imported
+"""
+
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="noms-tests-")
+
+# Module-level settings are read at import time, so set them first
+os.environ.setdefault("SUPABASE_URL", "http://supabase.test")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test-service-key")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-jwt-secret")
+os.environ.setdefault("GOOGLE_PLACES_API_KEY", "test-google-key")
+os.environ.setdefault("PLACE_OUTBOX_PATH", os.path.join(_tmp, "place_outbox.sqlite3"))
+os.environ.setdefault("PHOTO_CACHE_DIR", os.path.join(_tmp, "photos"))
+os.environ.setdefault("PLACE_REFRESH_IN_APP", "false")
+
+import sys
+import warnings
+
+import httpx
+import pytest
+
+from app.auth import get_current_user
+from app.db import get_db
+
+with warnings.catch_warnings():
+    # main.py registers its startup and shutdown hooks with on_event
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from app.main import app
+
+from app.services import collection_cache as collection_cache_module
+from app.services import places as places_module
+from app.services import place_cache as place_cache_module
+from app.services import place_writer as place_writer_module
+from app.services import search_cache as search_cache_module
+from tests.fakes import FakeDB
+
+# Subject of the token the api fixture authenticates with
+USER_ID = "5f0c1d2e-3a4b-4c5d-8e6f-7a8b9c0d1e2f"
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """FakeDB patched in wherever get_db is imported."""
+    db = FakeDB()
+    for name, module in list(sys.modules.items()):
+        if name.startswith("app") and getattr(module, "get_db", None) is get_db:
+            monkeypatch.setattr(module, "get_db", lambda: db)
+    return db
+
+
+@pytest.fixture(autouse=True)
+def reset_singletons(monkeypatch):
+    """Every test starts with empty in-process caches."""
+    monkeypatch.setattr(place_cache_module, "_place_cache", None)
+    monkeypatch.setattr(place_writer_module, "_place_writer", None)
+    monkeypatch.setattr(search_cache_module, "_search_cache", None)
+    monkeypatch.setattr(places_module, "_places_service", None)
+    monkeypatch.setattr(collection_cache_module, "_collection_cache", None)
+    yield
+
+
+@pytest.fixture
+def google():
+    """
+    GooglePlacesService whose HTTP client is served by google.handler.
+
+    Set google.handler to a function (httpx.Request -> httpx.Response);
+    requests made are collected in google.requests.
+    """
+    service = places_module.GooglePlacesService()
+    service.requests = []
+
+    def dispatch(request: httpx.Request) -> httpx.Response:
+        service.requests.append(request)
+        return service.handler(request)
+
+    service.handler = lambda request: httpx.Response(404)
+    service.client = httpx.AsyncClient(
+        base_url=places_module.PLACES_API_URL,
+        transport=httpx.MockTransport(dispatch),
+    )
+    return service
+
+
+@pytest.fixture
+async def api():
+    """HTTP client for the app, authenticated as USER_ID (startup hooks not run)."""
+    app.dependency_overrides[get_current_user] = lambda: {"sub": USER_ID}
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
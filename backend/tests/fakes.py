@@ -0,0 +1,71 @@
+"""
+In-memory stand-ins for the PostgREST client
+"""
+
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+
+class FakeQuery:
+    """
+    Chainable query that records every builder call.
+
+    Any builder method (select, eq, in_, or_, upsert, order, ...) is
+    recorded in ops and returns the query; execute() asks the owning
+    FakeDB for the rows.
+    """
+
+    def __init__(self, db: "FakeDB", target: str, kind: str):
+        self.db = db
+        self.target = target
+        self.kind = kind
+        self.ops: list[tuple] = []
+
+    def __getattr__(self, name: str):
+        def op(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+        return op
+
+    def op(self, name: str) -> Optional[tuple]:
+        """Arguments of the first call to a builder method, if any."""
+        for op_name, args, kwargs in self.ops:
+            if op_name == name:
+                return args
+        return None
+
+    async def execute(self):
+        self.db.calls.append(self)
+        if self.db.error is not None:
+            raise self.db.error
+        return SimpleNamespace(data=self.db.handler(self))
+
+
+class FakeDB:
+    """
+    Async PostgREST client double.
+
+    handler(query) returns the rows for each executed query; executed
+    queries are kept in calls. Set error to make every call raise.
+    """
+
+    def __init__(self, handler: Optional[Callable[[FakeQuery], list]] = None):
+        self.handler = handler or (lambda query: [])
+        self.calls: list[FakeQuery] = []
+        self.error: Optional[Exception] = None
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name, "table")
+
+    def rpc(self, name: str, params: dict) -> FakeQuery:
+        query = FakeQuery(self, name, "rpc")
+        query.params = params
+        return query
+
+
+def echo_upserts(query: FakeQuery) -> list:
+    """Handler answering upserts like RETURNING * (ids derived from the key)."""
+    upsert = query.op("upsert")
+    if upsert is None:
+        return []
+    return [{**row, "id": f"id-{row['google_place_id']}"} for row in upsert[0]]
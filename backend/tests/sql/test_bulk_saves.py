@@ -0,0 +1,68 @@
+import uuid
+
+from tests.sql.conftest import make_list, make_place, make_user, require_function
+
+
+def save(cur, user_id, google_place_id, list_id=None) -> str:
+    cur.execute("SELECT id FROM save_place(%s, %s, %s)", (user_id, google_place_id, list_id))
+    return str(cur.fetchone()["id"])
+
+
+def bulk_save(cur, user_id, google_place_ids, list_id=None):
+    cur.execute("SELECT * FROM save_places_bulk(%s, %s, %s)", (user_id, google_place_ids, list_id))
+    return {row["google_place_id"]: row["status"] for row in cur.fetchall()}
+
+
+def move(cur, user_id, save_ids, list_id=None):
+    cur.execute("SELECT * FROM move_saved_places(%s, %s::UUID[], %s)", (user_id, save_ids, list_id))
+    return {str(row["save_id"]): row["status"] for row in cur.fetchall()}
+
+
+def test_save_places_bulk(cur):
+    require_function(cur, "save_places_bulk")
+    user_id = make_user(cur)
+    make_place(cur, google_place_id="ChIJa")
+    make_place(cur, google_place_id="ChIJb")
+    save(cur, user_id, "ChIJb")
+
+    assert bulk_save(cur, user_id, ["ChIJa", "ChIJb", "ChIJmissing", "ChIJa"]) == {
+        "ChIJa": "created",
+        "ChIJb": "exists",
+        "ChIJmissing": "not_found",
+    }
+    assert bulk_save(cur, user_id, ["ChIJa"]) == {"ChIJa": "exists"}
+
+
+def test_move_saved_places(cur):
+    require_function(cur, "move_saved_places")
+    user_id = make_user(cur)
+    other_user = make_user(cur)
+    for google_place_id in ("ChIJa", "ChIJb"):
+        make_place(cur, google_place_id=google_place_id)
+    list_a = make_list(cur, user_id, "A")
+    list_b = make_list(cur, user_id, "B")
+
+    to_move = save(cur, user_id, "ChIJa", list_a)
+    already_there = save(cur, user_id, "ChIJb", list_b)
+    # Same place in both lists: moving the A copy to B would duplicate it
+    clash = save(cur, user_id, "ChIJb", list_a)
+    someone_elses = save(cur, other_user, "ChIJa")
+    missing = str(uuid.uuid4())
+
+    assert move(cur, user_id, [to_move, already_there, clash, someone_elses, missing], list_b) == {
+        to_move: "moved",
+        already_there: "unchanged",
+        clash: "conflict",
+        someone_elses: "not_found",
+        missing: "not_found",
+    }
+
+
+def test_move_two_saves_of_one_place(cur):
+    require_function(cur, "move_saved_places")
+    user_id = make_user(cur)
+    make_place(cur, google_place_id="ChIJa")
+    saves = [save(cur, user_id, "ChIJa", make_list(cur, user_id, name)) for name in "AB"]
+
+    # Only one of them can land on the default list
+    assert sorted(move(cur, user_id, saves).values()) == ["conflict", "moved"]
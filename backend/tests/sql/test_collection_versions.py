@@ -0,0 +1,54 @@
+import pytest
+
+from tests.sql.conftest import as_role, make_place, make_user
+
+
+@pytest.fixture
+def versions(cur):
+    cur.execute("SELECT to_regclass('collection_versions') IS NOT NULL AS present")
+    if not cur.fetchone()["present"]:
+        pytest.skip("collection_versions is not installed")
+
+    def read(user_id):
+        cur.execute("SELECT collection, version FROM collection_versions WHERE user_id = %s", (user_id,))
+        return {row["collection"]: row["version"] for row in cur.fetchall()}
+    return read
+
+
+def test_changes_bump_their_collection(cur, versions):
+    user_id = make_user(cur)
+    place_id = make_place(cur)
+    assert versions(user_id) == {}
+
+    cur.execute("INSERT INTO saved_places (user_id, place_id) VALUES (%s, %s) RETURNING id", (user_id, place_id))
+    save_id = cur.fetchone()["id"]
+    cur.execute("INSERT INTO journal_entries (user_id, photo_url) VALUES (%s, 'x.jpg')", (user_id,))
+    cur.execute("DELETE FROM saved_places WHERE id = %s", (save_id,))
+    cur.execute("UPDATE users SET updated_at = now() WHERE id = %s", (user_id,))
+
+    assert versions(user_id) == {"saves": 2, "journal": 1, "profile": 1}
+
+
+def test_place_changes_bump_savers_and_journals(cur, versions):
+    saver, logger, bystander = make_user(cur), make_user(cur), make_user(cur)
+    place_id = make_place(cur, "Ramen")
+    cur.execute("INSERT INTO saved_places (user_id, place_id) VALUES (%s, %s)", (saver, place_id))
+    cur.execute("INSERT INTO journal_entries (user_id, photo_url, place_id) VALUES (%s, 'x.jpg', %s)", (logger, place_id))
+
+    cur.execute("UPDATE places SET last_fetched_at = now() WHERE id = %s", (place_id,))
+    assert versions(saver) == {"saves": 1}
+
+    cur.execute("UPDATE places SET name = 'Ramen Bar' WHERE id = %s", (place_id,))
+    assert versions(saver) == {"saves": 2}
+    assert versions(logger) == {"journal": 2}
+    assert versions(bystander) == {}
+
+
+def test_users_read_only_their_versions(cur, versions):
+    user_id, other_user = make_user(cur), make_user(cur)
+    for owner in (user_id, other_user):
+        cur.execute("INSERT INTO journal_entries (user_id, photo_url) VALUES (%s, 'x.jpg')", (owner,))
+
+    as_role(cur, "authenticated", user_id)
+    cur.execute("SELECT user_id::TEXT FROM collection_versions")
+    assert [row["user_id"] for row in cur.fetchall()] == [user_id]
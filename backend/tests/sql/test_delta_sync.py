@@ -0,0 +1,71 @@
+from tests.sql.conftest import as_role, make_list, make_place, make_user, require_function
+
+
+def save(cur, user_id, place_id):
+    cur.execute(
+        "INSERT INTO saved_places (user_id, place_id) VALUES (%s, %s) RETURNING id",
+        (user_id, place_id),
+    )
+    return cur.fetchone()
+
+
+def tombstones(cur, user_id):
+    cur.execute(
+        "SELECT entity, entity_id::TEXT FROM sync_tombstones WHERE user_id = %s ORDER BY id",
+        (user_id,),
+    )
+    return [(row["entity"], row["entity_id"]) for row in cur.fetchall()]
+
+
+def test_updates_bump_updated_at(cur):
+    user_id = make_user(cur)
+    row = save(cur, user_id, make_place(cur))
+    cur.execute("UPDATE saved_places SET updated_at = now() - interval '1 day' WHERE id = %s", (row["id"],))
+
+    cur.execute(
+        "UPDATE saved_places SET list_id = %s WHERE id = %s RETURNING updated_at = now() AS bumped",
+        (make_list(cur, user_id), row["id"]),
+    )
+    assert cur.fetchone()["bumped"] is True
+
+
+def test_deletes_leave_tombstones(cur):
+    user_id = make_user(cur)
+    save_id = str(save(cur, user_id, make_place(cur))["id"])
+    cur.execute("INSERT INTO journal_entries (user_id, photo_url) VALUES (%s, 'x.jpg') RETURNING id", (user_id,))
+    entry_id = str(cur.fetchone()["id"])
+
+    cur.execute("DELETE FROM saved_places WHERE id = %s", (save_id,))
+    cur.execute("DELETE FROM journal_entries WHERE id = %s", (entry_id,))
+
+    assert tombstones(cur, user_id) == [("saved_place", save_id), ("journal_entry", entry_id)]
+
+
+def test_user_deletes_own_save_under_rls(cur):
+    user_id = make_user(cur)
+    other_user = make_user(cur)
+    save_id = str(save(cur, user_id, make_place(cur))["id"])
+    save(cur, other_user, make_place(cur))
+
+    as_role(cur, "authenticated", user_id)
+    cur.execute("DELETE FROM saved_places WHERE id = %s", (save_id,))
+    # Only the user's own tombstones are visible
+    cur.execute("SELECT entity_id::TEXT FROM sync_tombstones")
+    assert [row["entity_id"] for row in cur.fetchall()] == [save_id]
+
+
+def test_prune_sync_tombstones(cur):
+    require_function(cur, "prune_sync_tombstones")
+    user_id = make_user(cur)
+    save_id = str(save(cur, user_id, make_place(cur))["id"])
+    cur.execute("DELETE FROM saved_places WHERE id = %s", (save_id,))
+    cur.execute(
+        "INSERT INTO sync_tombstones (user_id, entity, entity_id, deleted_at) "
+        "VALUES (%s, 'saved_place', gen_random_uuid(), now() - interval '40 days')",
+        (user_id,),
+    )
+
+    cur.execute("SELECT prune_sync_tombstones() AS pruned")
+
+    assert cur.fetchone()["pruned"] >= 1
+    assert tombstones(cur, user_id) == [("saved_place", save_id)]
@@ -0,0 +1,68 @@
+from tests.sql.conftest import make_place, make_user, require_function
+
+
+def add_entry(cur, user_id, note, place_id=None):
+    cur.execute(
+        "INSERT INTO journal_entries (user_id, photo_url, note, place_id) VALUES (%s, 'x.jpg', %s, %s) RETURNING id",
+        (user_id, note, place_id),
+    )
+    return str(cur.fetchone()["id"])
+
+
+def search(cur, user_id, query, limit=20, offset=0):
+    cur.execute("SELECT * FROM search_journal(%s, %s, %s, %s)", (user_id, query, limit, offset))
+    return [str(row["id"]) for row in cur.fetchall()]
+
+
+def test_search_matches_notes_and_place_names(cur):
+    require_function(cur, "search_journal")
+    user_id = make_user(cur)
+    by_name = add_entry(cur, user_id, "great broth", make_place(cur, "Ramen Nagi"))
+    by_note = add_entry(cur, user_id, "best ramen in town")
+    add_entry(cur, user_id, "pizza night")
+
+    # Place name (weight A) ranks above the note (weight B)
+    assert search(cur, user_id, "ramen") == [by_name, by_note]
+    assert search(cur, user_id, "ramen -broth") == [by_note]
+    # Typo tolerance through trigram similarity (both score the same)
+    assert set(search(cur, user_id, "ramn")) == {by_name, by_note}
+
+
+def test_search_is_per_user(cur):
+    require_function(cur, "search_journal")
+    user_id, other_user = make_user(cur), make_user(cur)
+    mine = add_entry(cur, user_id, "noodles")
+    add_entry(cur, other_user, "noodles")
+
+    assert search(cur, user_id, "noodles") == [mine]
+
+
+def test_renaming_a_place_updates_search(cur):
+    require_function(cur, "search_journal")
+    user_id = make_user(cur)
+    place_id = make_place(cur, "Old Name")
+    entry_id = add_entry(cur, user_id, None, place_id)
+
+    cur.execute("UPDATE places SET name = 'Laksa House' WHERE id = %s", (place_id,))
+
+    assert search(cur, user_id, "laksa") == [entry_id]
+    assert search(cur, user_id, "old name") == []
+
+
+def test_search_pages_with_offset(cur):
+    require_function(cur, "search_journal")
+    user_id = make_user(cur)
+    for _ in range(3):
+        add_entry(cur, user_id, "dumplings")
+
+    everything = search(cur, user_id, "dumplings")
+    assert search(cur, user_id, "dumplings", limit=2) + search(cur, user_id, "dumplings", limit=2, offset=2) == everything
+
+
+def test_search_indexes_lead_with_user(cur):
+    cur.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = 'journal_entries' AND indexname LIKE 'idx_journal_search%%'"
+    )
+    definitions = [row["indexdef"] for row in cur.fetchall()]
+    assert definitions
+    assert all("(user_id, search_" in definition for definition in definitions)
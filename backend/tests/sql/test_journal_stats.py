@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+import psycopg2
+import pytest
+
+from tests.sql.conftest import as_role, make_place, make_user, require_function
+
+OCTOBER = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+SEPTEMBER = datetime(2026, 9, 30, 23, 0, tzinfo=timezone.utc)
+
+
+def add_entry(cur, user_id, rating=None, place_id=None, eaten_at=OCTOBER):
+    cur.execute(
+        "INSERT INTO journal_entries (user_id, photo_url, rating, place_id, eaten_at) "
+        "VALUES (%s, 'x.jpg', %s, %s, %s) RETURNING id",
+        (user_id, rating, place_id, eaten_at),
+    )
+    return str(cur.fetchone()["id"])
+
+
+def stats(cur, user_id):
+    cur.execute("SELECT journal_stats(%s) AS stats", (user_id,))
+    return cur.fetchone()["stats"]
+
+
+def test_stats_follow_inserts_updates_and_deletes(cur):
+    require_function(cur, "journal_stats")
+    user_id = make_user(cur)
+    place_id = make_place(cur, "Ramen")
+    first = add_entry(cur, user_id, 5, place_id)
+    add_entry(cur, user_id, 3, place_id, SEPTEMBER)
+    add_entry(cur, user_id)
+
+    result = stats(cur, user_id)
+    assert result["months"] == [{"month": "2026-10", "entries": 2}, {"month": "2026-09", "entries": 1}]
+    assert [r["entries"] for r in result["ratings"]] == [0, 0, 1, 0, 1]
+    [place] = result["places"]
+    assert (place["visits"], place["rated_visits"], float(place["average_rating"])) == (2, 2, 4.0)
+
+    cur.execute("UPDATE journal_entries SET rating = 1 WHERE id = %s", (first,))
+    cur.execute("DELETE FROM journal_entries WHERE eaten_at = %s", (SEPTEMBER,))
+
+    result = stats(cur, user_id)
+    assert result["months"] == [{"month": "2026-10", "entries": 2}]
+    assert [r["entries"] for r in result["ratings"]] == [1, 0, 0, 0, 0]
+    assert float(result["places"][0]["average_rating"]) == 1.0
+
+
+def test_rebuild_matches_triggers(cur):
+    require_function(cur, "rebuild_journal_stats")
+    user_id = make_user(cur)
+    place_id = make_place(cur)
+    add_entry(cur, user_id, 4, place_id)
+    add_entry(cur, user_id, None, place_id, SEPTEMBER)
+    expected = stats(cur, user_id)
+
+    cur.execute("UPDATE journal_stats_places SET visits = 99 WHERE user_id = %s", (user_id,))
+    cur.execute("SELECT rebuild_journal_stats(%s)", (user_id,))
+
+    assert stats(cur, user_id) == expected
+
+
+def test_users_see_only_their_stats(cur):
+    require_function(cur, "journal_stats")
+    user_id, other_user = make_user(cur), make_user(cur)
+    add_entry(cur, other_user, 5)
+
+    as_role(cur, "authenticated", user_id)
+    assert stats(cur, other_user)["months"] == []
+    # Their own writes still update the summaries through the triggers
+    add_entry(cur, user_id, 2)
+    assert stats(cur, user_id)["months"] == [{"month": "2026-10", "entries": 1}]
+
+
+@pytest.mark.parametrize("role", ["anon", "authenticated"])
+@pytest.mark.parametrize("call", [
+    "SELECT rebuild_journal_stats()",
+    "SELECT apply_journal_stats(gen_random_uuid(), NULL, 5::SMALLINT, now(), 100)",
+])
+def test_maintenance_functions_not_callable_by_clients(cur, role, call):
+    require_function(cur, "rebuild_journal_stats")
+    as_role(cur, role, make_user(cur))
+    with pytest.raises(psycopg2.errors.InsufficientPrivilege):
+        cur.execute(call)
+
+
+def test_maintenance_functions_callable_by_service_role(cur):
+    require_function(cur, "rebuild_journal_stats")
+    as_role(cur, "service_role")
+    cur.execute("SELECT rebuild_journal_stats(gen_random_uuid())")
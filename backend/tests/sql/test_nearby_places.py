@@ -0,0 +1,44 @@
+from tests.sql.conftest import make_place, require_function
+
+
+def test_like_escape(cur):
+    cur.execute(
+        "SELECT like_escape(%s) AS escaped, %s ILIKE '%%' || like_escape(%s) || '%%' AS matches",
+        ("50%_off\\", "Get 50% off", "50%"),
+    )
+    row = cur.fetchone()
+    assert row["escaped"] == "50\\%\\_off\\\\"
+    assert row["matches"] is True
+
+    cur.execute("SELECT 'abc' ILIKE '%%' || like_escape('_') || '%%' AS matches")
+    assert cur.fetchone()["matches"] is False
+
+
+def nearby(cur, query):
+    cur.execute(
+        "SELECT name FROM nearby_places(1.3, 103.8, 1000, ARRAY['restaurant'], %s) ORDER BY name",
+        (query,),
+    )
+    return [row["name"] for row in cur.fetchall()]
+
+
+def test_nearby_places_filters_by_distance_type_and_name(cur):
+    require_function(cur, "nearby_places")
+    make_place(cur, "Ramen Bar", lat=1.3, lng=103.8, types=["restaurant"])
+    make_place(cur, "Thai Corner", lat=1.3001, lng=103.8, types=["restaurant", "thai_food"])
+    make_place(cur, "Far Ramen", lat=1.4, lng=103.8, types=["restaurant"])
+    make_place(cur, "Ramen Shop", lat=1.3, lng=103.8, types=["store"])
+
+    assert nearby(cur, "ramen") == ["Ramen Bar"]
+    assert nearby(cur, "thai food") == ["Thai Corner"]
+    assert nearby(cur, None) == ["Ramen Bar", "Thai Corner"]
+
+
+def test_nearby_places_query_is_literal(cur):
+    require_function(cur, "nearby_places")
+    make_place(cur, "100% Burger", lat=1.3, lng=103.8, types=["restaurant"])
+    make_place(cur, "Burger Joint", lat=1.3, lng=103.8, types=["restaurant"])
+
+    assert nearby(cur, "%") == ["100% Burger"]
+    assert nearby(cur, "_") == []
+    assert nearby(cur, "burger") == ["100% Burger", "Burger Joint"]
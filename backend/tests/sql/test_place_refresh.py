@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+
+from tests.sql.conftest import make_place, make_user, require_function
+
+NOW = datetime.now(timezone.utc)
+LONG_AGO = NOW - timedelta(days=365)
+
+
+def due(cur, details_stale_before="NOW() - INTERVAL '22 hours'"):
+    cur.execute(
+        f"SELECT google_place_id FROM places_due_for_refresh(NOW() - INTERVAL '6 days', 10, {details_stale_before})"
+    )
+    return [row["google_place_id"] for row in cur.fetchall()]
+
+
+def test_record_place_views(cur):
+    make_place(cur, google_place_id="ChIJviews")
+
+    cur.execute("SELECT record_place_views(%s)", ('{"ChIJviews": 3}',))
+    cur.execute("SELECT record_place_views(%s)", ('{"ChIJviews": 2, "ChIJunknown": 1}',))
+
+    cur.execute("SELECT view_count, last_viewed_at FROM places WHERE google_place_id = 'ChIJviews'")
+    row = cur.fetchone()
+    assert row["view_count"] == 5
+    assert row["last_viewed_at"] is not None
+
+
+def test_due_places_ranked_by_popularity(cur):
+    require_function(cur, "places_due_for_refresh")
+    cur.execute("DELETE FROM places")
+    user_id = make_user(cur)
+    saved = make_place(cur, google_place_id="ChIJsaved", last_fetched_at=LONG_AGO, details_fetched_at=LONG_AGO)
+    make_place(cur, google_place_id="ChIJviewed", last_fetched_at=LONG_AGO,
+               view_count=1, last_viewed_at=NOW)
+    make_place(cur, google_place_id="ChIJfresh", last_fetched_at=NOW, details_fetched_at=NOW,
+               view_count=100, last_viewed_at=NOW)
+    make_place(cur, google_place_id="ChIJunpopular", last_fetched_at=LONG_AGO)
+    cur.execute("INSERT INTO saved_places (user_id, place_id) VALUES (%s, %s)", (user_id, saved))
+
+    assert due(cur) == ["ChIJsaved", "ChIJviewed"]
+
+
+def test_due_places_include_expired_opening_hours(cur):
+    require_function(cur, "places_due_for_refresh")
+    cur.execute("DELETE FROM places")
+    popular = {"view_count": 1, "last_viewed_at": NOW}
+    make_place(cur, google_place_id="ChIJhours", last_fetched_at=NOW,
+               details_fetched_at=NOW - timedelta(hours=23), **popular)
+    make_place(cur, google_place_id="ChIJnodetails", last_fetched_at=NOW, **popular)
+    make_place(cur, google_place_id="ChIJfresh", last_fetched_at=NOW, details_fetched_at=NOW, **popular)
+
+    assert due(cur) == ["ChIJnodetails", "ChIJhours"]
+    # Without a details cutoff only last_fetched_at counts
+    assert due(cur, "NULL") == []
+
+
+def test_due_places_skip_recent_misses(cur):
+    require_function(cur, "places_due_for_refresh")
+    cur.execute("DELETE FROM places")
+    popular = {"view_count": 1, "last_viewed_at": NOW, "last_fetched_at": LONG_AGO}
+    make_place(cur, google_place_id="ChIJgone", not_found_at=NOW, **popular)
+    make_place(cur, google_place_id="ChIJoldmiss", not_found_at=LONG_AGO - timedelta(days=1), **popular)
+    make_place(cur, google_place_id="ChIJdue", **popular)
+
+    assert set(due(cur)) == {"ChIJoldmiss", "ChIJdue"}
+
+
+def claim(cur, requested, daily_quota):
+    cur.execute("SELECT * FROM claim_place_refresh_quota(%s, %s)", (requested, daily_quota))
+    return dict(cur.fetchone())
+
+
+def test_claim_place_refresh_quota(cur):
+    require_function(cur, "claim_place_refresh_quota")
+    cur.execute("DELETE FROM place_refresh_quota")
+
+    assert claim(cur, 3, 5) == {"granted": 3, "used": 3}
+    assert claim(cur, 3, 5) == {"granted": 2, "used": 5}
+    assert claim(cur, 3, 5) == {"granted": 0, "used": 5}
@@ -0,0 +1,55 @@
+from psycopg2.extras import Json
+
+from tests.sql.conftest import make_place, require_function
+
+
+def replay(cur, *rows):
+    cur.execute("SELECT * FROM replay_place_rows(%s)", (Json(list(rows)),))
+    return cur.fetchall()
+
+
+def place(cur, google_place_id):
+    cur.execute(
+        "SELECT name, last_fetched_at::TEXT, details, details_fetched_at::TEXT FROM places WHERE google_place_id = %s",
+        (google_place_id,),
+    )
+    return cur.fetchone()
+
+
+def test_replay_inserts_missing_place(cur):
+    require_function(cur, "replay_place_rows")
+
+    [row] = replay(cur, {
+        "google_place_id": "ChIJnew", "name": "Ramen", "types": ["restaurant"],
+        "rating": 4.5, "last_fetched_at": "2026-10-18T09:00:00+00:00",
+    })
+
+    assert row["name"] == "Ramen"
+    assert row["types"] == ["restaurant"]
+
+
+def test_replay_skips_rows_older_than_stored(cur):
+    require_function(cur, "replay_place_rows")
+    make_place(cur, "New name", google_place_id="ChIJramen", last_fetched_at="2026-10-18T10:00:00+00:00")
+
+    assert replay(cur, {
+        "google_place_id": "ChIJramen", "name": "Old name", "last_fetched_at": "2026-10-18T09:00:00+00:00",
+    }) == []
+
+    assert place(cur, "ChIJramen")["name"] == "New name"
+
+
+def test_replay_search_row_keeps_details(cur):
+    require_function(cur, "replay_place_rows")
+    make_place(
+        cur, "Ramen", google_place_id="ChIJramen", details={"website": "https://ramen.example"},
+        last_fetched_at="2026-10-18T09:00:00+00:00", details_fetched_at="2026-10-18T09:00:00+00:00",
+    )
+
+    [row] = replay(cur, {
+        "google_place_id": "ChIJramen", "name": "Ramen Bar", "last_fetched_at": "2026-10-18T10:00:00+00:00",
+    })
+
+    assert row["name"] == "Ramen Bar"
+    assert row["details"] == {"website": "https://ramen.example"}
+    assert place(cur, "ChIJramen")["details_fetched_at"] == "2026-10-18 09:00:00+00"
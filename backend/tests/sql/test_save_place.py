@@ -0,0 +1,91 @@
+from tests.sql.conftest import make_list, make_place, make_user, require_function
+
+
+def save(cur, user_id, google_place_id, list_id=None):
+    cur.execute("SELECT * FROM save_place(%s, %s, %s)", (user_id, google_place_id, list_id))
+    return cur.fetchall()
+
+
+def saves(cur, user_id):
+    cur.execute(
+        "SELECT place_id::TEXT, list_id::TEXT FROM saved_places WHERE user_id = %s",
+        (user_id,),
+    )
+    return {(row["place_id"], row["list_id"]) for row in cur.fetchall()}
+
+
+def test_save_place_once_per_default_list(cur):
+    require_function(cur, "save_place")
+    user_id = make_user(cur)
+    place_id = make_place(cur, "Ramen", google_place_id="ChIJramen")
+
+    [first] = save(cur, user_id, "ChIJramen")
+    [again] = save(cur, user_id, "ChIJramen")
+
+    assert first["created"] is True
+    assert str(first["place_id"]) == place_id
+    assert first["name"] == "Ramen"
+    assert again["created"] is False
+    assert again["id"] == first["id"]
+    assert saves(cur, user_id) == {(place_id, None)}
+
+
+def test_save_place_per_list(cur):
+    require_function(cur, "save_place")
+    user_id = make_user(cur)
+    place_id = make_place(cur, google_place_id="ChIJramen")
+    list_id = make_list(cur, user_id)
+
+    assert save(cur, user_id, "ChIJramen")[0]["created"] is True
+    assert save(cur, user_id, "ChIJramen", list_id)[0]["created"] is True
+    assert save(cur, user_id, "ChIJramen", list_id)[0]["created"] is False
+    assert saves(cur, user_id) == {(place_id, None), (place_id, list_id)}
+
+
+def test_save_place_unknown_place(cur):
+    require_function(cur, "save_place")
+    assert save(cur, make_user(cur), "ChIJmissing") == []
+
+
+def test_deleting_list_merges_into_default_list(cur):
+    require_function(cur, "merge_saves_into_default_list")
+    user_id = make_user(cur)
+    shared = make_place(cur, google_place_id="ChIJshared")
+    only_listed = make_place(cur, google_place_id="ChIJlisted")
+    list_id = make_list(cur, user_id)
+    save(cur, user_id, "ChIJshared")
+    save(cur, user_id, "ChIJshared", list_id)
+    save(cur, user_id, "ChIJlisted", list_id)
+
+    cur.execute("DELETE FROM lists WHERE id = %s", (list_id,))
+
+    assert saves(cur, user_id) == {(shared, None), (only_listed, None)}
+    # The dropped duplicate reaches delta sync clients as a tombstone
+    cur.execute("SELECT COUNT(*) AS n FROM sync_tombstones WHERE user_id = %s", (user_id,))
+    assert cur.fetchone()["n"] == 1
+
+
+def test_deleting_lists_sharing_a_place(cur):
+    require_function(cur, "merge_saves_into_default_list")
+    user_id = make_user(cur)
+    place_id = make_place(cur, google_place_id="ChIJshared")
+    lists = [make_list(cur, user_id, "A"), make_list(cur, user_id, "B")]
+    for list_id in lists:
+        save(cur, user_id, "ChIJshared", list_id)
+
+    cur.execute("DELETE FROM lists WHERE user_id = %s", (user_id,))
+
+    assert saves(cur, user_id) == {(place_id, None)}
+
+
+def test_deleting_user_with_lists(cur):
+    require_function(cur, "merge_saves_into_default_list")
+    user_id = make_user(cur)
+    make_place(cur, google_place_id="ChIJshared")
+    list_id = make_list(cur, user_id)
+    save(cur, user_id, "ChIJshared")
+    save(cur, user_id, "ChIJshared", list_id)
+
+    cur.execute("DELETE FROM auth.users WHERE id = %s", (user_id,))
+
+    assert saves(cur, user_id) == set()
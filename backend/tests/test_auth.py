@@ -0,0 +1,136 @@
+import asyncio
+import base64
+import time
+
+import httpx
+import jwt
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app import auth as auth_module
+from app.auth import JWKSCache, get_current_user, get_token_cache
+from app.errors import AuthenticationError
+
+SECRET = b"test-signing-secret-test-signing-secret"
+
+
+def jwk(kid: str) -> dict:
+    return {
+        "kty": "oct",
+        "kid": kid,
+        "alg": "HS256",
+        "k": base64.urlsafe_b64encode(SECRET).decode().rstrip("="),
+    }
+
+
+def token(kid: str = "key-1", **claims) -> HTTPAuthorizationCredentials:
+    payload = {"sub": "user-1", "aud": "authenticated", "exp": int(time.time()) + 600, **claims}
+    encoded = jwt.encode(payload, SECRET, algorithm="HS256", headers={"kid": kid})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=encoded)
+
+
+@pytest.fixture
+def jwks(monkeypatch):
+    """JWKSCache served by jwks.kids (key ids currently published; None = outage)."""
+    cache = JWKSCache("http://supabase.test/auth/v1/.well-known/jwks.json")
+    cache.kids = ["key-1"]
+    cache.fetches = 0
+
+    def serve(request: httpx.Request) -> httpx.Response:
+        cache.fetches += 1
+        if cache.kids is None:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"keys": [jwk(kid) for kid in cache.kids]})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        auth_module.httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(serve), **kwargs),
+    )
+    monkeypatch.setattr(auth_module, "_jwks_cache", cache)
+    monkeypatch.setattr(auth_module, "_token_cache", None)
+    return cache
+
+
+async def test_verified_tokens_are_cached(jwks):
+    credentials = token()
+
+    assert (await get_current_user(credentials))["sub"] == "user-1"
+    assert (await get_current_user(credentials))["sub"] == "user-1"
+
+    assert jwks.fetches == 1
+    assert get_token_cache().stats()["hits"] == 1
+
+
+async def test_cache_never_outlives_token(jwks, monkeypatch):
+    cache = get_token_cache()
+    ttls = []
+    real_set = cache.set
+    monkeypatch.setattr(cache, "set", lambda key, value, ttl_seconds=None: (
+        ttls.append(ttl_seconds), real_set(key, value, ttl_seconds)
+    ))
+
+    await get_current_user(token(exp=int(time.time()) + 2))
+
+    assert 0 < ttls[0] <= 2
+
+
+async def test_unknown_kid_refreshes_once(jwks, monkeypatch):
+    monkeypatch.setattr(auth_module, "JWKS_MIN_REFRESH_SECONDS", 0)
+    await jwks.refresh()
+    jwks.kids = ["key-1", "key-2"]
+
+    # Keys rotated: the new kid triggers a refresh and is then known
+    assert (await get_current_user(token("key-2")))["sub"] == "user-1"
+    assert jwks.fetches == 2
+    assert jwks.kid_misses == 1
+
+
+async def test_unknown_kid_refresh_is_rate_limited(jwks):
+    await jwks.refresh()
+
+    with pytest.raises(AuthenticationError) as error:
+        await get_current_user(token("key-9"))
+    assert error.value.message == "Invalid authentication token"
+    # Refreshed moments ago - no second fetch
+    assert jwks.fetches == 1
+
+
+async def test_expired_and_wrong_audience(jwks):
+    with pytest.raises(AuthenticationError) as error:
+        await get_current_user(token(exp=int(time.time()) - 10))
+    assert error.value.message == "Token has expired"
+
+    with pytest.raises(AuthenticationError) as error:
+        await get_current_user(token(aud="anon"))
+    assert error.value.message == "Invalid token audience"
+
+
+async def test_failed_refresh_keeps_keys(jwks):
+    await jwks.refresh()
+    jwks.kids = None
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await jwks.refresh()
+
+    assert jwks.stats()["keys"] == 1
+    assert jwks.refresh_failures == 1
+
+
+async def test_failed_startup_fetch_is_retried(jwks, monkeypatch):
+    monkeypatch.setattr(auth_module, "JWKS_RETRY_SECONDS", 0.05)
+    jwks.kids = None
+    with pytest.raises(httpx.HTTPStatusError):
+        await jwks.refresh()
+
+    # Within the retry backoff requests fail without another fetch
+    with pytest.raises(AuthenticationError):
+        await get_current_user(token())
+    assert jwks.fetches == 1
+
+    # After it, the next request fetches again even though a fetch
+    # was attempted less than JWKS_MIN_REFRESH_SECONDS ago
+    jwks.kids = ["key-1"]
+    await asyncio.sleep(0.06)
+    assert (await get_current_user(token()))["sub"] == "user-1"
+    assert jwks.fetches == 2
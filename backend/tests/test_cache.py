@@ -0,0 +1,46 @@
+from app.cache import TTLCache
+
+
+def test_get_and_set():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert "a" in cache
+    assert cache.get("missing", "default") == "default"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_expired_entries_are_stale_until_evicted():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", 1, ttl_seconds=0)
+
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get_stale("a") == 1
+    assert cache.expirations == 1
+
+
+def test_pop_and_clear():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=0)
+
+    assert cache.pop("b") == 2
+    assert cache.pop("b", "gone") == "gone"
+    cache.clear()
+    assert len(cache) == 0
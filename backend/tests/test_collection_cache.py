@@ -0,0 +1,76 @@
+from app.services.collection_cache import SAVES, CollectionCache
+from tests.conftest import USER_ID
+
+
+def versions(db, version=1):
+    """Serve collection_versions lookups from db.version."""
+    db.version = version
+
+    def handler(query):
+        if query.target == "collection_versions":
+            return [] if db.version is None else [{"version": db.version}]
+        return []
+    db.handler = handler
+
+
+async def test_workers_agree_on_etags(fake_db):
+    versions(fake_db)
+    worker_a = CollectionCache(100, version_ttl_seconds=0, response_ttl_seconds=60)
+    worker_b = CollectionCache(100, version_ttl_seconds=0, response_ttl_seconds=60)
+
+    etag = await worker_a.etag(USER_ID, SAVES, 50, None)
+    assert await worker_b.etag(USER_ID, SAVES, 50, None) == etag
+    assert await worker_b.etag(USER_ID, SAVES, 20, None) != etag
+
+    # A write through worker A bumps the shared version; worker B sees it at once
+    fake_db.version = 2
+    assert await worker_b.etag(USER_ID, SAVES, 50, None) != etag
+    query = fake_db.calls[0]
+    assert query.op("eq") == ("user_id", USER_ID)
+
+
+async def test_missing_row_is_version_zero(fake_db):
+    versions(fake_db, None)
+    cache = CollectionCache(100, version_ttl_seconds=0, response_ttl_seconds=60)
+    assert await cache.version(USER_ID, SAVES) == "0"
+
+
+async def test_version_reuse_and_bump(fake_db):
+    versions(fake_db)
+    cache = CollectionCache(100, version_ttl_seconds=60, response_ttl_seconds=60)
+
+    assert await cache.version(USER_ID, SAVES) == "1"
+    fake_db.version = 2
+    assert await cache.version(USER_ID, SAVES) == "1"
+    assert len(fake_db.calls) == 1
+
+    # This worker's own writes are seen immediately
+    cache.bump(USER_ID, SAVES)
+    assert await cache.version(USER_ID, SAVES) == "2"
+
+
+async def test_failed_read_matches_nothing(fake_db):
+    fake_db.error = RuntimeError("database down")
+    cache = CollectionCache(100, version_ttl_seconds=60, response_ttl_seconds=60)
+
+    first = await cache.etag(USER_ID, SAVES)
+    assert await cache.etag(USER_ID, SAVES) != first
+    assert cache.stats()["version_read_failures"] == 2
+
+
+async def test_not_modified_skips_list_query(api, fake_db):
+    versions(fake_db)
+
+    first = await api.get("/api/saves/")
+    again = await api.get("/api/saves/", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert [call.target for call in fake_db.calls] == [
+        "collection_versions", "saved_places", "collection_versions",
+    ]
+
+    fake_db.version = 2
+    changed = await api.get("/api/saves/", headers={"If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != first.headers["ETag"]
@@ -0,0 +1,66 @@
+from collections import deque
+
+import pytest
+
+from app import db as db_module
+from app.db import PoolMetrics, PooledPostgrestClient
+
+
+def test_pool_metrics_summary():
+    assert PoolMetrics._summary(deque()) == {"avg_ms": None, "p95_ms": None, "max_ms": None}
+
+    summary = PoolMetrics._summary(deque([0.001 * i for i in range(1, 101)]))
+
+    assert summary["avg_ms"] == 50.5
+    assert summary["p95_ms"] == 96.0
+    assert summary["max_ms"] == 100.0
+
+
+async def test_client_sends_service_key_on_pooled_session():
+    client = PooledPostgrestClient("http://supabase.test/rest/v1", "secret")
+    try:
+        headers = client.session.headers
+        assert headers["apikey"] == "secret"
+        assert headers["Authorization"] == "Bearer secret"
+        assert client.session._transport is client.transport
+
+        metrics = client.pool_metrics()
+        assert metrics["requests"] == 0
+        assert metrics["connections"] == {"open": 0, "idle": 0, "in_use": 0}
+        assert metrics["limits"]["max_connections"] == db_module.POOL_MAX_CONNECTIONS
+    finally:
+        await client.aclose()
+
+
+async def test_get_db_is_a_singleton(monkeypatch):
+    monkeypatch.setattr(db_module, "_db_client", None)
+
+    first = db_module.get_db()
+    assert db_module.get_db() is first
+    assert db_module.get_pool_metrics() is not None
+
+    await db_module.close_db()
+    assert db_module._db_client is None
+    assert db_module.get_pool_metrics() is None
+
+
+def test_get_db_requires_settings(monkeypatch):
+    monkeypatch.setattr(db_module, "_db_client", None)
+    monkeypatch.delenv("SUPABASE_SERVICE_KEY")
+
+    with pytest.raises(ValueError):
+        db_module.get_db()
+
+
+async def test_metrics_need_token(api, monkeypatch):
+    from app import auth as auth_module
+
+    assert (await api.get("/metrics")).status_code == 404
+
+    monkeypatch.setattr(auth_module, "METRICS_TOKEN", "metrics-secret")
+    assert (await api.get("/metrics")).status_code == 401
+    assert (await api.get("/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+
+    response = await api.get("/metrics", headers={"Authorization": "Bearer metrics-secret"})
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from app.services import places as places_module
+from app.services.place_cache import get_place_cache
+from tests.fakes import echo_upserts
+
+
+def ago(**delta) -> str:
+    return (datetime.now(timezone.utc) - timedelta(**delta)).isoformat()
+
+
+def row(last_fetched_at: str, details_fetched_at=None) -> dict:
+    return {
+        "id": "id-ChIJ1",
+        "google_place_id": "ChIJ1",
+        "name": "Ramen",
+        "address": "1 Main St",
+        "photo_reference": None,
+        "last_fetched_at": last_fetched_at,
+        "details_fetched_at": details_fetched_at,
+        "details": {},
+    }
+
+
+def test_place_freshness(google):
+    assert google._place_freshness(row(ago(hours=1), ago(hours=1))) == "fresh"
+    assert google._place_freshness(row(ago(days=10), ago(hours=1))) == "stale"
+    assert google._place_freshness(row(ago(days=40), ago(hours=1))) == "expired"
+
+
+def test_opening_hours_expire_sooner(google):
+    assert google._place_freshness(row(ago(hours=1), ago(hours=30))) == "stale"
+    # Only seen in search results - no details payload yet
+    assert google._place_freshness(row(ago(hours=1))) == "expired"
+
+
+def test_cached_details_derive_open_now(google):
+    always_open = {"opening_hours": {"periods": [{"open": {"day": 0, "time": "0000"}}]}, "utc_offset_minutes": 0}
+    cached = {**row(ago(hours=1), ago(hours=1)), "lat": 1.3, "lng": 103.8, "details": always_open}
+
+    details = google._cached_details(cached, stale=False)
+
+    assert details["opening_hours"]["open_now"] is True
+    assert details["geometry"] == {"location": {"lat": 1.3, "lng": 103.8}}
+    assert details["cached_id"] == "id-ChIJ1"
+
+
+def test_is_cache_stale_handles_bad_timestamps(google):
+    assert google._is_cache_stale(None)
+    assert google._is_cache_stale("not a date")
+    assert not google._is_cache_stale(ago(days=1).replace("+00:00", "Z"))
+
+
+async def test_stale_place_served_and_refreshed_in_background(google, fake_db):
+    fake_db.handler = echo_upserts
+    get_place_cache().put(row(ago(days=10), ago(hours=1)))
+    google.handler = lambda request: httpx.Response(200, json={
+        "status": "OK", "result": {"place_id": "ChIJ1", "name": "Ramen v2"},
+    })
+
+    details = await google.get_place_details("ChIJ1")
+
+    assert details["_stale"] is True
+    assert details["name"] == "Ramen"
+    await asyncio.gather(*google._refreshing.values())
+    assert google.refreshes_completed == 1
+    assert get_place_cache().get("ChIJ1")["name"] == "Ramen v2"
+
+
+async def test_expired_place_fetched_synchronously(google, fake_db):
+    fake_db.handler = echo_upserts
+    get_place_cache().put(row(ago(days=40), ago(days=40)))
+    google.handler = lambda request: httpx.Response(200, json={
+        "status": "OK", "result": {"place_id": "ChIJ1", "name": "Ramen v2"},
+    })
+
+    details = await google.get_place_details("ChIJ1")
+
+    assert details["name"] == "Ramen v2"
+    assert details["cached_id"] == "id-ChIJ1"
+
+
+async def test_swr_disabled_fetches_stale_places(google, fake_db, monkeypatch):
+    monkeypatch.setattr(places_module, "PLACES_SWR_ENABLED", False)
+    fake_db.handler = echo_upserts
+    get_place_cache().put(row(ago(days=10), ago(hours=1)))
+    google.handler = lambda request: httpx.Response(200, json={
+        "status": "OK", "result": {"place_id": "ChIJ1", "name": "Ramen v2"},
+    })
+
+    details = await google.get_place_details("ChIJ1")
+
+    assert details["name"] == "Ramen v2"
+    assert google._refreshing == {}
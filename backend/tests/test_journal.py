@@ -0,0 +1,41 @@
+from tests.conftest import USER_ID
+
+
+def search_row(index: int) -> dict:
+    return {
+        "id": f"00000000-0000-4000-8000-00000000000{index}",
+        "photo_url": "x.jpg",
+        "place_id": None,
+        "google_place_id": None,
+        "place_name": None,
+        "rating": 4,
+        "note": "noodles",
+        "eaten_at": "2026-10-18T09:30:00+00:00",
+        "created_at": "2026-10-18T09:30:00+00:00",
+        "score": 1.0 / index,
+    }
+
+
+async def test_search_pages_by_offset(api, fake_db):
+    fake_db.handler = lambda query: [search_row(i) for i in (1, 2, 3)]
+
+    first = (await api.get("/api/journal/search", params={"q": "  noodles   soup ", "limit": 2})).json()
+
+    assert first["count"] == 2
+    assert first["next_cursor"] == "2"
+    assert fake_db.calls[0].params == {
+        "p_user_id": USER_ID, "p_query": "noodles soup", "p_limit": 3, "p_offset": 0,
+    }
+
+    fake_db.handler = lambda query: [search_row(3)]
+    second = (await api.get("/api/journal/search", params={"q": "noodles", "limit": 2, "cursor": "2"})).json()
+
+    assert second["has_more"] is False
+    assert second["next_cursor"] is None
+    assert fake_db.calls[1].params["p_offset"] == 2
+
+
+async def test_search_rejects_blank_query_and_bad_cursor(api, fake_db):
+    assert (await api.get("/api/journal/search", params={"q": "   "})).status_code == 400
+    assert (await api.get("/api/journal/search", params={"q": "soup", "cursor": "-5"})).status_code == 400
+    assert fake_db.calls == []
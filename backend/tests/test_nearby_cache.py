@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from app.services import places as places_module
+from tests.fakes import echo_upserts
+
+
+def cached_rows(count: int, fetched_days_ago: float = 1) -> list[dict]:
+    fetched_at = (datetime.now(timezone.utc) - timedelta(days=fetched_days_ago)).isoformat()
+    return [
+        {
+            "id": f"id-{i}",
+            "google_place_id": f"ChIJ{i}",
+            "name": f"Ramen {i}",
+            "address": None,
+            "photo_reference": None,
+            "types": ["restaurant"],
+            "last_fetched_at": fetched_at,
+            "details_fetched_at": None,
+            "details": None,
+            "distance_m": float(i),
+        }
+        for i in range(count)
+    ]
+
+
+def google_results(request):
+    return httpx.Response(200, json={"status": "OK", "results": [{"place_id": "ChIJg", "name": "From Google"}]})
+
+
+async def test_enough_cached_places_skip_google(google, fake_db, monkeypatch):
+    monkeypatch.setattr(places_module, "PLACES_NEARBY_MIN_RESULTS", 3)
+    fake_db.handler = lambda query: cached_rows(3) if query.kind == "rpc" else []
+
+    results, token = await google.search_places_page("Ramen  ", 1.3, 103.8, 1000)
+
+    assert [place["cached_id"] for place in results] == ["id-0", "id-1", "id-2"]
+    assert token == places_module.NEARBY_MORE_TOKEN
+    assert google.requests == []
+    rpc = fake_db.calls[0]
+    assert rpc.params["p_query"] == "ramen"
+
+
+async def test_thin_coverage_goes_to_google(google, fake_db, monkeypatch):
+    monkeypatch.setattr(places_module, "PLACES_NEARBY_MIN_RESULTS", 3)
+    fake_db.handler = lambda query: cached_rows(2) if query.kind == "rpc" else echo_upserts(query)
+    google.handler = google_results
+
+    results, _ = await google.search_places_page("ramen", 1.3, 103.8, 1000)
+
+    assert [place["name"] for place in results] == ["From Google"]
+    assert google.nearby_misses == 1
+
+
+async def test_expired_cached_places_do_not_count(google, fake_db, monkeypatch):
+    monkeypatch.setattr(places_module, "PLACES_NEARBY_MIN_RESULTS", 3)
+    fake_db.handler = lambda query: cached_rows(3, fetched_days_ago=60) if query.kind == "rpc" else echo_upserts(query)
+    google.handler = google_results
+
+    results, _ = await google.search_places_page("ramen", 1.3, 103.8, 1000)
+
+    assert [place["name"] for place in results] == ["From Google"]
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from app.services import places as places_module
+from app.services.places import _is_open_now
+
+# Mon-Fri 09:00-17:00
+WEEKDAYS = [{"open": {"day": day, "time": "0900"}, "close": {"day": day, "time": "1700"}} for day in range(1, 6)]
+# Saturday 22:00 to Sunday 02:00
+LATE_SATURDAY = [{"open": {"day": 6, "time": "2200"}, "close": {"day": 0, "time": "0200"}}]
+
+
+def at(monkeypatch, *moment):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(*moment, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(places_module, "datetime", FrozenDatetime)
+
+
+def test_unknown_hours_or_offset():
+    assert _is_open_now(None, 0) is None
+    assert _is_open_now(WEEKDAYS, None) is None
+
+
+def test_open_around_the_clock():
+    assert _is_open_now([{"open": {"day": 0, "time": "0000"}}], 0) is True
+
+
+def test_weekday_hours(monkeypatch):
+    # Wednesday 2026-10-14
+    at(monkeypatch, 2026, 10, 14, 12, 0)
+    assert _is_open_now(WEEKDAYS, 0) is True
+    # 12:00 UTC is 20:00 at UTC+8
+    assert _is_open_now(WEEKDAYS, 480) is False
+
+
+def test_periods_wrapping_past_saturday(monkeypatch):
+    # Sunday 2026-10-18 01:00
+    at(monkeypatch, 2026, 10, 18, 1, 0)
+    assert _is_open_now(LATE_SATURDAY, 0) is True
+    at(monkeypatch, 2026, 10, 18, 3, 0)
+    assert _is_open_now(LATE_SATURDAY, 0) is False
@@ -0,0 +1,53 @@
+import base64
+import json
+
+import pytest
+
+from app.errors import ValidationError
+from app.pagination import decode_cursor, encode_cursor, keyset_filter, page_rows
+
+SAVED_AT = "2026-10-18T09:30:00.123456+00:00"
+ROW_ID = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+
+
+def raw_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(SAVED_AT, ROW_ID)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (SAVED_AT, ROW_ID)
+
+
+def test_cursor_canonicalizes_id():
+    assert decode_cursor(raw_cursor(SAVED_AT, ROW_ID.upper())) == (SAVED_AT, ROW_ID)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor(SAVED_AT),
+    raw_cursor("yesterday", ROW_ID),
+    raw_cursor(SAVED_AT + '",id.gt.0', ROW_ID),
+    raw_cursor(SAVED_AT, "1),id.neq.(0"),
+    raw_cursor(None, ROW_ID),
+])
+def test_malformed_cursors_rejected(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+def test_keyset_filter():
+    assert keyset_filter("saved_at", encode_cursor(SAVED_AT, ROW_ID)) == (
+        f'saved_at.lt."{SAVED_AT}",and(saved_at.eq."{SAVED_AT}",id.lt.{ROW_ID})'
+    )
+
+
+def test_page_rows():
+    rows = [{"id": str(i), "saved_at": SAVED_AT} for i in range(3)]
+
+    page, cursor = page_rows(rows, 2, "saved_at")
+    assert page == rows[:2]
+    assert cursor == encode_cursor(SAVED_AT, "1")
+
+    assert page_rows(rows, 3, "saved_at") == (rows, None)
@@ -0,0 +1,51 @@
+import os
+
+from app.services.photo_cache import PhotoCache, photo_etag
+
+
+def store(cache: PhotoCache, photo_reference: str, data: bytes) -> str:
+    key = cache.key(photo_reference, 400)
+    tmp_path = cache.temp_path(key)
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    return cache.commit(key, tmp_path)
+
+
+def test_commit_and_get(tmp_path):
+    cache = PhotoCache(str(tmp_path), max_bytes=1000)
+    path = store(cache, "ref", b"jpeg")
+
+    assert cache.get("ref", 400) == path
+    assert cache.get("ref", 800) is None
+    with open(path, "rb") as f:
+        assert f.read() == b"jpeg"
+    assert cache.stats()["bytes"] == 4
+
+
+def test_evicts_least_recently_used_over_budget(tmp_path):
+    cache = PhotoCache(str(tmp_path), max_bytes=20)
+    first = store(cache, "a", b"x" * 10)
+    store(cache, "b", b"x" * 10)
+    cache.get("a", 400)
+    store(cache, "c", b"x" * 10)
+
+    assert cache.get("b", 400) is None
+    assert cache.get("a", 400) == first
+    assert cache.evictions == 1
+    assert cache.total_bytes == 20
+
+
+def test_indexes_existing_files_on_startup(tmp_path):
+    cache = PhotoCache(str(tmp_path), max_bytes=1000)
+    path = store(cache, "a", b"x" * 10)
+
+    reopened = PhotoCache(str(tmp_path), max_bytes=1000)
+
+    assert reopened.get("a", 400) == path
+    assert reopened.total_bytes == 10
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")]
+
+
+def test_photo_etag_is_stable_per_width():
+    assert photo_etag("ref", 400) == photo_etag("ref", 400)
+    assert photo_etag("ref", 400) != photo_etag("ref", 800)
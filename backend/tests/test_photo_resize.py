@@ -0,0 +1,65 @@
+import io
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.services import photo_cache as photo_cache_module
+from app.services import places as places_module
+from app.services.photo_cache import PhotoCache
+from app.services.photo_resize import resize_photo
+
+
+def jpeg(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def test_resize_keeps_aspect_ratio(tmp_path):
+    source = tmp_path / "source.jpg"
+    source.write_bytes(jpeg(1600, 1200))
+
+    resize_photo(str(source), str(tmp_path / "small.jpg"), 400)
+
+    with Image.open(tmp_path / "small.jpg") as image:
+        assert image.size == (400, 300)
+
+
+def test_narrow_images_are_not_upscaled(tmp_path):
+    source = tmp_path / "source.jpg"
+    source.write_bytes(jpeg(300, 200))
+
+    resize_photo(str(source), str(tmp_path / "copy.jpg"), 400)
+
+    with Image.open(tmp_path / "copy.jpg") as image:
+        assert image.size == (300, 200)
+
+
+@pytest.fixture
+def photo_cache(tmp_path, monkeypatch):
+    cache = PhotoCache(str(tmp_path), max_bytes=10 ** 7)
+    monkeypatch.setattr(photo_cache_module, "_photo_cache", cache)
+    # Resize in the default thread pool instead of worker processes
+    monkeypatch.setattr(places_module, "get_resize_pool", lambda: None)
+    return cache
+
+
+async def test_widths_derived_from_one_source_download(google, photo_cache):
+    google.handler = lambda request: httpx.Response(200, content=jpeg(1600, 1200))
+
+    small = await google.get_place_photo("ref", max_width=400)
+    medium = await google.get_place_photo("ref", max_width=800)
+
+    assert small == photo_cache.get("ref", 400)
+    assert medium == photo_cache.get("ref", 800)
+    assert photo_cache.get("ref", 1600) is not None
+    assert [request.url.params["maxwidth"] for request in google.requests] == ["1600"]
+    with Image.open(medium) as image:
+        assert image.width == 800
+
+
+async def test_missing_photo_returns_none(google, photo_cache):
+    google.handler = lambda request: httpx.Response(400)
+
+    assert await google.get_place_photo("bad-ref", max_width=400) is None
@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.http_cache import etag_matches
+from app.services import photo_cache as photo_cache_module
+from app.services import places as places_module
+from app.services.photo_cache import DOWNLOAD_ABORTED, PhotoCache, PhotoStream
+
+
+def test_etag_matches_uses_weak_comparison():
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', 'W/"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+
+
+@pytest.fixture
+def photo_cache(tmp_path, monkeypatch):
+    cache = PhotoCache(str(tmp_path), max_bytes=10 ** 6)
+    monkeypatch.setattr(photo_cache_module, "_photo_cache", cache)
+    return cache
+
+
+async def open_stream(body: bytes) -> httpx.Response:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body)))
+    return await client.send(client.build_request("GET", "http://photo.test/"), stream=True)
+
+
+async def test_relay_commits_file_and_resolves_done(photo_cache):
+    done = asyncio.get_running_loop().create_future()
+    stream = PhotoStream(photo_cache, photo_cache.key("ref", 400), await open_stream(b"jpeg"), done)
+
+    body = b"".join([chunk async for chunk in stream])
+    await stream.aclose()
+
+    assert body == b"jpeg"
+    assert done.result() == photo_cache.get("ref", 400)
+    assert stream.response.is_closed
+
+
+async def test_unread_stream_closed_by_owner(photo_cache):
+    done = asyncio.get_running_loop().create_future()
+    stream = PhotoStream(photo_cache, photo_cache.key("ref", 400), await open_stream(b"jpeg"), done)
+
+    await stream.aclose()
+
+    assert done.result() is DOWNLOAD_ABORTED
+    assert stream.response.is_closed
+    assert photo_cache.get("ref", 400) is None
+
+
+async def test_unread_stream_expires(photo_cache, monkeypatch):
+    monkeypatch.setattr(photo_cache_module, "PHOTO_STREAM_TIMEOUT_SECONDS", 0.01)
+    done = asyncio.get_running_loop().create_future()
+    stream = PhotoStream(photo_cache, photo_cache.key("ref", 400), await open_stream(b"jpeg"), done)
+
+    assert await asyncio.wait_for(done, 1) is DOWNLOAD_ABORTED
+    await asyncio.sleep(0)
+    assert stream.response.is_closed
+
+
+async def test_waiters_share_one_download(google, photo_cache):
+    google.handler = lambda request: httpx.Response(200, content=b"jpeg")
+
+    first = await google._get_upstream_photo("ref", 1600)
+    waiter = asyncio.ensure_future(google._get_upstream_photo("ref", 1600))
+    await asyncio.sleep(0)
+    body = b"".join([chunk async for chunk in first])
+
+    assert body == b"jpeg"
+    assert await waiter == photo_cache.get("ref", 1600)
+    assert len(google.requests) == 1
+    assert google._photo_downloads == {}
+
+
+async def test_waiters_retry_after_abandoned_download(google, photo_cache):
+    google.handler = lambda request: httpx.Response(200, content=b"jpeg")
+
+    abandoned = await google._get_upstream_photo("ref", 1600)
+    waiter = asyncio.ensure_future(google._get_upstream_photo("ref", 1600))
+    await asyncio.sleep(0)
+    # Client went away before the response was streamed
+    await abandoned.aclose()
+
+    retried = await asyncio.wait_for(waiter, 1)
+    assert isinstance(retried, PhotoStream)
+    assert b"".join([chunk async for chunk in retried]) == b"jpeg"
+    await retried.aclose()
+    assert len(google.requests) == 2
+
+
+async def test_waiters_stop_waiting_after_timeout(google, photo_cache, monkeypatch):
+    monkeypatch.setattr(places_module, "PHOTO_STREAM_TIMEOUT_SECONDS", 0.01)
+    google.handler = lambda request: httpx.Response(200, content=b"jpeg")
+
+    stuck = await google._get_upstream_photo("ref", 1600)
+    own = await asyncio.wait_for(google._get_upstream_photo("ref", 1600), 1)
+
+    assert isinstance(own, PhotoStream) and own is not stuck
+    await stuck.aclose()
+    await asyncio.sleep(0)
+    # The finished first download must not drop the second one's entry
+    assert google._photo_downloads[("ref", 1600)] is own.done
+    await own.aclose()
+    await asyncio.sleep(0)
+    assert google._photo_downloads == {}
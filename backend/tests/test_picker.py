@@ -0,0 +1,255 @@
+import asyncio
+import copy
+
+import pytest
+
+from app.errors import NotFoundError, ValidationError
+from app.pagination import decode_offset_cursor
+from app.services import picker as picker_module
+from app.services.picker import PickerSessionStore
+
+LAT, LNG = 1.3, 103.8
+
+
+def place(place_id, rating=None):
+    return {"place_id": place_id, "name": place_id, "rating": rating, "geometry": {"location": {"lat": LAT, "lng": LNG}}}
+
+
+class FakePlaces:
+    """search_places_page / fetch_next_page over fixed pages."""
+
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.fetched = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    def _page(self, index):
+        next_token = f"page-{index + 1}" if index + 1 < len(self.pages) else None
+        return list(self.pages[index]), next_token
+
+    async def search_places_page(self, query, lat, lng, radius):
+        return self._page(0)
+
+    async def fetch_next_page(self, query, lat, lng, radius, page_token):
+        self.fetched.append(page_token)
+        await self.release.wait()
+        return self._page(int(page_token.split("-")[1]))
+
+
+class SessionTable:
+    """picker_sessions rows behind a FakeDB handler (eq, gt and lt filters)."""
+
+    def __init__(self):
+        self.rows: dict[str, dict] = {}
+
+    @staticmethod
+    def _matches(query, row) -> bool:
+        for name, args, _ in query.ops:
+            if name == "eq" and row[args[0]] != args[1]:
+                return False
+            if name == "gt" and not row[args[0]] > args[1]:
+                return False
+            if name == "lt" and not row[args[0]] < args[1]:
+                return False
+        return True
+
+    def __call__(self, query):
+        assert query.target == "picker_sessions"
+        insert = query.op("insert")
+        if insert is not None:
+            row = copy.deepcopy(insert[0])
+            self.rows[row["id"]] = row
+            return [row]
+
+        matched = [row for row in self.rows.values() if self._matches(query, row)]
+        update = query.op("update")
+        if update is not None:
+            for row in matched:
+                row.update(copy.deepcopy(update[0]))
+        elif query.op("delete") is not None:
+            for row in matched:
+                del self.rows[row["id"]]
+        return copy.deepcopy(matched)
+
+
+@pytest.fixture
+def places(monkeypatch):
+    def install(*pages):
+        service = FakePlaces(*pages)
+        monkeypatch.setattr(picker_module, "get_places_service", lambda: service)
+        return service
+    return install
+
+
+@pytest.fixture
+def sessions(fake_db):
+    table = SessionTable()
+    fake_db.handler = table
+    return table
+
+
+def ids(items):
+    return [p["place_id"] for p in items]
+
+
+async def page(store, session_id, offset, limit, user_id="user-1"):
+    """One GET /sessions/{session_id} request: read the session, then serve a page."""
+    session = await store.get(session_id, user_id)
+    return await store.page(session, offset, limit)
+
+
+async def test_session_ranks_first_page(places, sessions):
+    places([place("a", 3.0), place("b", 5.0), place("c", 4.0)])
+    store = PickerSessionStore()
+    session = await store.create("user-1", "ramen", LAT, LNG, 1000)
+
+    assert await page(store, session.id, 0, 2) == ([place("b", 5.0), place("c", 4.0)], True)
+    items, has_more = await page(store, session.id, 2, 2)
+    assert (ids(items), has_more) == (["a"], False)
+    assert sessions.rows[session.id]["served"] == 3
+
+
+async def test_prefetch_reranks_only_unserved_tail(places, sessions, monkeypatch):
+    monkeypatch.setattr(picker_module, "PICKER_PREFETCH_REMAINING", 1)
+    service = places(
+        [place("a", 4.0), place("b", 3.0), place("c", 2.0)],
+        [place("b", 3.0), place("d", 5.0)],
+    )
+    store = PickerSessionStore()
+    session = await store.create("user-1", "ramen", LAT, LNG, 1000)
+
+    # Serving "a" leaves 2 unseen, and another page of 1 would leave 1: prefetch
+    items, _ = await page(store, session.id, 0, 1)
+    assert ids(items) == ["a"]
+    await store._prefetches[session.id]
+    assert service.fetched == ["page-1"]
+
+    # "d" outranks the unserved "b"; the duplicate "b" is dropped
+    assert ids(sessions.rows[session.id]["candidates"]) == ["a", "d", "b", "c"]
+    items, has_more = await page(store, session.id, 1, 10)
+    assert (ids(items), has_more) == (["d", "b", "c"], False)
+
+
+async def test_page_waits_for_prefetch_in_progress(places, sessions):
+    service = places([place("a")], [place("b")])
+    service.release.clear()
+    store = PickerSessionStore()
+    session = await store.create("user-1", "ramen", LAT, LNG, 1000)
+
+    waiting = asyncio.ensure_future(page(store, session.id, 0, 2))
+    await asyncio.sleep(0)
+    assert not waiting.done()
+    service.release.set()
+    items, _ = await waiting
+    assert ids(items) == ["a", "b"]
+    assert service.fetched == ["page-1"]
+
+
+async def test_failed_page_fetch_ends_session(places, sessions):
+    service = places([place("a")], [place("b")])
+
+    async def fail(*args):
+        raise RuntimeError("upstream down")
+
+    service.fetch_next_page = fail
+    store = PickerSessionStore()
+    session = await store.create("user-1", "ramen", LAT, LNG, 1000)
+
+    items, has_more = await page(store, session.id, 0, 5)
+    assert (ids(items), has_more) == (["a"], False)
+    assert sessions.rows[session.id]["next_page_token"] is None
+
+
+async def test_any_worker_serves_the_session(places, sessions):
+    places([place("a", 5.0), place("b", 4.0), place("c", 3.0)])
+    session = await PickerSessionStore().create("user-1", "ramen", LAT, LNG, 1000)
+
+    items, _ = await page(PickerSessionStore(), session.id, 0, 2)
+    assert ids(items) == ["a", "b"]
+    items, _ = await page(PickerSessionStore(), session.id, 2, 2)
+    assert ids(items) == ["c"]
+
+
+async def test_concurrent_write_is_retried_on_fresh_copy(places, sessions):
+    service = places([place("a", 5.0), place("b", 1.0)], [place("c", 4.0)])
+    service.release.clear()
+    store, other = PickerSessionStore(), PickerSessionStore()
+    session = await store.create("user-1", "ramen", LAT, LNG, 1000)
+
+    # A stale copy from before another worker added the next page
+    stale = await store.get(session.id, "user-1")
+    service.release.set()
+    await other._fetch_next(await other.get(session.id, "user-1"))
+
+    items, _ = await store.page(stale, 0, 2)
+
+    assert ids(items) == ["a", "c"]
+    assert store.write_conflicts == 1
+    assert sessions.rows[session.id]["served"] == 2
+    # The page was fetched once; the losing write didn't add it again
+    assert sessions.rows[session.id]["pages"] == 2
+
+
+async def test_sessions_are_per_user(places, sessions):
+    places([place("a")])
+    store = PickerSessionStore()
+    session = await store.create("user-1", "ramen", LAT, LNG, 1000)
+
+    assert (await store.get(session.id, "user-1")).id == session.id
+    with pytest.raises(NotFoundError):
+        await store.get(session.id, "user-2")
+    with pytest.raises(NotFoundError):
+        await store.delete(session.id, "user-2")
+
+    await store.delete(session.id, "user-1")
+    with pytest.raises(NotFoundError):
+        await store.get(session.id, "user-1")
+
+
+async def test_expired_sessions_are_gone(places, sessions):
+    places([place("a")])
+    store = PickerSessionStore()
+    session = await store.create("user-1", "ramen", LAT, LNG, 1000)
+    sessions.rows[session.id]["expires_at"] = "2000-01-01T00:00:00+00:00"
+
+    with pytest.raises(NotFoundError):
+        await store.get(session.id, "user-1")
+
+    # Purged when the next session is created
+    await store.create("user-1", "soba", LAT, LNG, 1000)
+    assert session.id not in sessions.rows
+
+
+async def test_session_endpoints(api, places, sessions, monkeypatch):
+    places([place("a", 5.0), place("b", 4.0)])
+
+    created = await api.post("/api/picker/sessions", json={"lat": LAT, "lng": LNG, "limit": 1})
+    assert created.status_code == 201
+    body = created.json()
+    assert (body["count"], body["next_cursor"]) == (1, "1")
+
+    # Sessions are read from the table, so a fresh store (another worker) serves the next page
+    monkeypatch.setattr(picker_module, "_picker_sessions", None)
+    response = await api.get(f"/api/picker/sessions/{body['session_id']}", params={"cursor": "1"})
+    assert response.json()["places"][0]["google_place_id"] == "b"
+
+    assert (await api.delete(f"/api/picker/sessions/{body['session_id']}")).status_code == 204
+    assert (await api.get(f"/api/picker/sessions/{body['session_id']}")).status_code == 404
+
+
+async def test_cursor_past_the_end(places, sessions):
+    places([place("a")])
+    store = PickerSessionStore()
+    session = await store.create("user-1", "ramen", LAT, LNG, 1000)
+    with pytest.raises(ValidationError):
+        await page(store, session.id, 5, 1)
+
+
+def test_decode_offset_cursor():
+    assert decode_offset_cursor(None) == 0
+    assert decode_offset_cursor("") == 0
+    assert decode_offset_cursor("12") == 12
+    for bad in ("-1", "abc", "1.5"):
+        with pytest.raises(ValidationError):
+            decode_offset_cursor(bad)
@@ -0,0 +1,55 @@
+from app.services.place_cache import PlaceCache
+
+
+ROW = {"id": "11111111-1111-1111-1111-111111111111", "google_place_id": "ChIJ1", "name": "Ramen"}
+
+
+def test_lookup_by_google_id_and_uuid():
+    cache = PlaceCache()
+    cache.put(ROW)
+
+    assert cache.get("ChIJ1") == ROW
+    assert cache.get_by_id(ROW["id"]) == ROW
+    assert cache.id_for("ChIJ1") == ROW["id"]
+    assert cache.google_id_for(ROW["id"]) == "ChIJ1"
+
+
+def test_invalidate_keeps_id_mapping():
+    cache = PlaceCache()
+    cache.put(ROW)
+    cache.invalidate("ChIJ1")
+
+    assert cache.get("ChIJ1") is None
+    assert cache.get_by_id(ROW["id"]) is None
+    assert cache.id_for("ChIJ1") == ROW["id"]
+
+
+def test_stale_rows_served_for_degraded_reads():
+    cache = PlaceCache()
+    cache._rows.ttl_seconds = 0
+    cache.put(ROW)
+
+    assert cache.get("ChIJ1") is None
+    assert cache.get_stale(google_place_id="ChIJ1") == ROW
+    assert cache.get_stale(place_id=ROW["id"]) == ROW
+    assert cache.get_stale(place_id="unknown") is None
+    assert cache.stats()["stale_served"] == 2
+
+
+async def test_place_row_served_from_cache_without_db(google, fake_db):
+    from app.services.place_cache import get_place_cache
+    get_place_cache().put(ROW)
+
+    assert await google.get_place_row(ROW["id"]) == ROW
+    assert await google.get_place_row("ChIJ1") == ROW
+    assert fake_db.calls == []
+
+
+async def test_place_row_falls_back_to_stale_when_db_fails(google, fake_db):
+    from app.services.place_cache import get_place_cache
+    cache = get_place_cache()
+    cache._rows.ttl_seconds = 0
+    cache.put(ROW)
+    fake_db.error = RuntimeError("supabase down")
+
+    assert await google.get_place_row(ROW["id"]) == ROW
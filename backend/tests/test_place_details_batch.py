@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime, timezone
+
+from app.services.place_cache import get_place_cache
+
+PLACE_ID = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+
+
+def fresh_row(place_id=PLACE_ID, google_place_id="ChIJ1") -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": place_id,
+        "google_place_id": google_place_id,
+        "name": "Ramen",
+        "address": "1 Main St",
+        "photo_reference": None,
+        "last_fetched_at": now,
+        "details_fetched_at": now,
+        "details": {},
+    }
+
+
+def places_lookup(*rows):
+    """FakeDB handler answering the batch places query with rows."""
+    def handler(query):
+        return list(rows) if query.target == "places" else []
+    return handler
+
+
+async def test_uppercase_uuid_found_in_database(google, fake_db):
+    fake_db.handler = places_lookup(fresh_row())
+    upper = PLACE_ID.upper()
+
+    results = await google.get_place_details_batch([upper, "not-an-id"])
+
+    assert list(results) == [upper, "not-an-id"]
+    assert results[upper]["cached_id"] == PLACE_ID
+    assert results["not-an-id"] is None
+    # Looked up in canonical form
+    assert f"id.in.({PLACE_ID})" in fake_db.calls[0].op("or_")[0]
+
+
+async def test_uppercase_uuid_found_in_process_cache(google, fake_db):
+    get_place_cache().put(fresh_row())
+
+    results = await google.get_place_details_batch([PLACE_ID.upper(), PLACE_ID])
+
+    assert results[PLACE_ID.upper()]["cached_id"] == PLACE_ID
+    assert results[PLACE_ID]["cached_id"] == PLACE_ID
+    assert fake_db.calls == []
+
+
+async def test_mixed_ids_share_one_query(google, fake_db):
+    other_id = str(uuid.uuid4())
+    fake_db.handler = places_lookup(fresh_row(), fresh_row(other_id, "ChIJ2"))
+
+    results = await google.get_place_details_batch(["ChIJ1", other_id, "ChIJ1"])
+
+    assert results["ChIJ1"]["name"] == "Ramen"
+    assert results[other_id]["cached_id"] == other_id
+    assert len(fake_db.calls) == 1
+    assert google.requests == []
@@ -0,0 +1,137 @@
+import httpx
+import pytest
+
+from app.services.place_cache import get_place_cache
+from app.services.place_writer import PlaceOutbox, PlaceWriteBehind
+from tests.fakes import echo_upserts
+
+
+@pytest.fixture
+async def writer(fake_db):
+    fake_db.handler = echo_upserts
+    writer = PlaceWriteBehind()
+    yield writer
+    await writer.stop()
+
+
+def test_outbox_keeps_latest_row_and_bound(tmp_path):
+    outbox = PlaceOutbox(str(tmp_path / "outbox.sqlite3"), max_rows=2)
+    outbox.put([{"google_place_id": "a", "name": "old"}])
+    outbox.put([{"google_place_id": "a", "name": "new"}, {"google_place_id": "b"}])
+    outbox.put([{"google_place_id": "c"}])
+
+    entries = outbox.peek(10)
+    assert outbox.size() == 2
+    assert entries[-1][0] == {"google_place_id": "c"}
+    assert entries[0][0]["google_place_id"] in ("a", "b")
+    outbox.remove([("c", entries[-1][1])])
+    assert outbox.size() == 1
+
+
+def test_outbox_remove_keeps_rows_put_again(tmp_path):
+    outbox = PlaceOutbox(str(tmp_path / "outbox.sqlite3"), max_rows=10)
+    outbox.put([{"google_place_id": "a", "name": "old"}])
+    [(_, queued_at)] = outbox.peek(10)
+    outbox.put([{"google_place_id": "a", "name": "new"}])
+
+    outbox.remove([("a", queued_at)])
+
+    assert [row for row, _ in outbox.peek(10)] == [{"google_place_id": "a", "name": "new"}]
+
+
+async def test_enqueue_merges_rows_for_same_place(writer, fake_db):
+    writer.enqueue({"google_place_id": "g1", "name": "A", "details": {"website": "x"}})
+    writer.enqueue({"google_place_id": "g1", "name": "B"})
+
+    ids = await writer.flush()
+
+    assert ids == {"g1": "id-g1"}
+    [upsert] = fake_db.calls
+    assert upsert.op("upsert")[0] == [{"google_place_id": "g1", "name": "B", "details": {"website": "x"}}]
+
+
+async def test_flush_upserts_once_per_column_set(writer, fake_db):
+    writer.enqueue({"google_place_id": "g1", "name": "A"})
+    writer.enqueue({"google_place_id": "g2", "name": "B"})
+    writer.enqueue({"google_place_id": "g3", "name": "C", "details": {}})
+
+    await writer.flush()
+
+    assert sorted(len(call.op("upsert")[0]) for call in fake_db.calls) == [1, 2]
+    assert get_place_cache().get("g3")["id"] == "id-g3"
+
+
+async def test_write_returns_ids_of_queued_places(writer, fake_db):
+    writer.enqueue({"google_place_id": "g1", "name": "A"})
+
+    assert await writer.write(["g1", "unknown"]) == {"g1": "id-g1"}
+    # Already written - no second upsert
+    assert await writer.write(["g1"]) == {"g1": "id-g1"}
+    assert len(fake_db.calls) == 1
+
+
+async def test_failed_batch_goes_to_outbox_and_is_retried(writer, fake_db):
+    fake_db.error = RuntimeError("supabase down")
+    writer.enqueue({"google_place_id": "g1", "name": "A"})
+
+    assert await writer.write(["g1"]) == {}
+    assert writer.outbox_size == 1
+    assert writer.failures == 1
+
+    fake_db.error = None
+    fake_db.handler = lambda query: [
+        {**row, "id": f"id-{row['google_place_id']}"} for row in query.params["p_rows"]
+    ]
+    await writer._drain_outbox()
+
+    [*_, replay] = fake_db.calls
+    assert (replay.kind, replay.target) == ("rpc", "replay_place_rows")
+    assert replay.params["p_rows"] == [{"google_place_id": "g1", "name": "A"}]
+    assert writer.outbox_size == 0
+    assert get_place_cache().id_for("g1") == "id-g1"
+
+
+async def test_outbox_rows_skipped_as_stale_are_removed(writer, fake_db):
+    fake_db.error = RuntimeError("supabase down")
+    writer.enqueue({"google_place_id": "g1", "name": "A"})
+    await writer.flush()
+
+    fake_db.error = None
+    fake_db.handler = lambda query: []
+    await writer._drain_outbox()
+
+    assert writer.outbox_size == 0
+    assert get_place_cache().id_for("g1") is None
+
+
+async def test_search_results_carry_ids_of_new_places(google, fake_db):
+    fake_db.handler = echo_upserts
+    google.handler = lambda request: httpx.Response(200, json={
+        "status": "OK",
+        "results": [{"place_id": "ChIJ1", "name": "Ramen"}, {"place_id": "ChIJ2", "name": "Soba"}],
+    })
+
+    results = await google.search_places("ramen", 1.3521, 103.8198, 1000)
+    cached = await google.search_places("ramen", 1.3521, 103.8198, 1000)
+
+    assert [place["cached_id"] for place in results] == ["id-ChIJ1", "id-ChIJ2"]
+    assert cached == results
+    assert len(google.requests) == 1
+
+
+async def test_search_without_ids_is_not_cached(google, fake_db):
+    def handler(query):
+        if query.op("upsert"):
+            raise RuntimeError("supabase down")
+        return []
+
+    fake_db.handler = handler
+    google.handler = lambda request: httpx.Response(200, json={
+        "status": "OK", "results": [{"place_id": "ChIJ1", "name": "Ramen"}],
+    })
+
+    results = await google.search_places("ramen", 1.3521, 103.8198, 1000)
+    await google.search_places("ramen", 1.3521, 103.8198, 1000)
+
+    assert "cached_id" not in results[0]
+    assert len(google.requests) == 2
@@ -0,0 +1,63 @@
+import httpx
+import pytest
+
+from app.errors import DatabaseError, ValidationError
+from app.services.places import GooglePlacesService
+
+
+async def test_get_json_sends_api_key(google):
+    google.handler = lambda request: httpx.Response(200, json={"status": "OK", "results": []})
+
+    data = await google._get_json("/textsearch/json", {"query": "ramen"})
+
+    assert data["status"] == "OK"
+    params = google.requests[0].url.params
+    assert params["query"] == "ramen"
+    assert params["key"] == "test-google-key"
+
+
+async def test_get_json_maps_http_errors(google):
+    google.handler = lambda request: httpx.Response(500)
+
+    with pytest.raises(DatabaseError):
+        await google._get_json("/textsearch/json", {"query": "ramen"})
+
+
+async def test_get_json_maps_transport_errors(google):
+    def fail(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    google.handler = fail
+
+    with pytest.raises(DatabaseError):
+        await google._get_json("/textsearch/json", {"query": "ramen"})
+
+
+def test_check_status(google):
+    for status in ("OK", "ZERO_RESULTS", "NOT_FOUND"):
+        google._check_status(status)
+    with pytest.raises(ValidationError):
+        google._check_status("REQUEST_DENIED")
+    with pytest.raises(DatabaseError):
+        google._check_status("OVER_QUERY_LIMIT")
+    with pytest.raises(DatabaseError):
+        google._check_status("UNKNOWN_ERROR")
+
+
+def test_requires_api_key(monkeypatch):
+    monkeypatch.delenv("GOOGLE_PLACES_API_KEY")
+
+    with pytest.raises(ValidationError):
+        GooglePlacesService()
+
+
+async def test_details_for_unknown_place_ids(google, fake_db):
+    for status in ("NOT_FOUND", "INVALID_REQUEST"):
+        google.handler = lambda request: httpx.Response(200, json={"status": status})
+        assert await google.get_place_details("ChIJmadeUp") is None
+
+
+async def test_details_skip_google_for_malformed_ids(google, fake_db):
+    assert await google.get_place_details("not a place/id") is None
+    assert google.requests == []
+    assert fake_db.calls == []
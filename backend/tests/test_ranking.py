@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from app.services.ranking import haversine_m, rank_places, score_places
+
+LAT, LNG = 1.3, 103.8
+
+
+def place(place_id, lat=LAT, lng=LNG, **fields):
+    return {"place_id": place_id, "geometry": {"location": {"lat": lat, "lng": lng}}, **fields}
+
+
+def ids(places):
+    return [p["place_id"] for p in places]
+
+
+def test_haversine_one_degree_of_latitude():
+    distance = haversine_m(0.0, 0.0, np.array([1.0, 0.0]), np.array([0.0, 0.0]))
+    assert distance[0] == pytest.approx(111195, rel=1e-3)
+    assert distance[1] == 0
+
+
+def test_rating_and_open_now_outrank_unknowns():
+    places = [
+        place("unknown"),
+        place("rated", rating=4.5, user_ratings_total=300),
+        place("rated_open", rating=4.5, user_ratings_total=300, opening_hours={"open_now": True}),
+        place("rated_closed", rating=4.5, user_ratings_total=300, opening_hours={"open_now": False}),
+    ]
+    assert ids(rank_places(places, LAT, LNG, 1000)) == ["rated_open", "rated", "rated_closed", "unknown"]
+
+
+def test_distance_counts_only_inside_radius():
+    near = place("near", lat=LAT + 0.001)
+    far = place("far", lat=LAT + 0.05)
+    scores = score_places([near, far, place("here")], LAT, LNG, 1000)
+    assert scores[2] > scores[0] > scores[1]
+    # Beyond the radius is the same as no location at all
+    assert scores[1] == score_places([{"place_id": "nowhere"}], LAT, LNG, 1000)[0]
+
+
+def test_price_fit_only_when_requested():
+    cheap = place("cheap", price_level=1)
+    pricey = place("pricey", price_level=4)
+    assert ids(rank_places([pricey, cheap], LAT, LNG, 1000, price_level=1)) == ["cheap", "pricey"]
+    assert ids(rank_places([pricey, cheap], LAT, LNG, 1000)) == ["pricey", "cheap"]
+
+
+def test_reviews_saturate():
+    a = place("a", user_ratings_total=1000)
+    b = place("b", user_ratings_total=50000)
+    scores = score_places([a, b], LAT, LNG, 1000)
+    assert scores[0] == scores[1]
+
+
+def test_ties_keep_google_order_and_limit():
+    places = [place(str(i)) for i in range(5)]
+    assert ids(rank_places(places, LAT, LNG, 1000)) == ["0", "1", "2", "3", "4"]
+    assert ids(rank_places(places, LAT, LNG, 1000, limit=2)) == ["0", "1"]
+    assert rank_places([], LAT, LNG, 1000) == []
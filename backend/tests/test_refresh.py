@@ -0,0 +1,131 @@
+import httpx
+import pytest
+
+from app.services import places as places_module
+from app.services import refresh as refresh_module
+from app.services.refresh import PlaceRefreshScheduler, PlaceViewFlusher
+from tests.fakes import echo_upserts
+
+
+@pytest.fixture(autouse=True)
+def service(google, monkeypatch):
+    monkeypatch.setattr(places_module, "_places_service", google)
+    monkeypatch.setattr(refresh_module, "_view_flusher", None)
+    monkeypatch.setattr(refresh_module, "_scheduler", None)
+    return google
+
+
+def test_view_counts_are_capped(service, monkeypatch):
+    monkeypatch.setattr(places_module, "PLACE_VIEW_COUNTS_MAX", 2)
+
+    service.record_views({"a": 1, "b": 1})
+    service.record_views({"a": 2, "c": 5})
+
+    assert service.view_counts == {"a": 3, "b": 1}
+    assert service.views_dropped == 5
+
+
+async def test_flusher_writes_and_resets_views(service, fake_db):
+    service.record_views({"a": 2})
+
+    flusher = PlaceViewFlusher()
+    await flusher.flush()
+    await flusher.flush()
+
+    [call] = fake_db.calls
+    assert (call.target, call.params) == ("record_place_views", {"p_views": {"a": 2}})
+    assert service.view_counts == {}
+    assert flusher.stats() == {"flushes": 1, "views_flushed": 2, "failures": 0}
+
+
+async def test_flusher_keeps_views_when_write_fails(service, fake_db):
+    service.record_views({"a": 2})
+    fake_db.error = RuntimeError("supabase down")
+
+    flusher = PlaceViewFlusher()
+    await flusher.flush()
+    service.record_views({"a": 1})
+
+    assert service.view_counts == {"a": 3}
+    assert flusher.failures == 1
+
+
+async def test_flusher_stop_writes_remaining_views(service, fake_db):
+    flusher = PlaceViewFlusher()
+    flusher.start()
+    service.record_views({"a": 1})
+
+    await flusher.stop()
+
+    assert [call.params for call in fake_db.calls] == [{"p_views": {"a": 1}}]
+
+
+def quota_handler(due: list[str]):
+    """DB handler with a shared quota counter and a fixed list of due places."""
+    used = 0
+
+    def handler(query):
+        nonlocal used
+        if query.target == "places_due_for_refresh":
+            return [{"google_place_id": gid} for gid in due[:query.params["p_limit"]]]
+        if query.target == "claim_place_refresh_quota":
+            granted = min(query.params["p_requested"], max(0, query.params["p_daily_quota"] - used))
+            used += granted
+            return [{"granted": granted, "used": used}]
+        return echo_upserts(query)
+
+    return handler
+
+
+async def test_run_once_refreshes_due_places_within_quota(service, fake_db, monkeypatch):
+    monkeypatch.setattr(refresh_module, "PLACE_REFRESH_DAILY_QUOTA", 2)
+    fake_db.handler = quota_handler(["ChIJ1", "ChIJ2", "ChIJ3"])
+    service.handler = lambda request: httpx.Response(200, json={
+        "status": "OK",
+        "result": {"place_id": request.url.params["place_id"], "name": "Refreshed"},
+    })
+    service.record_views({"ChIJ1": 4})
+
+    scheduler = PlaceRefreshScheduler()
+    assert await scheduler.run_once() == 2
+    assert await scheduler.run_once() == 0
+
+    assert scheduler.remaining_quota() == 0
+    due = next(call for call in fake_db.calls if call.target == "places_due_for_refresh")
+    assert set(due.params) == {"p_stale_before", "p_limit", "p_details_stale_before"}
+    assert due.params["p_details_stale_before"] > due.params["p_stale_before"]
+    claim = next(call for call in fake_db.calls if call.target == "claim_place_refresh_quota")
+    assert claim.params == {"p_requested": 3, "p_daily_quota": 2}
+    assert fake_db.calls[0].params == {"p_views": {"ChIJ1": 4}}
+    assert len(service.requests) == 2
+
+
+async def test_quota_is_shared_between_schedulers(service, fake_db, monkeypatch):
+    monkeypatch.setattr(refresh_module, "PLACE_REFRESH_DAILY_QUOTA", 3)
+    fake_db.handler = quota_handler(["ChIJ1", "ChIJ2"])
+    service.handler = lambda request: httpx.Response(200, json={
+        "status": "OK",
+        "result": {"place_id": request.url.params["place_id"], "name": "Refreshed"},
+    })
+
+    assert await PlaceRefreshScheduler().run_once() == 2
+    # A second worker (or a restart) only gets what is left
+    assert await PlaceRefreshScheduler().run_once() == 1
+    assert len(service.requests) == 3
+
+
+async def test_not_found_places_are_marked_and_not_counted(service, fake_db):
+    fake_db.handler = quota_handler(["ChIJgone", "ChIJ1"])
+    service.handler = lambda request: httpx.Response(200, json=(
+        {"status": "NOT_FOUND"} if request.url.params["place_id"] == "ChIJgone"
+        else {"status": "OK", "result": {"place_id": "ChIJ1", "name": "Refreshed"}}
+    ))
+
+    scheduler = PlaceRefreshScheduler()
+    assert await scheduler.run_once() == 1
+
+    [mark] = [call for call in fake_db.calls if call.op("update")]
+    assert mark.target == "places"
+    assert "not_found_at" in mark.op("update")[0]
+    assert mark.op("in_") == ("google_place_id", ["ChIJgone"])
+    assert (scheduler.refreshed, scheduler.not_found) == (1, 1)
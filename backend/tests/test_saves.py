@@ -0,0 +1,146 @@
+import httpx
+
+from app.services import places as places_module
+from app.services.collection_cache import get_collection_cache
+from tests.conftest import USER_ID
+
+SAVED = {
+    "id": "0b8e3f0e-2d47-4a63-9d3c-2f1f7a7a1c11",
+    "place_id": "7c9e6679-7425-40de-944b-e07fc1f90ae7",
+    "google_place_id": "ChIJramen",
+    "name": "Ramen",
+    "address": "1 Main St",
+    "photo_reference": None,
+    "saved_at": "2026-10-18T09:30:00+00:00",
+    "list_id": None,
+}
+
+
+async def test_save_place(api, fake_db):
+    fake_db.handler = lambda query: [{**SAVED, "created": True}]
+
+    response = await api.post("/api/saves/", json={"google_place_id": "ChIJramen"})
+
+    assert response.status_code == 201
+    assert response.json()["place_id"] == SAVED["place_id"]
+    assert fake_db.calls[0].params == {
+        "p_user_id": USER_ID, "p_google_place_id": "ChIJramen", "p_list_id": None,
+    }
+    assert get_collection_cache().bumps == 1
+
+
+async def test_save_place_twice_conflicts(api, fake_db):
+    fake_db.handler = lambda query: [{**SAVED, "created": False}]
+
+    response = await api.post("/api/saves/", json={"google_place_id": "ChIJramen"})
+
+    assert response.status_code == 409
+
+
+async def test_save_unknown_place_is_not_found(api, fake_db, google, monkeypatch):
+    monkeypatch.setattr(places_module, "_places_service", google)
+    google.handler = lambda request: httpx.Response(200, json={"status": "INVALID_REQUEST"})
+
+    response = await api.post("/api/saves/", json={"google_place_id": "ChIJmadeUp"})
+    assert response.status_code == 404
+    assert len(google.requests) == 1
+
+    # Malformed ids never reach Google
+    response = await api.post("/api/saves/", json={"google_place_id": "bad id!"})
+    assert response.status_code == 404
+    assert len(google.requests) == 1
+
+
+async def test_bulk_save_reports_in_request_order(api, fake_db):
+    fake_db.handler = lambda query: [
+        {"google_place_id": "ChIJa", "save_id": "s-a", "status": "created"},
+        {"google_place_id": "ChIJb", "save_id": "s-b", "status": "exists"},
+        {"google_place_id": "ChIJc", "save_id": None, "status": "not_found"},
+    ]
+
+    response = await api.post("/api/saves/bulk", json={"google_place_ids": ["ChIJc", "ChIJa", "ChIJb", "ChIJa"]})
+
+    body = response.json()
+    assert [(r["id"], r["status"]) for r in body["results"]] == [
+        ("ChIJc", "not_found"), ("ChIJa", "created"), ("ChIJb", "exists"), ("ChIJa", "created"),
+    ]
+    assert (body["succeeded"], body["failed"]) == (3, 1)
+    # Duplicates are sent once
+    assert fake_db.calls[0].params["p_google_place_ids"] == ["ChIJc", "ChIJa", "ChIJb"]
+
+
+async def test_bulk_delete_matches_ids_in_any_case(api, fake_db):
+    save_id = SAVED["id"]
+    fake_db.handler = lambda query: [{"id": save_id}]
+
+    response = await api.post("/api/saves/bulk/delete", json={"save_ids": [save_id.upper(), "nope"]})
+
+    assert [(r["id"], r["status"]) for r in response.json()["results"]] == [
+        (save_id.upper(), "deleted"), ("nope", "not_found"),
+    ]
+    assert fake_db.calls[0].op("in_") == ("id", [save_id])
+
+
+async def test_bulk_move_without_valid_ids_skips_database(api, fake_db):
+    response = await api.post("/api/saves/bulk/move", json={"save_ids": ["nope"], "list_id": None})
+
+    assert response.json()["results"] == [{"id": "nope", "status": "not_found", "save_id": None}]
+    assert fake_db.calls == []
+    assert get_collection_cache().bumps == 0
+
+
+def save_row(index: int) -> dict:
+    return {
+        "id": f"00000000-0000-4000-8000-00000000000{index}",
+        "saved_at": f"2026-10-1{index}T09:30:00+00:00",
+        "list_id": None,
+        "places": {
+            "id": SAVED["place_id"],
+            "google_place_id": "ChIJramen",
+            "name": "Ramen",
+            "address": "1 Main St",
+            "photo_reference": None,
+        },
+    }
+
+
+def saves_handler(*rows):
+    """Serve rows for the saved_places list query (collection version 1)."""
+    def handler(query):
+        if query.target == "collection_versions":
+            return [{"version": 1}]
+        return list(rows)
+    return handler
+
+
+def list_queries(db):
+    return [call for call in db.calls if call.target == "saved_places"]
+
+
+async def test_saved_places_keyset_pages(api, fake_db):
+    fake_db.handler = saves_handler(save_row(3), save_row(2), save_row(1))
+
+    first = (await api.get("/api/saves/", params={"limit": 2})).json()
+    [query] = list_queries(fake_db)
+
+    assert [p["id"] for p in first["places"]] == [save_row(3)["id"], save_row(2)["id"]]
+    assert first["has_more"] is True
+    assert query.op("limit") == (3,)
+    assert query.op("or_") is None
+
+    fake_db.handler = saves_handler(save_row(1))
+    second = (await api.get("/api/saves/", params={"limit": 2, "cursor": first["next_cursor"]})).json()
+    query = list_queries(fake_db)[1]
+
+    assert second["count"] == 1
+    assert second["has_more"] is False
+    assert query.op("or_") == (
+        f'saved_at.lt."{save_row(2)["saved_at"]}",'
+        f'and(saved_at.eq."{save_row(2)["saved_at"]}",id.lt.{save_row(2)["id"]})',
+    )
+
+
+async def test_saved_places_bad_cursor(api, fake_db):
+    response = await api.get("/api/saves/", params={"cursor": "garbage"})
+    assert response.status_code == 400
+    assert list_queries(fake_db) == []
@@ -0,0 +1,61 @@
+import httpx
+
+from app.services.geo import geohash_encode
+from app.services.search_cache import (
+    get_search_cache,
+    normalize_query,
+    radius_bucket,
+    search_cache_key,
+)
+from tests.fakes import echo_upserts
+
+
+def test_geohash_known_values():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash_encode(42.6, -5.6, 5) == "ezs42"
+
+
+def test_geohash_precision_is_a_prefix():
+    assert geohash_encode(1.3521, 103.8198, 7).startswith(geohash_encode(1.3521, 103.8198, 5))
+
+
+def test_radius_bucket_rounds_up():
+    assert radius_bucket(1) == 250
+    assert radius_bucket(250) == 250
+    assert radius_bucket(251) == 500
+    assert radius_bucket(1500) == 2000
+    assert radius_bucket(10 ** 6) == 50000
+
+
+def test_search_key_normalizes_query_and_position():
+    assert normalize_query("  Sushi   BAR ") == "sushi bar"
+    # ~30m apart, same ~1.2km cell
+    assert search_cache_key("Sushi", 1.3521, 103.8198, 900) == search_cache_key("sushi ", 1.3523, 103.8199, 1000)
+    assert search_cache_key("sushi", 1.3521, 103.8198, 1000) != search_cache_key("sushi", 1.3521, 103.8198, 5000)
+    assert search_cache_key("sushi", 1.3521, 103.8198, 1000) != search_cache_key("sushi", 1.40, 103.8198, 1000)
+
+
+async def test_repeat_search_is_served_from_cache(google, fake_db):
+    fake_db.handler = echo_upserts
+    google.handler = lambda request: httpx.Response(200, json={
+        "status": "OK",
+        "results": [{"place_id": "ChIJ1", "name": "Ramen", "geometry": {"location": {"lat": 1.35, "lng": 103.82}}}],
+    })
+
+    first = await google.search_places("ramen", 1.3521, 103.8198, 1000)
+    second = await google.search_places("Ramen", 1.3522, 103.8198, 1000)
+
+    assert [place["place_id"] for place in first] == ["ChIJ1"]
+    assert second == first
+    assert len(google.requests) == 1
+
+
+async def test_expired_results_served_when_google_fails(google, fake_db):
+    key = search_cache_key("ramen", 1.3521, 103.8198, 1000)
+    get_search_cache().set(key, ([{"place_id": "ChIJ1"}], None), ttl_seconds=0)
+    google.handler = lambda request: httpx.Response(500)
+
+    results = await google.search_places("ramen", 1.3521, 103.8198, 1000)
+
+    assert results == [{"place_id": "ChIJ1"}]
+    assert google.served_stale_on_error == 1
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.errors import ValidationError
+from app.routers import sync as sync_module
+from app.routers.sync import _decode_since, _encode_since
+
+SAVE = {
+    "id": "0b8e3f0e-2d47-4a63-9d3c-2f1f7a7a1c11",
+    "saved_at": "2026-10-18T09:30:00+00:00",
+    "list_id": None,
+    "places": {
+        "id": "7c9e6679-7425-40de-944b-e07fc1f90ae7",
+        "google_place_id": "ChIJramen",
+        "name": "Ramen",
+        "address": "1 Main St",
+        "photo_reference": None,
+    },
+}
+TOMBSTONE = {
+    "entity": "journal_entry",
+    "entity_id": "5d1c4a2b-6e7f-4a8b-9c0d-1e2f3a4b5c6d",
+    "deleted_at": "2026-10-18T09:31:00+00:00",
+}
+
+
+def minutes_ago(minutes: float) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(minutes=minutes)
+
+
+def test_since_round_trip():
+    moment = datetime(2026, 10, 18, 9, 30, 0, 123456, tzinfo=timezone.utc)
+    since = _encode_since(moment)
+    assert "=" not in since
+    assert _decode_since(since) == moment
+
+
+@pytest.mark.parametrize("since", [
+    "%%%",
+    _encode_since(datetime(2026, 10, 18, 9, 30)),  # No timezone
+    "bm90IGEgZGF0ZQ",  # "not a date"
+])
+def test_malformed_since_rejected(since):
+    with pytest.raises(ValidationError):
+        _decode_since(since)
+
+
+async def test_first_sync_resets(api, fake_db):
+    body = (await api.get("/api/sync/")).json()
+
+    assert body["reset"] is True
+    assert fake_db.calls == []
+    # The cursor starts before now, so in-flight writes are picked up next time
+    assert _decode_since(body["next_since"]) < minutes_ago(0)
+
+
+async def test_cursor_past_retention_resets(api, fake_db):
+    since = _encode_since(minutes_ago(60 * 24 * (sync_module.SYNC_TOMBSTONE_RETENTION_DAYS + 1)))
+
+    body = (await api.get("/api/sync/", params={"since": since})).json()
+
+    assert body["reset"] is True
+    assert fake_db.calls == []
+
+
+async def test_sync_returns_changes_and_tombstones(api, fake_db):
+    def handler(query):
+        return {"saved_places": [SAVE], "journal_entries": [], "sync_tombstones": [TOMBSTONE]}[query.target]
+
+    fake_db.handler = handler
+    since_at = minutes_ago(5)
+
+    body = (await api.get("/api/sync/", params={"since": _encode_since(since_at)})).json()
+
+    assert body["reset"] is False
+    assert [s["id"] for s in body["saves"]] == [SAVE["id"]]
+    assert body["tombstones"] == [{
+        "entity": "journal_entry", "id": TOMBSTONE["entity_id"], "deleted_at": "2026-10-18T09:31:00Z",
+    }]
+    assert {call.target for call in fake_db.calls} == {"saved_places", "journal_entries", "sync_tombstones"}
+    for call in fake_db.calls:
+        assert call.op("gt")[1] == since_at.isoformat()
+
+
+async def test_scope_limits_queries(api, fake_db):
+    fake_db.handler = lambda query: []
+
+    await api.get("/api/sync/", params={"since": _encode_since(minutes_ago(5)), "scope": "journal"})
+
+    assert {call.target for call in fake_db.calls} == {"journal_entries", "sync_tombstones"}
+    tombstones = next(call for call in fake_db.calls if call.target == "sync_tombstones")
+    assert ("entity", "journal_entry") in [args for name, args, _ in tombstones.ops if name == "eq"]
+
+
+async def test_too_many_changes_resets(api, fake_db, monkeypatch):
+    monkeypatch.setattr(sync_module, "SYNC_MAX_CHANGES", 1)
+    fake_db.handler = lambda query: [SAVE, SAVE] if query.target == "saved_places" else []
+
+    body = (await api.get("/api/sync/", params={"since": _encode_since(minutes_ago(5))})).json()
+
+    assert body["reset"] is True
+    assert body["saves"] == []
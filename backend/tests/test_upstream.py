@@ -0,0 +1,153 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.errors import DatabaseError
+from app.services.upstream import AdaptiveRateLimiter, CircuitBreaker
+
+
+def test_limiter_aimd():
+    limiter = AdaptiveRateLimiter(max_rate=10, min_rate=1, burst=5, max_wait=1)
+
+    limiter.on_throttle()
+    assert limiter.rate == 5
+    for _ in range(3):
+        limiter.on_throttle()
+    assert limiter.rate == 1
+
+    limiter.on_success()
+    assert limiter.rate == 1.5
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 10
+
+
+async def test_limiter_bursts_then_rejects_long_waits():
+    limiter = AdaptiveRateLimiter(max_rate=1, min_rate=1, burst=2, max_wait=0.5)
+
+    await limiter.acquire()
+    await limiter.acquire()
+    with pytest.raises(DatabaseError):
+        await limiter.acquire()
+
+    assert limiter.acquired == 2
+    assert limiter.rejected == 1
+
+
+async def test_limiter_delays_short_waits():
+    limiter = AdaptiveRateLimiter(max_rate=100, min_rate=1, burst=1, max_wait=1)
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert limiter.delayed == 1
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    breaker.check()
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    with pytest.raises(DatabaseError):
+        breaker.check()
+    assert breaker.rejected == 1
+
+
+def test_breaker_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+
+    breaker.check()
+    assert breaker.state == "half_open"
+    with pytest.raises(DatabaseError):
+        breaker.check()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.check()
+
+
+def test_breaker_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=0)
+    for _ in range(3):
+        breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.opened == 2
+
+
+async def test_google_errors_feed_the_guard(google):
+    google.guard.breaker.failure_threshold = 2
+    google.handler = lambda request: httpx.Response(503)
+
+    for _ in range(2):
+        with pytest.raises(DatabaseError):
+            await google._get_json("/details/json", {"place_id": "ChIJ1"})
+    with pytest.raises(DatabaseError) as error:
+        await google._get_json("/details/json", {"place_id": "ChIJ1"})
+
+    assert error.value.detail["circuit"] == "open"
+    assert len(google.requests) == 2
+
+
+async def test_over_query_limit_slows_down(google):
+    google.handler = lambda request: httpx.Response(200, json={"status": "OVER_QUERY_LIMIT"})
+    rate = google.guard.limiter.rate
+
+    await google._get_json("/details/json", {"place_id": "ChIJ1"})
+
+    assert google.guard.limiter.rate == rate / 2
+
+
+def half_open(google):
+    breaker = google.guard.breaker
+    breaker.failure_threshold = 1
+    breaker.reset_seconds = 0
+    breaker.record_failure()
+    return breaker
+
+
+async def test_malformed_response_fails_the_probe(google):
+    breaker = half_open(google)
+    google.handler = lambda request: httpx.Response(200, content=b"<html>Bad gateway</html>")
+
+    with pytest.raises(DatabaseError):
+        await google._get_json("/details/json", {"place_id": "ChIJ1"})
+    assert breaker.state == "open"
+
+    google.handler = lambda request: httpx.Response(200, json={"status": "OK"})
+    await google._get_json("/details/json", {"place_id": "ChIJ1"})
+    assert breaker.state == "closed"
+
+
+@pytest.mark.parametrize("call", [
+    lambda google: google._get_json("/details/json", {"place_id": "ChIJ1"}),
+    lambda google: google._open_photo("photo-ref", 400),
+])
+async def test_cancelled_probe_frees_the_slot(google, call):
+    breaker = half_open(google)
+    started = asyncio.Event()
+
+    async def hang(request):
+        started.set()
+        await asyncio.Event().wait()
+
+    google.handler = hang
+    task = asyncio.create_task(call(google))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breaker.state == "half_open"
+    google.handler = lambda request: httpx.Response(200, json={"status": "OK"})
+    response = await call(google)
+    if isinstance(response, httpx.Response):
+        await response.aclose()
+    assert breaker.state == "closed"
@@ -59,7 +59,7 @@ function JournalEntryCard({
 }
 
 export default function JournalScreen() {
-  const { entries, loading, error, create, remove, refetch } = useJournal();
+  const { entries, loading, error, create, remove, refetch, loadMore } = useJournal();
   const [showAddModal, setShowAddModal] = useState(false);
   const [refreshing, setRefreshing] = useState(false);
 
@@ -108,6 +108,8 @@ export default function JournalScreen() {
             <JournalEntryCard entry={item} onDelete={remove} />
           )}
           contentContainerStyle={styles.list}
+          onEndReached={loadMore}
+          onEndReachedThreshold={0.5}
           refreshControl={
             <RefreshControl
               refreshing={refreshing}
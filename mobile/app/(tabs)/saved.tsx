@@ -27,7 +27,7 @@ function SavedPlaceCard({ place, onUnsave }: { place: SavedPlace; onUnsave: (id:
 }
 
 export default function SavedScreen() {
-  const { savedPlaces, loading, error, unsave, refetch } = useSavedPlaces();
+  const { savedPlaces, loading, error, unsave, refetch, loadMore } = useSavedPlaces();
   const [refreshing, setRefreshing] = useState(false);
 
   const onRefresh = async () => {
@@ -75,6 +75,8 @@ export default function SavedScreen() {
           <SavedPlaceCard place={item} onUnsave={unsave} />
         )}
         contentContainerStyle={styles.list}
+        onEndReached={loadMore}
+        onEndReachedThreshold={0.5}
         refreshControl={
           <RefreshControl
             refreshing={refreshing}
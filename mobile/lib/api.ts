@@ -7,6 +7,8 @@ interface PlaceSearchParams {
   lng: number;
   radius?: number;
   query?: string;
+  sort?: 'relevance' | 'ranked';
+  limit?: number;
 }
 
 interface PlaceSearchResponse {
@@ -36,11 +38,45 @@ async function getAuthHeaders(): Promise<Record<string, string>> {
   };
 }
 
+// Last ETag and body per list URL, so unchanged lists come back as 304
+const ETAG_CACHE_MAX_ENTRIES = 50;
+const etagCache = new Map<string, { etag: string; body: unknown }>();
+
+async function getWithEtag<T>(url: string, errorMessage: string): Promise<T> {
+  const headers = await getAuthHeaders();
+  const cached = etagCache.get(url);
+  if (cached) {
+    headers['If-None-Match'] = cached.etag;
+  }
+
+  const response = await fetch(url, { method: 'GET', headers });
+  if (response.status === 304 && cached) {
+    return cached.body as T;
+  }
+  if (!response.ok) {
+    throw new Error(errorMessage);
+  }
+
+  const body = await response.json();
+  const etag = response.headers.get('ETag');
+  if (etag) {
+    etagCache.delete(url);
+    etagCache.set(url, { etag, body });
+    if (etagCache.size > ETAG_CACHE_MAX_ENTRIES) {
+      // Maps iterate in insertion order: drop the oldest
+      etagCache.delete(etagCache.keys().next().value as string);
+    }
+  }
+  return body;
+}
+
 export async function searchPlaces({
   lat,
   lng,
   radius = 1000,
   query = 'restaurant',
+  sort,
+  limit,
 }: PlaceSearchParams): Promise<PlaceSearchResponse> {
   const headers = await getAuthHeaders();
   const params = new URLSearchParams({
@@ -49,6 +85,8 @@ export async function searchPlaces({
     lng: lng.toString(),
     radius: radius.toString(),
   });
+  if (sort) params.set('sort', sort);
+  if (limit) params.set('limit', limit.toString());
 
   const response = await fetch(`${API_BASE_URL}/api/places/search?${params}`, {
     method: 'GET',
@@ -78,6 +116,21 @@ export interface SavedPlace {
 export interface SavedPlacesResponse {
   places: SavedPlace[];
   count: number;
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
+export interface PageParams {
+  cursor?: string | null;
+  limit?: number;
+}
+
+function pageQuery({ cursor, limit }: PageParams = {}): string {
+  const params = new URLSearchParams();
+  if (cursor) params.set('cursor', cursor);
+  if (limit) params.set('limit', limit.toString());
+  const query = params.toString();
+  return query ? `?${query}` : '';
 }
 
 // Save a place
@@ -100,18 +153,8 @@ export async function savePlace(googlePlaceId: string): Promise<SavedPlace> {
 }
 
 // Get saved places
-export async function getSavedPlaces(): Promise<SavedPlacesResponse> {
-  const headers = await getAuthHeaders();
-  const response = await fetch(`${API_BASE_URL}/api/saves/`, {
-    method: 'GET',
-    headers,
-  });
-
-  if (!response.ok) {
-    throw new Error('Failed to fetch saved places');
-  }
-
-  return response.json();
+export async function getSavedPlaces(page?: PageParams): Promise<SavedPlacesResponse> {
+  return getWithEtag(`${API_BASE_URL}/api/saves/${pageQuery(page)}`, 'Failed to fetch saved places');
 }
 
 // Unsave a place
@@ -143,6 +186,8 @@ export interface JournalEntry {
 export interface JournalEntriesResponse {
   entries: JournalEntry[];
   count: number;
+  next_cursor: string | null;
+  has_more: boolean;
 }
 
 export interface CreateJournalEntryRequest {
@@ -170,18 +215,60 @@ export async function createJournalEntry(
   return response.json();
 }
 
-export async function getJournalEntries(): Promise<JournalEntriesResponse> {
-  const response = await fetch(`${API_BASE_URL}/api/journal/`, {
+export async function getJournalEntries(page?: PageParams): Promise<JournalEntriesResponse> {
+  return getWithEtag(`${API_BASE_URL}/api/journal/${pageQuery(page)}`, 'Failed to fetch journal entries');
+}
+
+export interface JournalSearchResult extends JournalEntry {
+  score: number;
+}
+
+export interface JournalSearchResponse {
+  entries: JournalSearchResult[];
+  count: number;
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
+// Search notes and place names, best match first
+export async function searchJournal(
+  q: string,
+  page?: PageParams
+): Promise<JournalSearchResponse> {
+  const query = pageQuery(page);
+  const params = `q=${encodeURIComponent(q)}${query ? `&${query.slice(1)}` : ''}`;
+  const response = await fetch(`${API_BASE_URL}/api/journal/search?${params}`, {
     headers: await getAuthHeaders(),
   });
 
   if (!response.ok) {
-    throw new Error('Failed to fetch journal entries');
+    throw new Error('Failed to search journal');
   }
 
   return response.json();
 }
 
+export interface JournalStats {
+  total_entries: number;
+  rated_entries: number;
+  average_rating: number | null;
+  months: Array<{ month: string; entries: number }>;
+  ratings: Array<{ rating: number; entries: number }>;
+  places: Array<{
+    place_id: string;
+    google_place_id: string;
+    name: string;
+    visits: number;
+    rated_visits: number;
+    average_rating: number | null;
+  }>;
+}
+
+export async function getJournalStats(placesLimit?: number): Promise<JournalStats> {
+  const query = placesLimit ? `?places_limit=${placesLimit}` : '';
+  return getWithEtag(`${API_BASE_URL}/api/journal/stats${query}`, 'Failed to fetch journal stats');
+}
+
 export async function deleteJournalEntry(entryId: string): Promise<void> {
   const response = await fetch(`${API_BASE_URL}/api/journal/${entryId}`, {
     method: 'DELETE',
@@ -192,3 +279,38 @@ export async function deleteJournalEntry(entryId: string): Promise<void> {
     throw new Error('Failed to delete journal entry');
   }
 }
+
+// Delta sync types
+export interface Tombstone {
+  entity: 'saved_place' | 'journal_entry';
+  id: string;
+  deleted_at: string;
+}
+
+export interface SyncResponse {
+  saves: SavedPlace[];
+  journal: JournalEntry[];
+  tombstones: Tombstone[];
+  next_since: string;
+  reset: boolean;
+}
+
+// Changes since the last sync; since = null just returns a fresh cursor (reset)
+export async function syncChanges(
+  since: string | null,
+  scope?: 'saves' | 'journal'
+): Promise<SyncResponse> {
+  const params = new URLSearchParams();
+  if (since) params.set('since', since);
+  if (scope) params.set('scope', scope);
+  const query = params.toString();
+  const response = await fetch(`${API_BASE_URL}/api/sync/${query ? `?${query}` : ''}`, {
+    headers: await getAuthHeaders(),
+  });
+
+  if (!response.ok) {
+    throw new Error('Failed to sync');
+  }
+
+  return response.json();
+}
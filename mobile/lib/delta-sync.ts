@@ -0,0 +1,60 @@
+import { useEffect, useRef } from 'react';
+import { AppState } from 'react-native';
+
+/**
+ * Apply delta sync changes to a newest-first list.
+ *
+ * - Changed items replace their local copy by id
+ * - New items are only added inside the loaded window; when more pages
+ *   remain, older items arrive through loadMore instead
+ * - Items in removedIds are dropped
+ */
+export function mergeChanges<T extends { id: string }>(
+  current: T[],
+  changed: T[],
+  removedIds: Set<string>,
+  timestamp: (item: T) => number,
+  hasMore: boolean
+): T[] {
+  const byId = new Map(current.map((item) => [item.id, item]));
+  const oldest = current.length > 0 ? timestamp(current[current.length - 1]) : null;
+
+  for (const item of changed) {
+    if (byId.has(item.id) || !hasMore || oldest === null || timestamp(item) >= oldest) {
+      byId.set(item.id, item);
+    }
+  }
+  removedIds.forEach((id) => byId.delete(id));
+
+  // Same order as the API: timestamp desc, then id desc
+  return [...byId.values()].sort(
+    (a, b) => timestamp(b) - timestamp(a) || (b.id > a.id ? 1 : b.id < a.id ? -1 : 0)
+  );
+}
+
+/**
+ * Append a page, skipping items a sync already added.
+ */
+export function appendPage<T extends { id: string }>(current: T[], page: T[]): T[] {
+  const seen = new Set(current.map((item) => item.id));
+  return [...current, ...page.filter((item) => !seen.has(item.id))];
+}
+
+/**
+ * Call callback when the app returns to the foreground.
+ */
+export function useOnAppResume(callback: () => void): void {
+  const callbackRef = useRef(callback);
+  callbackRef.current = callback;
+
+  useEffect(() => {
+    let previous = AppState.currentState;
+    const subscription = AppState.addEventListener('change', (next) => {
+      if (previous.match(/inactive|background/) && next === 'active') {
+        callbackRef.current();
+      }
+      previous = next;
+    });
+    return () => subscription.remove();
+  }, []);
+}
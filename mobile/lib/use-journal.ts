@@ -1,11 +1,13 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import {
   JournalEntry,
   getJournalEntries,
   createJournalEntry,
   deleteJournalEntry,
+  syncChanges,
   CreateJournalEntryRequest,
 } from './api';
+import { appendPage, mergeChanges, useOnAppResume } from './delta-sync';
 
 export interface UseJournalResult {
   entries: JournalEntry[];
@@ -14,19 +16,30 @@ export interface UseJournalResult {
   create: (data: CreateJournalEntryRequest) => Promise<boolean>;
   remove: (entryId: string) => Promise<boolean>;
   refetch: () => Promise<void>;
+  hasMore: boolean;
+  loadMore: () => Promise<void>;
 }
 
 export function useJournal(): UseJournalResult {
   const [entries, setEntries] = useState<JournalEntry[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const loadingMore = useRef(false);
+  const syncCursor = useRef<string | null>(null);
 
   const fetchEntries = useCallback(async () => {
     try {
       setLoading(true);
       setError(null);
-      const response = await getJournalEntries();
+      // Take the sync cursor alongside the first page so later refreshes are deltas
+      const [response, cursor] = await Promise.all([
+        getJournalEntries(),
+        syncChanges(null, 'journal').catch(() => null),
+      ]);
       setEntries(response.entries);
+      setNextCursor(response.next_cursor);
+      syncCursor.current = cursor?.next_since ?? null;
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load journal');
     } finally {
@@ -34,10 +47,49 @@ export function useJournal(): UseJournalResult {
     }
   }, []);
 
+  // Append the next page (e.g. from a list's onEndReached)
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore.current) return;
+    loadingMore.current = true;
+    try {
+      const response = await getJournalEntries({ cursor: nextCursor });
+      setEntries((prev) => appendPage(prev, response.entries));
+      setNextCursor(response.next_cursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load journal');
+    } finally {
+      loadingMore.current = false;
+    }
+  }, [nextCursor]);
+
   useEffect(() => {
     fetchEntries();
   }, [fetchEntries]);
 
+  // Fetch only what changed since the last load (pull-to-refresh, app resume)
+  const sync = useCallback(async () => {
+    if (!syncCursor.current) {
+      await fetchEntries();
+      return;
+    }
+    try {
+      const changes = await syncChanges(syncCursor.current, 'journal');
+      if (changes.reset) {
+        await fetchEntries();
+        return;
+      }
+      syncCursor.current = changes.next_since;
+      const removed = new Set(changes.tombstones.map((t) => t.id));
+      setEntries((prev) =>
+        mergeChanges(prev, changes.journal, removed, (e) => Date.parse(e.eaten_at), nextCursor !== null)
+      );
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load journal');
+    }
+  }, [fetchEntries, nextCursor]);
+
+  useOnAppResume(sync);
+
   const create = useCallback(async (data: CreateJournalEntryRequest): Promise<boolean> => {
     try {
       const newEntry = await createJournalEntry(data);
@@ -72,7 +124,9 @@ export function useJournal(): UseJournalResult {
     error,
     create,
     remove,
-    refetch: fetchEntries,
+    refetch: sync,
+    hasMore: nextCursor !== null,
+    loadMore,
   };
 }
 
@@ -1,5 +1,6 @@
-import { useState, useEffect, useCallback } from 'react';
-import { getSavedPlaces, savePlace, unsavePlace, SavedPlace } from './api';
+import { useState, useEffect, useCallback, useRef } from 'react';
+import { getSavedPlaces, savePlace, unsavePlace, syncChanges, SavedPlace } from './api';
+import { appendPage, mergeChanges, useOnAppResume } from './delta-sync';
 
 interface UseSavedPlacesResult {
   savedPlaces: SavedPlace[];
@@ -8,19 +9,30 @@ interface UseSavedPlacesResult {
   save: (googlePlaceId: string) => Promise<boolean>;
   unsave: (saveId: string) => Promise<boolean>;
   refetch: () => void;
+  hasMore: boolean;
+  loadMore: () => Promise<void>;
 }
 
 export function useSavedPlaces(): UseSavedPlacesResult {
   const [savedPlaces, setSavedPlaces] = useState<SavedPlace[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const loadingMore = useRef(false);
+  const syncCursor = useRef<string | null>(null);
 
   const fetchSavedPlaces = useCallback(async () => {
     try {
       setLoading(true);
       setError(null);
-      const response = await getSavedPlaces();
+      // Take the sync cursor alongside the first page so later refreshes are deltas
+      const [response, cursor] = await Promise.all([
+        getSavedPlaces(),
+        syncChanges(null, 'saves').catch(() => null),
+      ]);
       setSavedPlaces(response.places);
+      setNextCursor(response.next_cursor);
+      syncCursor.current = cursor?.next_since ?? null;
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load saved places');
     } finally {
@@ -28,10 +40,52 @@ export function useSavedPlaces(): UseSavedPlacesResult {
     }
   }, []);
 
+  // Append the next page (e.g. from a list's onEndReached)
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore.current) return;
+    loadingMore.current = true;
+    try {
+      const response = await getSavedPlaces({ cursor: nextCursor });
+      setSavedPlaces((prev) => appendPage(prev, response.places));
+      setNextCursor(response.next_cursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load saved places');
+    } finally {
+      loadingMore.current = false;
+    }
+  }, [nextCursor]);
+
   useEffect(() => {
     fetchSavedPlaces();
   }, [fetchSavedPlaces]);
 
+  // Fetch only what changed since the last load (pull-to-refresh, app resume)
+  const sync = useCallback(async () => {
+    if (!syncCursor.current) {
+      await fetchSavedPlaces();
+      return;
+    }
+    try {
+      const changes = await syncChanges(syncCursor.current, 'saves');
+      if (changes.reset) {
+        await fetchSavedPlaces();
+        return;
+      }
+      syncCursor.current = changes.next_since;
+      // Only the default list is shown; saves moved to other lists drop out
+      const removed = new Set(changes.tombstones.map((t) => t.id));
+      changes.saves.filter((p) => p.list_id !== null).forEach((p) => removed.add(p.id));
+      const changed = changes.saves.filter((p) => p.list_id === null);
+      setSavedPlaces((prev) =>
+        mergeChanges(prev, changed, removed, (p) => Date.parse(p.saved_at), nextCursor !== null)
+      );
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load saved places');
+    }
+  }, [fetchSavedPlaces, nextCursor]);
+
+  useOnAppResume(sync);
+
   const save = useCallback(async (googlePlaceId: string): Promise<boolean> => {
     try {
       const saved = await savePlace(googlePlaceId);
@@ -64,7 +118,9 @@ export function useSavedPlaces(): UseSavedPlacesResult {
     error,
     save,
     unsave,
-    refetch: fetchSavedPlaces,
+    refetch: sync,
+    hasMore: nextCursor !== null,
+    loadMore,
   };
 }
 